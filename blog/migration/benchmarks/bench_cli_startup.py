@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+统计 scripts/migrate.py 各子命令/目标的冷启动耗时
+
+每次都新开一个 Python 进程：启动解释器 + 导入 migrate + 导入目标脚本（不执行 main），
+取多次运行的中位数。同时列出进程里加载了哪些重型依赖，确认没用到的依赖没有被导入。
+缺少依赖的目标标记为"缺少依赖"。
+
+用法：
+    python benchmarks/bench_cli_startup.py
+    python benchmarks/bench_cli_startup.py --repeat 10 --command import
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+sys.path.insert(0, SCRIPTS_DIR)
+
+from migrate import COMMANDS, DEFAULT_TARGETS  # noqa: E402
+
+
+HEAVY_MODULES = ["requests", "bs4", "html2text", "numpy", "scipy", "aiohttp", "PIL", "playwright"]
+
+# 在子进程里执行：只导入，不运行
+PROBE = """
+import sys, json
+sys.path.insert(0, {scripts!r})
+import migrate
+status = "ok"
+if {command!r}:
+    try:
+        migrate.load({command!r}, {target!r})
+    except ImportError as e:
+        status = "missing:" + str(e.name)
+print(json.dumps([status, [m for m in {heavy!r} if m in sys.modules]]))
+"""
+
+
+def run_probe(command: str, target: str):
+    code = PROBE.format(scripts=SCRIPTS_DIR, command=command, target=target, heavy=HEAVY_MODULES)
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    elapsed = time.perf_counter() - started
+    status, heavy = json.loads(out.strip().splitlines()[-1])
+    return elapsed, status, heavy
+
+
+def measure(command: str, target: str, repeat: int):
+    times = []
+    for _ in range(repeat):
+        elapsed, status, heavy = run_probe(command, target)
+        times.append(elapsed)
+    return statistics.median(times) * 1000, status, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="migrate 子命令冷启动耗时")
+    parser.add_argument("--repeat", type=int, default=5, help="每个目标运行的次数（取中位数）")
+    parser.add_argument("--command", choices=list(COMMANDS), help="只测某个子命令")
+    args = parser.parse_args()
+
+    base_ms, _, _ = measure("", "", args.repeat)
+    print(f"{'子命令':<10}{'目标':<16}{'冷启动 (ms)':>12}{'比空载':>10}  加载的重型依赖")
+    print(f"{'(help)':<10}{'':<16}{base_ms:>12.1f}{'':>10}  -")
+
+    for command, targets in COMMANDS.items():
+        if args.command and command != args.command:
+            continue
+        for target in targets:
+            ms, status, heavy = measure(command, target, args.repeat)
+            mark = "*" if DEFAULT_TARGETS.get(command) == target else ""
+            if status != "ok":
+                print(f"{command:<10}{target + mark:<16}{'缺少依赖':>12}{'':>10}  {status.split(':', 1)[1]}")
+                continue
+            print(f"{command:<10}{target + mark:<16}{ms:>12.1f}{ms - base_ms:>+10.1f}  {', '.join(heavy) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+对比逐条 re.search 与 PromoMatcher 在超长单行上的耗时
+
+html2text 使用 body_width = 0，整段正文常常只有一行。构造几类最坏情况：
+反复出现规则前缀、但最后一个片段始终不出现的长行，让 .* 链条充分回溯。
+行长每翻一倍，re 的耗时成倍上升（平方甚至立方），PromoMatcher 只线性增长。
+最后对 _posts 里的真实文章逐行比较，确认普通正文上 PromoMatcher 不比 re 慢。
+
+用法：
+    python benchmarks/bench_promo_matcher.py
+    python benchmarks/bench_promo_matcher.py --max-len 256000 --re-budget 10
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from promo_matcher import PromoMatcher  # noqa: E402
+from import_wechatsync_md import PROMO_TAIL_PATTERNS  # noqa: E402
+from post_index import load_posts  # noqa: E402
+
+
+# 每个用例：(名称, 重复单元)；重复单元里有规则前缀，但不含收尾的片段
+CASES = [
+    ("近期…文章，…猜 无'喜欢'", "近期文章，猜"),
+    ("↓点击小程序 无'购买'", "↓点击小程序"),
+    ("感谢… 无'关注'", "感谢大家"),
+    ("普通正文", "今天天气很好，我们去爬山。"),
+]
+
+
+def time_call(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def regex_search(line: str):
+    for pat in PROMO_TAIL_PATTERNS:
+        if re.search(pat, line, re.IGNORECASE):
+            return pat
+    return None
+
+
+def bench_posts(matcher):
+    """真实文章逐行匹配的总耗时"""
+    lines = [line for post in load_posts() for line in post["body"].split("\n")]
+    if not lines:
+        return
+    t_re = time_call(lambda: [regex_search(line) for line in lines])
+    t_match = time_call(lambda: [matcher.search(line) for line in lines])
+    longest = max(len(line) for line in lines)
+    print(f"[POSTS] {len(lines)} 行（最长 {longest} 字）: re {t_re * 1000:.1f}ms, matcher {t_match * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="推广规则匹配基准测试")
+    parser.add_argument("--min-len", type=int, default=500, help="最短行长（字符）")
+    parser.add_argument("--max-len", type=int, default=64000, help="最长行长（字符）")
+    parser.add_argument("--re-budget", type=float, default=1.0, help="re 单次耗时超过该秒数后不再测更长的行")
+    args = parser.parse_args()
+
+    matcher = PromoMatcher(PROMO_TAIL_PATTERNS)
+    print(f"{'用例':<24}{'行长':>8}{'re (ms)':>12}{'matcher (ms)':>14}{'re 增长':>9}{'matcher 增长':>13}")
+    worst_growth = 0.0
+    for name, unit in CASES:
+        length = args.min_len
+        prev = None
+        re_skipped = False
+        while length <= args.max_len:
+            line = (unit * (length // len(unit) + 1))[:length]
+
+            t_match = time_call(lambda: matcher.search(line))
+            t_re = None
+            if not re_skipped:
+                started = time.perf_counter()
+                re_hit = regex_search(line)
+                t_re = time.perf_counter() - started
+                assert (re_hit is None) == (matcher.search(line) is None)
+                re_skipped = t_re > args.re_budget
+
+            growth_re = growth_match = ""
+            if prev is not None:
+                if t_re is not None and prev[0]:
+                    growth_re = f"x{t_re / prev[0]:.1f}"
+                growth_match = f"x{t_match / prev[1]:.1f}"
+                worst_growth = max(worst_growth, t_match / prev[1])
+            re_ms = f"{t_re * 1000:.1f}" if t_re is not None else "-"
+            print(f"{name:<24}{length:>8}{re_ms:>12}{t_match * 1000:>14.2f}{growth_re:>9}{growth_match:>13}")
+            prev = (t_re, t_match)
+            length *= 2
+        print()
+
+    bench_posts(matcher)
+    print(f"[SUMMARY] 行长翻倍时 PromoMatcher 耗时最大增长 x{worst_growth:.1f}（线性约为 x2）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
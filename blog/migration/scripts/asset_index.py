@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+站内图片（source/images/）引用索引与清理：
+- 反向索引：图片文件名（内容哈希）-> 引用它的文章，保存在 data/asset_index.json
+- 导入脚本经 post_writer.py 写文章时顺带更新索引；其他改动在每次运行时同步：
+  一次 scandir 取得全部文章的 mtime/大小（每篇仍要 stat 一次，手工原地编辑不会改变目录 mtime），
+  只重新读取有变化的文章，已删除的文章从索引中移除
+- 识别的引用形式：/images/x、站点绝对地址 https://<站点域名>/images/x（含 //<站点域名>/images/x）、
+  相对地址 images/x、./images/x、../images/x；宁可多认引用，也不误删仍在使用的图片
+- 清理时列出没有任何文章引用的图片；_posts 以外的页面、站点/主题配置文件数量很少，每次直接扫描
+- 默认只报告，加 --delete 才删除
+
+用法：
+    python scripts/asset_index.py              # 报告未引用的图片
+    python scripts/asset_index.py --delete     # 删除未引用的图片
+    python scripts/asset_index.py --rebuild    # 丢弃索引，全部重新读取
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+from urllib.parse import urlparse
+
+from post_index import BASE_DIR, BLOG_DIR, POSTS_DIR, SITE_CONFIG_FILE
+
+
+DATA_DIR = os.path.join(BASE_DIR, "data")
+ASSET_INDEX_FILE = os.path.join(DATA_DIR, "asset_index.json")
+SOURCE_DIR = os.path.join(BLOG_DIR, "source")
+IMAGES_DIR = os.path.join(SOURCE_DIR, "images")
+
+
+
+def load_site_host(config_file: str = SITE_CONFIG_FILE) -> str:
+    """_config.yml 中 url 的域名；读不到时返回空字符串"""
+    try:
+        with open(config_file, "r", encoding="utf-8") as f:
+            for line in f:
+                m = re.match(r"^url:\s*(\S+)\s*$", line)
+                if m:
+                    return urlparse(m.group(1)).netloc
+    except OSError:
+        pass
+    return ""
+
+
+def asset_pattern(site_host: str):
+    """站内图片地址的正则，捕获 images/ 之后的文件名
+
+    地址必须从链接/属性的起始符（或行首）开始，避免误匹配 CDN 地址中的 /images/；
+    本站的绝对地址、../ ./ 开头的相对地址都归一到同一个文件名。
+    """
+    site = rf"(?:(?:https?:)?//{re.escape(site_host)})?" if site_host else ""
+    return re.compile(rf"(?:(?<=[(\"'\s=])|^){site}(?:\.{{1,2}}/)*/?images/([^\s)\"'?#<>]+)", re.M)
+
+
+ASSET_RE = asset_pattern(load_site_host())
+# _posts 以外可能引用图片的文件
+PAGE_SUFFIXES = (".md", ".html", ".yml", ".yaml", ".json", ".js", ".css")
+
+
+def asset_refs(text: str) -> list:
+    return sorted(set(ASSET_RE.findall(text)))
+
+
+class AssetIndex:
+    """文章 -> 图片 与 图片 -> 文章 两个方向的索引"""
+
+    def __init__(self, index_file: str = ASSET_INDEX_FILE):
+        self.index_file = index_file
+        self.posts = {}
+        if os.path.exists(index_file):
+            with open(index_file, "r", encoding="utf-8") as f:
+                self.posts = json.load(f).get("posts", {})
+        self.refs = {}
+        for name, entry in self.posts.items():
+            for asset in entry["assets"]:
+                self.refs.setdefault(asset, set()).add(name)
+        self.dirty = False
+
+    def _set_assets(self, name: str, assets: list):
+        old = set(self.posts.get(name, {}).get("assets", []))
+        for asset in old - set(assets):
+            self.refs[asset].discard(name)
+            if not self.refs[asset]:
+                del self.refs[asset]
+        for asset in set(assets) - old:
+            self.refs.setdefault(asset, set()).add(name)
+
+    def update_post(self, path: Path, text: str = None):
+        """记录一篇文章当前引用的图片（text 为空时读取文件）"""
+        path = Path(path)
+        if text is None:
+            text = path.read_text(encoding="utf-8", errors="ignore")
+        st = path.stat()
+        assets = asset_refs(text)
+        self._set_assets(path.name, assets)
+        self.posts[path.name] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "assets": assets}
+        self.dirty = True
+
+    def remove_post(self, name: str):
+        if name in self.posts:
+            self._set_assets(name, [])
+            del self.posts[name]
+            self.dirty = True
+
+    def sync(self, posts_dir: str = POSTS_DIR) -> int:
+        """按 mtime/大小同步 _posts 的变化，返回重新读取的文章数"""
+        seen = set()
+        updated = 0
+        with os.scandir(posts_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".md") or not entry.is_file():
+                    continue
+                seen.add(entry.name)
+                st = entry.stat()
+                cached = self.posts.get(entry.name)
+                if cached and cached["mtime_ns"] == st.st_mtime_ns and cached["size"] == st.st_size:
+                    continue
+                self.update_post(Path(entry.path))
+                updated += 1
+        for name in set(self.posts) - seen:
+            self.remove_post(name)
+        return updated
+
+    def save(self):
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+        data = {
+            "posts": self.posts,
+            "assets": {asset: sorted(names) for asset, names in sorted(self.refs.items())},
+        }
+        with open(self.index_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        self.dirty = False
+
+
+def page_refs() -> set:
+    """_posts 以外的页面和配置文件引用的图片"""
+    files = [Path(BLOG_DIR, name) for name in os.listdir(BLOG_DIR) if name.startswith("_config")]
+    files += Path(BLOG_DIR, "themes").glob("*/_config.yml")
+    for root, dirs, names in os.walk(SOURCE_DIR):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) not in (POSTS_DIR, IMAGES_DIR)]
+        files += [Path(root, n) for n in names if n.endswith(PAGE_SUFFIXES)]
+    refs = set()
+    for path in files:
+        refs.update(asset_refs(path.read_text(encoding="utf-8", errors="ignore")))
+    return refs
+
+
+def unreferenced_assets(index: AssetIndex, images_dir: str = IMAGES_DIR) -> list:
+    """source/images/ 下没有被任何文章或页面引用的文件"""
+    if not os.path.isdir(images_dir):
+        return []
+    used = set(index.refs) | page_refs()
+    with os.scandir(images_dir) as it:
+        return sorted(e.name for e in it if e.is_file() and e.name not in used)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="报告/删除没有文章引用的站内图片")
+    parser.add_argument("--delete", action="store_true", help="删除未引用的图片")
+    parser.add_argument("--rebuild", action="store_true", help="丢弃索引，全部重新读取文章")
+    args = parser.parse_args()
+
+    if not os.path.isdir(POSTS_DIR):
+        print(f"[ERROR] 未找到文章目录: {POSTS_DIR}")
+        return 1
+
+    index = AssetIndex()
+    if args.rebuild:
+        index.posts, index.refs = {}, {}
+    updated = index.sync()
+    index.save()
+
+    orphans = unreferenced_assets(index)
+    freed = 0
+    for name in orphans:
+        path = os.path.join(IMAGES_DIR, name)
+        size = os.path.getsize(path)
+        freed += size
+        if args.delete:
+            os.remove(path)
+            print(f"[OK] 已删除: {name}（{size / 1024:.1f} KB）")
+        else:
+            print(f"[ORPHAN] {name}（{size / 1024:.1f} KB）")
+
+    print(f"\n[SUMMARY] posts={len(index.posts)}, reread={updated}, assets={len(index.refs)}, "
+          f"orphans={len(orphans)}, size={freed / 1024:.1f} KB")
+    if orphans and not args.delete:
+        print("[INFO] 加 --delete 删除以上图片")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
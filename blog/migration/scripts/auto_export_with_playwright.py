@@ -7,9 +7,15 @@
 - 转换为 Markdown 格式
 - 清理引流链接
 - 保存到 wechatsync_md 目录
+
+抓取模式（--capture）：
+- 只放行主文档请求，其余子资源（图片/脚本/样式）全部中止
+- 拿到主文档响应的原始 HTML 后直接交给共享解析器，不等待渲染
+- 浏览器只用来通过会话校验，速度远快于完整渲染
 """
 
 import os
+import argparse
 import json
 import re
 import time
@@ -17,6 +23,8 @@ from pathlib import Path
 from datetime import datetime
 from html2text import HTML2Text
 
+from promo_matcher import PromoMatcher
+
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # blog/migration
 DATA_DIR = os.path.join(BASE_DIR, "data")
 ARTICLES_LIST_FILE = os.path.join(DATA_DIR, "articles_list.json")
@@ -34,6 +42,7 @@ PROMO_TAIL_PATTERNS = [
     r"扫码关注",
     r"识别二维码",
 ]
+PROMO_TAIL_MATCHER = PromoMatcher(PROMO_TAIL_PATTERNS)
 
 
 def normalize_title(title: str) -> str:
@@ -54,10 +63,8 @@ def clean_promo_tail(md: str) -> str:
         s = lines[idx].strip()
         if not s:
             continue
-        for pat in PROMO_TAIL_PATTERNS:
-            if re.search(pat, s, re.IGNORECASE):
-                cut_idx = idx
-                break
+        if PROMO_TAIL_MATCHER.search(s):
+            cut_idx = idx
         if cut_idx is not None:
             break
     if cut_idx is None:
@@ -67,42 +74,90 @@ def clean_promo_tail(md: str) -> str:
     return "\n".join(lines[:cut_idx]).rstrip()
 
 
+# 在页面内一次性取出所有需要的字段，整篇文章只需一次 IPC 往返
+EXTRACT_JS = r"""
+() => {
+    const content = document.querySelector("#js_content");
+    if (!content) return null;
+    const text = (sel) => {
+        const el = document.querySelector(sel);
+        return el ? el.innerText.trim() : "";
+    };
+    // 发布时间戳：页面脚本中的 var ct = "1597470506"
+    let ct = (typeof window.ct !== "undefined" && window.ct) ? String(window.ct) : "";
+    if (!/^\d{10}$/.test(ct)) {
+        ct = "";
+        for (const s of document.scripts) {
+            const m = /\bct\s*=\s*["']?(\d{10})/.exec(s.textContent || "");
+            if (m) { ct = m[1]; break; }
+        }
+    }
+    // 正文图片：微信懒加载，真实地址在 data-src
+    const images = [];
+    for (const img of content.querySelectorAll("img")) {
+        const src = img.getAttribute("data-src") || img.getAttribute("src");
+        if (src && !src.startsWith("data:")) images.push(src);
+    }
+    return {
+        title: text("#activity-name, .rich_media_title"),
+        html: content.innerHTML,
+        date: text("#publish_time, .publish_time, #meta_content .publish_time"),
+        ct: ct ? parseInt(ct, 10) : null,
+        images: images,
+    };
+}
+"""
+
+
 def extract_article_content(page, url: str) -> dict:
-    """从页面提取文章内容"""
+    """从页面提取文章内容（标题、正文、日期、ct 时间戳、图片列表）"""
     try:
-        # 等待文章内容加载
-        page.wait_for_selector("#js_content", timeout=10000)
-        
-        # 提取标题
-        title_elem = page.query_selector("#activity-name, .rich_media_title")
-        title = ""
-        if title_elem:
-            title = title_elem.inner_text().strip()
-        
-        # 提取正文 HTML
-        content_elem = page.query_selector("#js_content")
-        if not content_elem:
+        # 正文节点出现即可提取，不再固定等待
+        page.wait_for_selector("#js_content", state="attached", timeout=10000)
+        data = page.evaluate(EXTRACT_JS)
+        if not data:
             return None
-        
-        html_content = content_elem.inner_html()
-        
-        # 提取发布日期
-        date_elem = page.query_selector("#publish_time, .publish_time, #meta_content .publish_time")
-        publish_date = ""
-        if date_elem:
-            publish_date = date_elem.inner_text().strip()
-        
-        return {
-            "title": title,
-            "html": html_content,
-            "date": publish_date,
-            "url": url
-        }
+        data["url"] = url
+        return data
     except Exception as e:
         print(f"    [ERROR] 提取内容失败: {str(e)}")
         return None
 
 
+def block_subresources(page):
+    """生成路由处理函数：只放行主框架的文档请求"""
+    def handler(route):
+        request = route.request
+        if request.resource_type == "document" and request.frame == page.main_frame:
+            route.continue_()
+        else:
+            route.abort()
+    return handler
+
+
+def capture_article_content(page, url: str) -> dict:
+    """抓取模式：记录主文档响应的原始 HTML，交给共享解析器"""
+    from auto_fetch_articles import parse_article_html
+
+    try:
+        # 响应头到达即返回，不等待页面加载和布局
+        response = page.goto(url, wait_until="commit", timeout=30000)
+        if response is None or not response.ok:
+            status = response.status if response else "无响应"
+            print(f"    [ERROR] 主文档请求失败: {status}")
+            return None
+        html = response.text()
+    except Exception as e:
+        print(f"    [ERROR] 抓取主文档失败: {str(e)}")
+        return None
+
+    data = parse_article_html(html, url)
+    if "error" in data:
+        print(f"    [ERROR] {data['error']}")
+        return None
+    return data
+
+
 def html_to_markdown(html: str) -> str:
     """将 HTML 转换为 Markdown"""
     h = HTML2Text()
@@ -147,6 +202,11 @@ def save_markdown(title: str, content: str, date_str: str, output_dir: str):
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="使用 Playwright 批量导出微信公众号文章")
+    parser.add_argument("--capture", action="store_true",
+                        help="抓取模式：只截取主文档响应，不渲染页面")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("微信公众号文章自动化导出工具 (Playwright)")
     print("=" * 60)
@@ -192,6 +252,9 @@ def main():
         )
         
         page = context.new_page()
+        if args.capture:
+            print("抓取模式：中止所有子资源，只解析主文档\n")
+            page.route("**/*", block_subresources(page))
         
         try:
             for i, article in enumerate(articles, 1):
@@ -208,12 +271,13 @@ def main():
                 print(f"    URL: {url}")
                 
                 try:
-                    # 访问文章页面
-                    page.goto(url, wait_until="networkidle", timeout=30000)
-                    time.sleep(2)  # 等待页面完全加载
-                    
-                    # 提取文章内容
-                    content_data = extract_article_content(page, url)
+                    # 访问文章页面并提取内容
+                    if args.capture:
+                        content_data = capture_article_content(page, url)
+                    else:
+                        # 微信页面一直有长轮询，等不到 networkidle；DOM 就绪后由 extract 等待正文节点
+                        page.goto(url, wait_until="domcontentloaded", timeout=30000)
+                        content_data = extract_article_content(page, url)
                     
                     if not content_data:
                         print(f"    [FAIL] 无法提取内容")
@@ -230,6 +294,9 @@ def main():
                     # 清理引流链接
                     md_content = clean_promo_tail(md_content)
                     
+                    # 列表中没有时间戳时，使用页面脚本里的 ct
+                    timestamp = timestamp or content_data.get("ct")
+                    
                     # 生成 front-matter
                     if timestamp:
                         date_str = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
@@ -9,12 +9,16 @@ import os
 import json
 import re
 import time
+import argparse
 from pathlib import Path
 from datetime import datetime
 from html2text import HTML2Text
 import requests
 from bs4 import BeautifulSoup
 
+from promo_matcher import PromoMatcher
+from progress import Progress, add_progress_args, log
+
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # blog/migration
 DATA_DIR = os.path.join(BASE_DIR, "data")
 ARTICLES_LIST_FILE = os.path.join(DATA_DIR, "articles_list.json")
@@ -34,6 +38,7 @@ PROMO_TAIL_PATTERNS = [
     r"点击上方.*关注",
     r"长按.*二维码",
 ]
+PROMO_TAIL_MATCHER = PromoMatcher(PROMO_TAIL_PATTERNS)
 
 
 def normalize_title(title: str) -> str:
@@ -54,10 +59,8 @@ def clean_promo_tail(md: str) -> str:
         s = lines[idx].strip()
         if not s:
             continue
-        for pat in PROMO_TAIL_PATTERNS:
-            if re.search(pat, s, re.IGNORECASE):
-                cut_idx = idx
-                break
+        if PROMO_TAIL_MATCHER.search(s):
+            cut_idx = idx
         if cut_idx is not None:
             break
     if cut_idx is None:
@@ -82,6 +85,57 @@ def html_to_markdown(html: str) -> str:
     return md.strip()
 
 
+CT_RE = re.compile(r"\bct\s*=\s*[\"']?(\d{10})")
+
+
+def parse_article_html(html: str, url: str) -> dict:
+    """解析文章页面原始 HTML（requests 与 Playwright 抓取模式共用）"""
+    # 检查是否被拦截
+    if "captcha" in html.lower() or "验证" in html:
+        return {"error": "被反爬虫拦截"}
+    
+    soup = BeautifulSoup(html, "html.parser")
+    
+    # 提取标题
+    title_elem = soup.select_one("#activity-name, .rich_media_title")
+    title = ""
+    if title_elem:
+        title = title_elem.get_text().strip()
+    
+    # 提取正文
+    content_elem = soup.select_one("#js_content")
+    if not content_elem:
+        return {"error": "未找到文章内容"}
+    
+    html_content = str(content_elem)
+    
+    # 提取发布日期
+    date_elem = soup.select_one("#publish_time, .publish_time")
+    publish_date = ""
+    if date_elem:
+        publish_date = date_elem.get_text().strip()
+    
+    # 发布时间戳：页面脚本中的 var ct = "1597470506"
+    m = CT_RE.search(html)
+    ct = int(m.group(1)) if m else None
+    
+    # 正文图片：微信懒加载，真实地址在 data-src
+    images = []
+    for img in content_elem.find_all("img"):
+        src = img.get("data-src") or img.get("src")
+        if src and not src.startswith("data:"):
+            images.append(src)
+    
+    return {
+        "title": title,
+        "html": html_content,
+        "date": publish_date,
+        "ct": ct,
+        "images": images,
+        "url": url
+    }
+
+
 def fetch_article(url: str) -> dict:
     """抓取单篇文章"""
     headers = {
@@ -101,37 +155,7 @@ def fetch_article(url: str) -> dict:
         response = requests.get(url, headers=headers, timeout=30, allow_redirects=True)
         response.raise_for_status()
         
-        # 检查是否被拦截
-        if "captcha" in response.text.lower() or "验证" in response.text:
-            return {"error": "被反爬虫拦截"}
-        
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        # 提取标题
-        title_elem = soup.select_one("#activity-name, .rich_media_title")
-        title = ""
-        if title_elem:
-            title = title_elem.get_text().strip()
-        
-        # 提取正文
-        content_elem = soup.select_one("#js_content")
-        if not content_elem:
-            return {"error": "未找到文章内容"}
-        
-        html_content = str(content_elem)
-        
-        # 提取发布日期
-        date_elem = soup.select_one("#publish_time, .publish_time")
-        publish_date = ""
-        if date_elem:
-            publish_date = date_elem.get_text().strip()
-        
-        return {
-            "title": title,
-            "html": html_content,
-            "date": publish_date,
-            "url": url
-        }
+        return parse_article_html(response.text, url)
     except Exception as e:
         return {"error": str(e)}
 
@@ -165,6 +189,10 @@ def save_markdown(title: str, content: str, date_str: str, output_dir: str):
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="批量抓取微信公众号文章并转换为 Markdown")
+    add_progress_args(parser)
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("微信公众号文章自动化导出工具")
     print("=" * 60)
@@ -187,54 +215,58 @@ def main():
     failed_count = 0
     blocked_count = 0
     
-    for i, article in enumerate(articles, 1):
-        title = article.get("title", f"文章{i}")
-        url = article.get("url", "")
-        timestamp = article.get("timestamp")
-        
-        if not url:
-            print(f"[{i}/{len(articles)}] [SKIP] {title} - 无URL")
-            failed_count += 1
-            continue
-        
-        print(f"[{i}/{len(articles)}] 处理: {title}")
-        print(f"    URL: {url}")
-        
-        try:
-            # 抓取文章
-            content_data = fetch_article(url)
-            
-            if "error" in content_data:
-                error_msg = content_data["error"]
-                print(f"    [FAIL] {error_msg}")
-                if "拦截" in error_msg or "captcha" in error_msg.lower():
-                    blocked_count += 1
-                    print(f"    [INFO] 被反爬虫拦截，建议使用浏览器扩展手动导出")
-                failed_count += 1
-                continue
+    with Progress.from_args(args, total=len(articles), label="抓取") as progress:
+        for i, article in enumerate(articles, 1):
+            title = article.get("title", f"文章{i}")
+            url = article.get("url", "")
+            timestamp = article.get("timestamp")
             
-            # 获取标题
-            final_title = content_data.get("title") or title
-            final_title = normalize_title(final_title)
-            
-            if not final_title:
-                print(f"    [FAIL] 无法提取标题")
+            if not url:
+                log("warn", f"[{i}/{len(articles)}] [SKIP] {title} - 无URL")
                 failed_count += 1
+                progress.advance("fail", title=title)
                 continue
             
-            # 转换为 Markdown
-            md_content = html_to_markdown(content_data["html"])
-            
-            # 清理引流链接
-            md_content = clean_promo_tail(md_content)
-            
-            # 生成 front-matter
-            if timestamp:
-                date_str = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                date_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            log("debug", f"[{i}/{len(articles)}] 处理: {title}")
+            log("debug", f"    URL: {url}")
             
-            front_matter = f"""---
+            try:
+                # 抓取文章
+                content_data = fetch_article(url)
+                
+                if "error" in content_data:
+                    error_msg = content_data["error"]
+                    log("warn", f"    [FAIL] {title}: {error_msg}")
+                    if "拦截" in error_msg or "captcha" in error_msg.lower():
+                        blocked_count += 1
+                        log("warn", f"    [INFO] {title}: 被反爬虫拦截，建议使用浏览器扩展手动导出")
+                    failed_count += 1
+                    progress.advance("fail", title=title)
+                    continue
+                
+                # 获取标题
+                final_title = content_data.get("title") or title
+                final_title = normalize_title(final_title)
+                
+                if not final_title:
+                    log("warn", f"    [FAIL] {title}: 无法提取标题")
+                    failed_count += 1
+                    progress.advance("fail", title=title)
+                    continue
+                
+                # 转换为 Markdown
+                md_content = html_to_markdown(content_data["html"])
+                
+                # 清理引流链接
+                md_content = clean_promo_tail(md_content)
+                
+                # 生成 front-matter
+                if timestamp:
+                    date_str = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+                else:
+                    date_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                
+                front_matter = f"""---
 title: {final_title}
 date: {date_str}
 tags:
@@ -243,19 +275,21 @@ tags:
 
 {md_content}
 """
-            
-            # 保存文件
-            filepath = save_markdown(final_title, front_matter, date_str, OUTPUT_DIR)
-            print(f"    [OK] 已保存: {os.path.basename(filepath)}")
-            success_count += 1
-            
-            # 延迟，避免请求过快
-            time.sleep(2)
-            
-        except Exception as e:
-            print(f"    [ERROR] 处理失败: {str(e)}")
-            failed_count += 1
-            continue
+                
+                # 保存文件
+                filepath = save_markdown(final_title, front_matter, date_str, OUTPUT_DIR)
+                log("info", f"    [OK] 已保存: {os.path.basename(filepath)}")
+                success_count += 1
+                progress.advance("ok", title=title)
+                
+                # 延迟，避免请求过快
+                time.sleep(2)
+                
+            except Exception as e:
+                log("error", f"    [ERROR] {title}: 处理失败: {str(e)}")
+                failed_count += 1
+                progress.advance("fail", title=title)
+                continue
     
     print()
     print("=" * 60)
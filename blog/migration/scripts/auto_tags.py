@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+批量为文章自动分配标签和分类，替代统一的"大东山谷精选"标签：
+- 模型：每个标签一组种子关键词 -> 关键词命中得到初始归属 ->
+  以归属文章的 TF-IDF 均值作为标签质心 -> 按文章与各质心的余弦相似度打分
+- 模型（词表、IDF、质心）由 _posts 全部文章拟合，只在有文章未命中缓存时才拟合，
+  进程内复用（get_model()）；语料变化后调用 invalidate_model()，下次打分时重新拟合
+- 结果按正文内容哈希缓存（data/auto_tags_cache.json），缓存绑定模型版本
+  （MODEL_VERSION + TAXONOMY 等参数），修改打分方式或 TAXONOMY 后缓存自动失效；
+  导入新文章不会让已有条目失效
+- 只改写标签为空或仍是默认标签的文章，手工设置的标签保持不变
+
+用法：
+    python scripts/auto_tags.py              # 回填 _posts 中所有使用默认标签的文章
+    python scripts/auto_tags.py --dry-run    # 只打印结果，不写文件
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+
+from post_index import (
+    BASE_DIR,
+    POSTS_DIR,
+    load_posts,
+    read_post,
+    load_permalink_pattern,
+    markdown_to_text,
+    set_field,
+    join_front_matter,
+)
+from post_writer import write_post
+from build_related_posts import count_matrix, inverse_df, apply_idf
+from build_search_index import tokenize
+
+
+DATA_DIR = os.path.join(BASE_DIR, "data")
+CACHE_FILE = os.path.join(DATA_DIR, "auto_tags_cache.json")
+
+DEFAULT_TAG = "大东山谷精选"
+FALLBACK_TAG = "随笔"
+MAX_TAGS = 2
+# 次要标签得分至少达到最高分的这个比例才保留
+SECONDARY_RATIO = 0.6
+
+# 标签 -> (分类, 种子关键词)
+TAXONOMY = {
+    "数字电路": ("芯片设计", ["verilog", "fpga", "芯片", "时序", "打拍", "握手", "fifo", "valid", "ready", "寄存器"]),
+    "育儿": ("教育", ["孩子", "儿子", "阿勋", "育儿", "幼儿园", "家长"]),
+    "教育": ("教育", ["教育", "学校", "老师", "高考", "辅导班", "考试"]),
+    "亲情": ("生活", ["父亲", "母亲", "老爸", "妈妈", "爸爸", "母爱", "四哥", "家谱"]),
+    "故乡": ("生活", ["故乡", "老家", "家乡", "村子", "农村", "童年"]),
+    "职场": ("观点", ["工作", "职场", "公司", "加班", "996", "同事", "老板"]),
+    "时评": ("观点", ["时评", "社会", "阶层", "新闻", "网友"]),
+    "随笔": ("生活", ["生活", "人生", "朋友", "旅行", "日子", "回忆"]),
+}
+TAG_NAMES = list(TAXONOMY)
+# 打分方式变化时递增，使旧缓存失效
+MODEL_VERSION = 2
+
+
+def model_signature() -> str:
+    payload = json.dumps([MODEL_VERSION, TAXONOMY, MAX_TAGS, SECONDARY_RATIO], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def content_hash(title: str, body: str) -> str:
+    return hashlib.sha1((title + "\n" + body).encode("utf-8")).hexdigest()
+
+
+def post_text(post: dict) -> str:
+    return post["title"] + "\n" + markdown_to_text(post["body"])
+
+
+def load_cache() -> dict:
+    """读取与模型版本一致的缓存（条目以正文内容哈希为键）；版本不同时返回空缓存"""
+    if os.path.exists(CACHE_FILE):
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("signature") == model_signature():
+            return cache
+    return {"signature": model_signature(), "entries": {}}
+
+
+def save_cache(cache: dict):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with open(CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
+
+
+def keyword_matrix(vocab: dict):
+    """token x 标签 的 0/1 矩阵：token 属于该标签的某个种子关键词"""
+    rows, cols = [], []
+    for tag_idx, tag in enumerate(TAG_NAMES):
+        for keyword in TAXONOMY[tag][1]:
+            for token, _ in tokenize(keyword):
+                if token in vocab:
+                    rows.append(vocab[token])
+                    cols.append(tag_idx)
+    data = np.ones(len(rows))
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(vocab), len(TAG_NAMES)))
+
+
+class TagModel:
+    """由语料拟合的词表、IDF 和标签质心；拟合后可对任意文章打分而不必重算整个语料"""
+
+    def __init__(self, posts):
+        counts, self.vocab = count_matrix([post_text(p) for p in posts])
+        self.keywords = keyword_matrix(self.vocab)
+        # 关键词命中次数（文章 x 标签）
+        seed = (counts @ self.keywords).toarray()
+
+        # 初始归属：按命中次数行归一化
+        totals = seed.sum(axis=1, keepdims=True)
+        membership = np.divide(seed, totals, out=np.zeros_like(seed), where=totals > 0)
+
+        # 标签质心 = 归属权重加权的 TF-IDF 均值，再做 L2 归一化
+        self.idf = inverse_df(np.bincount(counts.indices, minlength=counts.shape[1]), counts.shape[0])
+        tfidf = apply_idf(counts, self.idf)
+        centroids = (sparse.csr_matrix(membership.T) @ tfidf).toarray()
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        self.centroids = np.divide(centroids, norms, out=np.zeros_like(centroids), where=norms > 0)
+
+    def score(self, texts):
+        """按拟合时的词表打分，返回 文章 x 标签 的得分矩阵"""
+        counts, _ = count_matrix(texts, self.vocab)
+        seed = (counts @ self.keywords).toarray()
+        # 最终得分：与质心的余弦相似度，只保留有关键词命中的标签
+        similarity = apply_idf(counts, self.idf) @ self.centroids.T
+        return np.where(seed > 0, similarity, 0.0)
+
+
+_model = None
+
+
+def get_model() -> TagModel:
+    """本进程的标签模型：第一次调用时用 _posts 全部文章拟合，之后直接复用"""
+    global _model
+    if _model is None:
+        _model = TagModel(load_posts())
+    return _model
+
+
+def invalidate_model():
+    """_posts 有新文章后丢弃本进程的模型，下次需要打分时用新语料重新拟合"""
+    global _model
+    _model = None
+
+
+def pick_tags(scores_row):
+    order = np.argsort(-scores_row)
+    best = scores_row[order[0]]
+    if best <= 0:
+        tags = [FALLBACK_TAG]
+    else:
+        tags = [TAG_NAMES[i] for i in order[:MAX_TAGS] if scores_row[i] >= best * SECONDARY_RATIO]
+    return tags, [TAXONOMY[tags[0]][0]]
+
+
+def classify_posts(posts, cache: dict, fit=get_model) -> list:
+    """返回与 posts 一一对应的 {"tags", "categories"}
+
+    只对未命中缓存的文章打分；全部命中时不调用 fit()，不拟合模型。
+    """
+    hashes = [content_hash(p["title"], p["body"]) for p in posts]
+    entries = cache["entries"]
+    missing = [i for i, h in enumerate(hashes) if h not in entries]
+    if missing:
+        scores = fit().score([post_text(posts[i]) for i in missing])
+        for i, row in zip(missing, scores):
+            tags, categories = pick_tags(row)
+            entries[hashes[i]] = {"tags": tags, "categories": categories}
+    return [entries[h] for h in hashes]
+
+
+def needs_tags(post: dict) -> bool:
+    return not post["tags"] or post["tags"] == [DEFAULT_TAG]
+
+
+def apply_tags(post: dict, result: dict) -> bool:
+    """把标签/分类写回文章 front-matter，内容有变化时返回 True"""
+    fm = set_field(post["fm"] or "", "tags", result["tags"])
+    if "categories" not in post["fields"]:
+        fm = set_field(fm, "categories", result["categories"])
+    if fm == post["fm"]:
+        return False
+    write_post(post["path"], join_front_matter(fm, post["body"]))
+    return True
+
+
+def retag_files(paths) -> list:
+    """为指定文章（已写入 _posts）分配标签，返回实际改写的文件
+
+    只读取指定的文章；有文章未命中缓存时才拟合（或复用本进程已拟合的）模型。
+    """
+    pattern = load_permalink_pattern()
+    posts = [read_post(Path(p), pattern) for p in paths if Path(p).exists()]
+    posts = [post for post in posts if needs_tags(post)]
+    if not posts:
+        return []
+    cache = load_cache()
+    cached_before = len(cache["entries"])
+    results = classify_posts(posts, cache)
+    if len(cache["entries"]) != cached_before:
+        save_cache(cache)
+
+    return [post["path"] for post, result in zip(posts, results) if apply_tags(post, result)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量自动分配标签和分类")
+    parser.add_argument("--dry-run", action="store_true", help="只打印结果，不写文件")
+    args = parser.parse_args()
+
+    posts = load_posts()
+    if not posts:
+        print(f"[ERROR] 未找到文章: {POSTS_DIR}")
+        return 1
+
+    cache = load_cache()
+    cached_before = len(cache["entries"])
+    results = classify_posts(posts, cache, fit=lambda: TagModel(posts))
+    save_cache(cache)
+
+    changed = 0
+    tag_counts = {}
+    for post, result in zip(posts, results):
+        if not needs_tags(post):
+            continue
+        for tag in result["tags"]:
+            tag_counts[tag] = tag_counts.get(tag, 0) + 1
+        label = f"{','.join(result['tags'])} / {result['categories'][0]}"
+        if args.dry_run:
+            print(f"  {post['file']}: {label}")
+        elif apply_tags(post, result):
+            changed += 1
+            print(f"[OK] {post['file']}: {label}")
+
+    print(f"\n[SUMMARY] posts={len(posts)}, changed={changed}, "
+          f"newly_classified={len(cache['entries']) - cached_before}")
+    print("标签分布: " + ", ".join(f"{t}={n}" for t, n in sorted(tag_counts.items(), key=lambda kv: -kv[1])))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+根据 _posts 生成文章目录页 blog/source/catalog/index.md，替代手工维护：
+- 数据来自 post_index 的 front-matter 索引缓存，未改动的文章不重新解析
+- 文章链接按 _config.yml 的 permalink 规则生成
+- 按年/月分组、日期倒序，front-matter 含 top 的文章标注 ⭐置顶
+- 只有渲染结果变化时才改写文件，避免无谓触发 Hexo 重新生成
+
+用法：
+    python scripts/build_catalog.py
+    python scripts/build_catalog.py --check   # 只检查目录页是否过期（过期时返回 1）
+"""
+
+import os
+import sys
+import argparse
+from itertools import groupby
+
+from post_index import BLOG_DIR, POSTS_DIR, load_post_index, split_front_matter
+
+
+CATALOG_FILE = os.path.join(BLOG_DIR, "source", "catalog", "index.md")
+
+DEFAULT_FRONT_MATTER = """title: 文章目录
+date: 2024-01-01 00:00:00
+type: "catalog"
+comments: false"""
+
+FOOTER = "> 💡 **提示**：您也可以访问 [归档页面](/archives/) 查看所有文章的完整列表。"
+
+
+def render_catalog(entries, front_matter: str = DEFAULT_FRONT_MATTER) -> str:
+    entries = sorted(entries, key=lambda e: e["date"], reverse=True)
+    lines = ["---", front_matter, "---", "", "# 文章目录", ""]
+    for year, year_items in groupby(entries, key=lambda e: e["date"].year):
+        lines.append(f"## {year}年")
+        lines.append("")
+        for month, month_items in groupby(year_items, key=lambda e: e["date"].month):
+            lines.append(f"### {year}年{month:02d}月")
+            for e in month_items:
+                mark = " ⭐置顶" if e.get("top") else ""
+                lines.append(f"- [{e['title']}]({e['url']}){mark}")
+            lines.append("")
+    lines += ["---", "", FOOTER, ""]
+    return "\n".join(lines)
+
+
+def read_catalog():
+    """返回 (当前文件内容, 沿用的 front-matter)"""
+    if not os.path.exists(CATALOG_FILE):
+        return None, DEFAULT_FRONT_MATTER
+    with open(CATALOG_FILE, "r", encoding="utf-8") as f:
+        current = f.read()
+    fm, _ = split_front_matter(current)
+    return current, fm or DEFAULT_FRONT_MATTER
+
+
+def update_catalog() -> bool:
+    """重新生成目录页，内容有变化并写入时返回 True"""
+    current, fm = read_catalog()
+    rendered = render_catalog(load_post_index(), fm)
+    if rendered == current:
+        return False
+    os.makedirs(os.path.dirname(CATALOG_FILE), exist_ok=True)
+    with open(CATALOG_FILE, "w", encoding="utf-8") as f:
+        f.write(rendered)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="根据 _posts 生成文章目录页")
+    parser.add_argument("--check", action="store_true", help="只检查目录页是否需要更新")
+    args = parser.parse_args()
+
+    entries = load_post_index()
+    if not entries:
+        print(f"[ERROR] 未找到文章: {POSTS_DIR}")
+        return 1
+
+    if args.check:
+        current, fm = read_catalog()
+        if render_catalog(entries, fm) != current:
+            print(f"[WARN] 目录页已过期: {CATALOG_FILE}")
+            return 1
+        print(f"[OK] 目录页是最新的（{len(entries)} 篇）")
+        return 0
+
+    if update_catalog():
+        print(f"[OK] 已更新目录页: {CATALOG_FILE}（{len(entries)} 篇）")
+    else:
+        print(f"[SKIP] 目录页无变化（{len(entries)} 篇）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
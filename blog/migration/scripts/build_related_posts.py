@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+预计算"相关文章"：
+- 输入：blog/source/_posts/*.md（front-matter 之外的正文，转为纯文本后分词）
+- 分词：与搜索索引相同（中文 bigram + 英文单词）
+- 构建稀疏 TF-IDF 矩阵（对数词频 + 平滑 IDF + 行 L2 归一化）
+- 按行分块做稀疏矩阵乘法求余弦相似度，每块只保留每行的 top-k，
+  不生成 n x n 稠密矩阵，内存随块大小而不是文章数的平方增长
+- 输出：blog/source/_data/related_posts.json（不入库，hexo generate/server 时
+  由 blog/scripts/derived-data.js 运行本脚本生成），
+  站点脚本 blog/scripts/related-posts.js 据此在文章末尾渲染"相关文章"，渲染时无需计算
+
+用法：python scripts/build_related_posts.py [--top-k 5]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+# numpy/scipy 为可选依赖：未安装时跳过相关文章（站点生成时由 derived-data.js 调用，不能因此失败）
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError as e:
+    np = sparse = None
+    MISSING_DEPENDENCY = e.name
+else:
+    MISSING_DEPENDENCY = None
+
+from post_index import BLOG_DIR, load_posts, markdown_to_text
+from build_search_index import tokenize
+
+
+OUTPUT_FILE = os.path.join(BLOG_DIR, "source", "_data", "related_posts.json")
+TOP_K = 5
+# 只在一篇文章中出现的 token 对相似度没有贡献，直接丢弃
+MIN_DF = 2
+# 出现在过多文章里的 token 区分度太低
+MAX_DF_RATIO = 0.5
+# 每次相乘的行数
+BLOCK_ROWS = 256
+
+
+def count_matrix(texts, vocab: dict = None):
+    """词频稀疏矩阵（文章 x token）与词表
+
+    传入 vocab 时按已有词表计数，词表外的 token 忽略，词表不变。
+    """
+    fixed = vocab is not None
+    vocab = vocab if fixed else {}
+    rows, cols, counts = [], [], []
+    for doc_id, text in enumerate(texts):
+        tf = {}
+        for token, _ in tokenize(text):
+            if fixed:
+                col = vocab.get(token)
+                if col is None:
+                    continue
+            else:
+                col = vocab.setdefault(token, len(vocab))
+            tf[col] = tf.get(col, 0) + 1
+        rows.extend([doc_id] * len(tf))
+        cols.extend(tf.keys())
+        counts.extend(tf.values())
+
+    matrix = sparse.csr_matrix(
+        (np.asarray(counts, dtype=np.float64), (rows, cols)),
+        shape=(len(texts), len(vocab)),
+    )
+    return matrix, vocab
+
+
+def tfidf_from_counts(counts, min_df: int = MIN_DF, max_df_ratio: float = MAX_DF_RATIO):
+    """返回 (行归一化的 TF-IDF 矩阵, 保留下来的列下标)"""
+    n_docs = counts.shape[0]
+    df = np.bincount(counts.indices, minlength=counts.shape[1])
+    keep = np.flatnonzero((df >= min_df) & (df <= max(min_df, max_df_ratio * n_docs)))
+    counts = counts[:, keep]
+    df = df[keep]
+
+    return apply_idf(counts, inverse_df(df, n_docs)), keep
+
+
+def inverse_df(df, n_docs: int):
+    """平滑 IDF"""
+    return np.log((1 + n_docs) / (1 + df)) + 1.0
+
+
+def apply_idf(counts, idf):
+    """词频矩阵按给定 IDF 加权（次线性 TF），再做行 L2 归一化"""
+    tfidf = counts.copy()
+    tfidf.data = 1.0 + np.log(tfidf.data)
+    tfidf = tfidf.multiply(idf).tocsr()
+
+    norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ tfidf
+
+
+def build_tfidf(texts):
+    """返回行归一化的 TF-IDF 稀疏矩阵（文章 x token）"""
+    counts, _ = count_matrix(texts)
+    matrix, _ = tfidf_from_counts(counts)
+    return matrix
+
+
+def top_k_neighbours(matrix, k: int, block_rows: int = BLOCK_ROWS):
+    """分块稀疏乘法求余弦相似度，返回 (索引, 分数) 两个 n x k 数组
+
+    相似的文章不足 k 篇时，空位的索引为 -1、分数为 0。
+    """
+    n = matrix.shape[0]
+    k = min(k, n - 1)
+    idx = np.full((n, k), -1, dtype=np.int64)
+    scores = np.zeros((n, k))
+    matrix_t = matrix.T.tocsc()
+    for start in range(0, n, block_rows):
+        block = (matrix[start:start + block_rows] @ matrix_t).tocsr()
+        for r in range(block.shape[0]):
+            row = start + r
+            cols = block.indices[block.indptr[r]:block.indptr[r + 1]]
+            vals = block.data[block.indptr[r]:block.indptr[r + 1]]
+            keep = (cols != row) & (vals > 0)
+            cols, vals = cols[keep], vals[keep]
+            if len(vals) > k:
+                part = np.argpartition(-vals, k - 1)[:k]
+                cols, vals = cols[part], vals[part]
+            order = np.lexsort((cols, -vals))
+            idx[row, :len(order)] = cols[order]
+            scores[row, :len(order)] = vals[order]
+    return idx, scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="预计算相关文章")
+    parser.add_argument("--top-k", type=int, default=TOP_K, help="每篇文章保留的相关文章数")
+    args = parser.parse_args()
+
+    if MISSING_DEPENDENCY:
+        print(f"[WARN] 未安装 {MISSING_DEPENDENCY}，跳过相关文章（pip install numpy scipy）")
+        return 0
+
+    started = time.perf_counter()
+    posts = load_posts()
+    if len(posts) < 2:
+        print("[ERROR] 文章数量不足，无法计算相关文章")
+        return 1
+
+    texts = [p["title"] + "\n" + markdown_to_text(p["body"]) for p in posts]
+    matrix = build_tfidf(texts)
+    neighbours, scores = top_k_neighbours(matrix, args.top_k)
+
+    related = {}
+    for i, post in enumerate(posts):
+        items = []
+        for j, score in zip(neighbours[i], scores[i]):
+            if score <= 0:
+                continue
+            other = posts[j]
+            items.append({
+                "title": other["title"],
+                "url": other["url"],
+                "score": round(float(score), 4),
+            })
+        related[post["url"]] = items
+
+    os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
+    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+        json.dump(related, f, ensure_ascii=False, indent=2)
+
+    elapsed = time.perf_counter() - started
+    print(f"[OK] {len(posts)} 篇文章，词表 {matrix.shape[1]}，耗时 {elapsed * 1000:.0f} ms")
+    print(f"     已写入: {OUTPUT_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+预生成分片的全文搜索索引，替代一次性下载整个 search.xml（站点不再生成 search.xml）：
+- 输入：blog/source/_posts/*.md
+- 输出：blog/source/search-index/
+  - meta.json          文章列表（id/title/url/date）与分片参数
+  - shards/NN.json     倒排表分片：token -> [[文章id, 词频, [偏移...]], ...]
+  - docs/ID.json       文章纯文本，只在展示结果摘要时按需下载
+- 分词：中文按相邻两字切分（bigram），英文/数字按单词；
+  标题额外加入拼音首字母 bigram（需要 pypinyin），支持 "cmb" 搜 "臭毛病"
+- 分片：按 token 的 FNV-1a 哈希分配到固定数量的分片，前端只下载查询用到的分片
+- 前端：source/search/ 搜索页加载 source/js/shard-search.js 查询本索引；
+  索引不入库，hexo generate/server 时由 blog/scripts/derived-data.js 运行本脚本生成
+
+用法：python scripts/build_search_index.py
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+from collections import defaultdict
+
+from post_index import BLOG_DIR, load_posts, markdown_to_text
+
+
+OUTPUT_DIR = os.path.join(BLOG_DIR, "source", "search-index")
+SHARD_COUNT = 32
+# 每个 posting 最多保留的摘要偏移数量
+MAX_OFFSETS = 3
+PINYIN_PREFIX = "py:"
+
+TOKEN_RE = re.compile(r"[㐀-䶿一-鿿豈-﫿]+|[a-z0-9]+")
+
+
+def is_cjk(ch: str) -> bool:
+    return "㐀" <= ch <= "鿿" or "豈" <= ch <= "﫿"
+
+
+def tokenize(text: str):
+    """生成 (token, 偏移)；中文 bigram，英文/数字整词（单字符英文忽略）"""
+    for m in TOKEN_RE.finditer(text.lower()):
+        run, start = m.group(0), m.start()
+        if is_cjk(run[0]):
+            if len(run) == 1:
+                yield run, start
+            for i in range(len(run) - 1):
+                yield run[i:i + 2], start + i
+        elif len(run) > 1:
+            yield run, start
+
+
+def load_pinyin():
+    """pypinyin 为可选依赖，未安装时跳过拼音首字母索引"""
+    try:
+        from pypinyin import lazy_pinyin, Style
+    except ImportError:
+        print("[WARN] 未安装 pypinyin，跳过拼音首字母索引（pip install pypinyin）")
+        return None
+    return lambda s: "".join(lazy_pinyin(s, style=Style.FIRST_LETTER))
+
+
+def pinyin_tokens(title: str, to_initials):
+    """标题中每段中文的拼音首字母 bigram，偏移指向对应汉字"""
+    for m in TOKEN_RE.finditer(title):
+        run = m.group(0)
+        if not is_cjk(run[0]):
+            continue
+        initials = to_initials(run).lower()
+        if len(initials) != len(run):
+            continue
+        for i in range(len(initials) - 1):
+            yield PINYIN_PREFIX + initials[i:i + 2], m.start() + i
+
+
+def token_hash(token: str) -> int:
+    """32 位 FNV-1a；token 只含 BMP 字符，与前端按 charCodeAt 计算的结果一致"""
+    h = 0x811C9DC5
+    for ch in token:
+        h = ((h ^ ord(ch)) * 0x01000193) & 0xFFFFFFFF
+    return h
+
+
+def shard_of(token: str) -> int:
+    """按 token 哈希分片（前端用同样的规则定位分片）。
+    按首字符取模会把所有英文/拼音 token 挤进少数几个分片"""
+    return token_hash(token) % SHARD_COUNT
+
+
+def build_index(posts, to_initials=None):
+    """返回 (docs, texts, postings)；postings: token -> {doc_id: [tf, offsets]}"""
+    docs = []
+    texts = []
+    postings = defaultdict(dict)
+
+    # 新文章在前，与站点默认排序一致
+    posts = sorted(posts, key=lambda p: p["date"], reverse=True)
+    for doc_id, post in enumerate(posts):
+        title = post["title"]
+        text = title + "\n" + markdown_to_text(post["body"])
+        docs.append({
+            "id": doc_id,
+            "title": title,
+            "url": post["url"],
+            "date": post["date"].strftime("%Y-%m-%d"),
+        })
+        texts.append(text)
+
+        tokens = tokenize(text)
+        if to_initials:
+            tokens = list(tokens) + list(pinyin_tokens(title, to_initials))
+        for token, offset in tokens:
+            entry = postings[token].get(doc_id)
+            if entry is None:
+                postings[token][doc_id] = [1, [offset]]
+            else:
+                entry[0] += 1
+                if len(entry[1]) < MAX_OFFSETS:
+                    entry[1].append(offset)
+
+    return docs, texts, postings
+
+
+def write_json(path: str, data) -> int:
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(payload)
+    return len(payload.encode("utf-8"))
+
+
+def write_index(docs, texts, postings, output_dir: str = OUTPUT_DIR):
+    """写出 meta/分片/正文文件，返回各分片字节数"""
+    shards = defaultdict(dict)
+    for token, docs_for_token in postings.items():
+        shards[shard_of(token)][token] = [
+            [doc_id, tf, offsets] for doc_id, (tf, offsets) in sorted(docs_for_token.items())
+        ]
+
+    # 每次全量重建，先清掉旧文件避免残留过期分片
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    os.makedirs(os.path.join(output_dir, "shards"))
+    os.makedirs(os.path.join(output_dir, "docs"))
+
+    shard_sizes = {}
+    for shard_id in range(SHARD_COUNT):
+        path = os.path.join(output_dir, "shards", f"{shard_id:02d}.json")
+        shard_sizes[shard_id] = write_json(path, shards.get(shard_id, {}))
+
+    for doc, text in zip(docs, texts):
+        write_json(os.path.join(output_dir, "docs", f"{doc['id']}.json"), {"text": text})
+
+    meta = {
+        "version": 2,
+        "shard_count": SHARD_COUNT,
+        "pinyin_prefix": PINYIN_PREFIX,
+        "docs": docs,
+    }
+    meta_size = write_json(os.path.join(output_dir, "meta.json"), meta)
+    return shard_sizes, meta_size
+
+
+def main():
+    print("=" * 60)
+    print("生成分片搜索索引")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    posts = load_posts()
+    if not posts:
+        print("[ERROR] _posts 中没有文章")
+        return 1
+
+    docs, texts, postings = build_index(posts, load_pinyin())
+    shard_sizes, meta_size = write_index(docs, texts, postings)
+    elapsed = time.perf_counter() - started
+
+    sizes = sorted(shard_sizes.values())
+    total = sum(sizes)
+    print(f"文章数: {len(docs)}，token 数: {len(postings)}")
+    print(f"构建耗时: {elapsed * 1000:.0f} ms")
+    print(f"meta.json: {meta_size / 1024:.1f} KB")
+    print(f"分片: {SHARD_COUNT} 个，合计 {total / 1024:.1f} KB，"
+          f"最小 {sizes[0] / 1024:.1f} KB / 平均 {total / len(sizes) / 1024:.1f} KB / 最大 {sizes[-1] / 1024:.1f} KB")
+    largest = sorted(shard_sizes.items(), key=lambda kv: kv[1], reverse=True)[:5]
+    print("最大分片: " + ", ".join(f"{sid:02d}={size / 1024:.1f}KB" for sid, size in largest))
+    print(f"[OK] 索引已写入: {OUTPUT_DIR}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+检查 _posts 中的外部链接和图片地址是否失效：
+- 提取 Markdown 链接/图片、HTML href/src 以及裸链接中的 http(s) 地址
+- asyncio 并发检查：全局并发上限 + 每个域名单独限流
+- 先发 HEAD，服务器不支持 HEAD（405/403/501 等）或出错时退回 GET
+- 微信文章被删除时仍返回 200，额外检查页面中的删除提示
+- 结果缓存在 data/link_check_cache.json：正常链接缓存 7 天、失效链接 1 天，
+  每日运行只重新检查过期的条目
+- 报告按文章分组输出，并写入 data/link_check_report.json
+
+依赖：pip install aiohttp
+
+用法：
+    python scripts/check_links.py
+    python scripts/check_links.py --force            # 忽略缓存全部重查
+    python scripts/check_links.py --per-host 1 --concurrency 8
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import argparse
+from urllib.parse import urlsplit
+
+from post_index import BASE_DIR, POSTS_DIR, load_posts
+
+
+DATA_DIR = os.path.join(BASE_DIR, "data")
+CACHE_FILE = os.path.join(DATA_DIR, "link_check_cache.json")
+REPORT_FILE = os.path.join(DATA_DIR, "link_check_report.json")
+
+OK_TTL = 7 * 24 * 3600
+FAILED_TTL = 24 * 3600
+CONCURRENCY = 16
+PER_HOST = 2
+TIMEOUT = 15
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0",
+    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+}
+
+# HEAD 返回这些状态码时不可信，改用 GET 再确认
+HEAD_FALLBACK_STATUS = {400, 403, 404, 405, 429, 501}
+
+# 微信文章删除/违规后仍返回 200，只能看页面内容
+WECHAT_DEAD_MARKERS = ["该内容已被发布者删除", "此内容因违规无法查看", "该公众号已迁移", "内容已被删除"]
+
+URL_PATTERNS = [
+    re.compile(r"!?\[[^\]]*\]\((https?://[^)\s]+)"),
+    re.compile(r"""(?:href|src)\s*=\s*["'](https?://[^"']+)["']""", re.IGNORECASE),
+    re.compile(r"<(https?://[^>\s]+)>"),
+    # 裸链接在中文正文里常紧跟全角标点，遇到非 ASCII 字符即结束
+    re.compile(r"(?<![(\"'<=])(https?://[!#-&*-;=?-~]+)"),
+]
+
+
+def extract_urls(body: str) -> list:
+    """提取正文中的外部链接，保持首次出现的顺序"""
+    seen = {}
+    for pattern in URL_PATTERNS:
+        for m in pattern.finditer(body):
+            url = m.group(1).rstrip(".,;:!?，。；：！？")
+            seen.setdefault(url, m.start())
+    return sorted(seen, key=seen.get)
+
+
+def load_cache() -> dict:
+    if os.path.exists(CACHE_FILE):
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_cache(cache: dict):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with open(CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
+
+
+def is_fresh(entry: dict, now: float) -> bool:
+    ttl = OK_TTL if entry.get("ok") else FAILED_TTL
+    return now - entry.get("checked", 0) < ttl
+
+
+class LinkChecker:
+    """并发检查一组 URL；每个域名一个信号量，外加全局信号量"""
+
+    def __init__(self, session, concurrency: int, per_host: int):
+        self.session = session
+        self.per_host = per_host
+        self.global_limit = asyncio.Semaphore(concurrency)
+        self.host_limits = {}
+
+    def host_limit(self, url: str):
+        host = urlsplit(url).hostname or ""
+        if host not in self.host_limits:
+            self.host_limits[host] = asyncio.Semaphore(self.per_host)
+        return self.host_limits[host]
+
+    async def request(self, method: str, url: str):
+        async with self.session.request(method, url, allow_redirects=True) as resp:
+            text = ""
+            if method == "GET" and "mp.weixin.qq.com" in url:
+                text = await resp.text(errors="ignore")
+            return resp.status, str(resp.url), text
+
+    async def check(self, url: str) -> dict:
+        # 先占域名再占全局：同一域名排队的任务不占全局名额，其他域名不会被饿死
+        async with self.host_limit(url), self.global_limit:
+            entry = {"checked": time.time(), "method": "HEAD"}
+            try:
+                # 微信文章需要看页面内容，直接 GET
+                if "mp.weixin.qq.com" in url:
+                    raise LookupError
+                status, final_url, _ = await self.request("HEAD", url)
+                if status in HEAD_FALLBACK_STATUS or status >= 500:
+                    raise LookupError
+            except Exception:
+                entry["method"] = "GET"
+                try:
+                    status, final_url, text = await self.request("GET", url)
+                except Exception as e:
+                    entry.update(ok=False, status=None, error=f"{type(e).__name__}: {e}".strip(": "))
+                    return entry
+
+            entry.update(ok=status < 400, status=status)
+            if final_url != url:
+                entry["final_url"] = final_url
+            if entry["ok"] and entry["method"] == "GET" and "mp.weixin.qq.com" in url:
+                marker = next((m for m in WECHAT_DEAD_MARKERS if m in text), None)
+                if marker:
+                    entry.update(ok=False, error=marker)
+            return entry
+
+
+async def check_all(urls, concurrency: int, per_host: int, timeout: float) -> dict:
+    import aiohttp
+
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(headers=HEADERS, timeout=client_timeout, connector=connector) as session:
+        checker = LinkChecker(session, concurrency, per_host)
+        results = await asyncio.gather(*(checker.check(u) for u in urls))
+    return dict(zip(urls, results))
+
+
+def describe(entry: dict) -> str:
+    if entry.get("error"):
+        return entry["error"] if entry.get("status") is None else f"{entry['status']} {entry['error']}"
+    return str(entry.get("status"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="检查文章中的外部链接")
+    parser.add_argument("--force", action="store_true", help="忽略缓存，全部重新检查")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="全局并发数")
+    parser.add_argument("--per-host", type=int, default=PER_HOST, help="单个域名的并发数")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="单个请求超时（秒）")
+    args = parser.parse_args()
+
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        print("[ERROR] 需要安装 aiohttp: pip install aiohttp")
+        return 1
+
+    posts = load_posts()
+    if not posts:
+        print(f"[ERROR] 未找到文章: {POSTS_DIR}")
+        return 1
+
+    post_urls = {p["file"]: extract_urls(p["body"]) for p in posts}
+    all_urls = sorted({u for urls in post_urls.values() for u in urls})
+
+    cache = {} if args.force else load_cache()
+    now = time.time()
+    stale = [u for u in all_urls if u not in cache or not is_fresh(cache[u], now)]
+    print(f"[INFO] 文章 {len(posts)} 篇，链接 {len(all_urls)} 个，需要检查 {len(stale)} 个")
+
+    started = time.perf_counter()
+    if stale:
+        cache.update(asyncio.run(check_all(stale, args.concurrency, args.per_host, args.timeout)))
+        save_cache(cache)
+    elapsed = time.perf_counter() - started
+
+    report = {}
+    for file, urls in post_urls.items():
+        broken = [{"url": u, **cache[u]} for u in urls if not cache[u].get("ok")]
+        if broken:
+            report[file] = broken
+
+    for file, broken in report.items():
+        print(f"\n{file}")
+        for item in broken:
+            print(f"  [DEAD] {describe(item)}  {item['url']}")
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with open(REPORT_FILE, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    dead = sum(len(v) for v in report.values())
+    print(f"\n[SUMMARY] links={len(all_urls)}, checked={len(stale)}, cached={len(all_urls) - len(stale)}, "
+          f"dead={dead}, posts_with_dead_links={len(report)}, elapsed={elapsed:.1f}s")
+    print(f"[INFO] 报告已保存: {REPORT_FILE}")
+    return 1 if dead else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,7 @@ import os
 import sys
 import json
 import re
+import argparse
 from bs4 import BeautifulSoup
 from datetime import datetime
 import html2text
@@ -16,6 +17,9 @@ import html2text
 # 添加项目根目录到路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from progress import Progress, add_progress_args, log
+from memory_profile import MemoryProfiler, add_memory_args
+
 # 配置
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 ARTICLES_LIST_FILE = os.path.join(DATA_DIR, "articles_list.json")
@@ -37,8 +41,8 @@ def create_directories():
     os.makedirs(ARTICLES_MARKDOWN_DIR, exist_ok=True)
 
 def strip_promo_tail(text: str) -> str:
-    \"\"\"从底向上定位引流尾巴，截断其后所有内容。\"\"\"
-    lines = text.split('\\n')
+    """从底向上定位引流尾巴，截断其后所有内容。"""
+    lines = text.split('\n')
     cut_idx = None
 
     for idx in range(len(lines) - 1, -1, -1):
@@ -59,7 +63,7 @@ def strip_promo_tail(text: str) -> str:
     while cut_idx > 0 and not lines[cut_idx - 1].strip():
         cut_idx -= 1
 
-    return '\\n'.join(lines[:cut_idx]).rstrip()
+    return '\n'.join(lines[:cut_idx]).rstrip()
 
 def html_to_markdown(html_content):
     """
@@ -148,7 +152,7 @@ tags:
 def convert_article(article):
     """转换单篇文章"""
     title = article.get('title', '未命名文章')
-    print(f"正在转换: {title}")
+    log("debug", f"正在转换: {title}")
     
     # 获取HTML内容
     html_content = article.get('content')
@@ -159,7 +163,7 @@ def convert_article(article):
             with open(html_file, 'r', encoding='utf-8') as f:
                 html_content = f.read()
         else:
-            print(f"  错误：无法获取文章内容")
+            log("error", f"  错误：无法获取文章内容: {title}")
             return None
     
     # 转换为Markdown
@@ -178,7 +182,7 @@ def convert_article(article):
     with open(markdown_file, 'w', encoding='utf-8') as f:
         f.write(full_content)
     
-    print(f"  已保存: {markdown_file}")
+    log("info", f"  已保存: {markdown_file}")
     
     return {
         'title': title,
@@ -188,6 +192,12 @@ def convert_article(article):
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="将抓取的 HTML 转换为 Hexo Markdown")
+    add_progress_args(parser)
+    add_memory_args(parser)
+    args = parser.parse_args()
+    profiler = MemoryProfiler.from_args(args, "convert_format")
+    
     print("=" * 60)
     print("文章格式转换工具")
     print("=" * 60)
@@ -200,24 +210,27 @@ def main():
         print("请先运行 fetch_articles.py 获取文章列表")
         return
     
-    with open(ARTICLES_LIST_FILE, 'r', encoding='utf-8') as f:
+    with profiler.stage("load"), open(ARTICLES_LIST_FILE, 'r', encoding='utf-8') as f:
         articles = json.load(f)
     
     print(f"\n找到 {len(articles)} 篇文章，开始转换...\n")
     
     converted_articles = []
     
-    for i, article in enumerate(articles, 1):
-        print(f"[{i}/{len(articles)}] ", end='')
-        converted = convert_article(article)
-        
-        if converted:
-            converted_articles.append(converted)
+    with profiler.stage("convert"), Progress.from_args(args, total=len(articles), label="转换") as progress:
+        for i, article in enumerate(articles, 1):
+            log("debug", f"[{i}/{len(articles)}]")
+            converted = convert_article(article)
+            
+            if converted:
+                converted_articles.append(converted)
+            progress.advance("ok" if converted else "fail", title=article.get('title'))
     
     # 保存转换后的文章列表
     converted_list_file = os.path.join(DATA_DIR, "articles_converted.json")
-    with open(converted_list_file, 'w', encoding='utf-8') as f:
+    with profiler.stage("save"), open(converted_list_file, 'w', encoding='utf-8') as f:
         json.dump(converted_articles, f, ensure_ascii=False, indent=2)
+    profiler.save(items=len(articles), converted=len(converted_articles))
     
     print("\n" + "=" * 60)
     print(f"转换完成！共转换 {len(converted_articles)} 篇文章")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+为长文章插入 <!-- more --> 摘要分隔符，首页和分页只渲染分隔符之前的摘要：
+- 从正文开头累计字数和图片数，达到 EXCERPT_CHARS 字或 EXCERPT_IMAGES 张图片后，
+  在下一个段落边界（空行）插入分隔符；摘要至少包含一段文字，不会只有一张封面图
+- 分隔符之后剩余不足 MIN_REST_CHARS 字的短文不插入，直接全文显示
+- 代码块内部、缩进的续行前不插入
+- 已有 <!-- more --> 或 front-matter 已设置 excerpt 的文章不动
+- 导入脚本（import_wechatsync_md.py / import_posts.py）写文章前调用同一规则
+
+用法：
+    python scripts/excerpt.py                        # 回填 _posts 中所有文章
+    python scripts/excerpt.py --dry-run --chars 300 --images 2
+"""
+
+import re
+import sys
+import argparse
+
+from post_index import POSTS_DIR, load_posts, markdown_to_text, join_front_matter
+from post_writer import write_post
+
+
+MORE_MARKER = "<!-- more -->"
+# 摘要字数预算（不计空白）
+EXCERPT_CHARS = 200
+# 摘要图片预算
+EXCERPT_IMAGES = 1
+# 分隔符之后至少还要有这么多字，否则没必要截断
+MIN_REST_CHARS = 200
+
+MORE_RE = re.compile(r"<!--\s*more\s*-->")
+IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)|<img\b", re.IGNORECASE)
+
+
+def visible_chars(line: str) -> int:
+    return len(re.sub(r"\s+", "", markdown_to_text(line)))
+
+
+def has_excerpt(body: str, fields: dict = None) -> bool:
+    return bool(MORE_RE.search(body)) or "excerpt" in (fields or {})
+
+
+def find_break(lines: list, chars: int, images: int):
+    """返回应插入分隔符的空行下标；不需要截断时返回 None"""
+    counts = [visible_chars(line) for line in lines]
+    total = sum(counts)
+    seen_chars = 0
+    seen_images = 0
+    in_code = False
+    for i, line in enumerate(lines):
+        if line.lstrip().startswith(("```", "~~~")):
+            in_code = not in_code
+        if in_code:
+            seen_chars += counts[i]
+            continue
+        if line.strip():
+            seen_chars += counts[i]
+            seen_images += len(IMAGE_RE.findall(line))
+            continue
+        if seen_chars == 0 or (seen_chars < chars and seen_images < images):
+            continue
+        nxt = next((l for l in lines[i + 1:] if l.strip()), None)
+        if nxt is None or nxt.startswith(("    ", "\t")):
+            continue
+        return i if total - seen_chars >= MIN_REST_CHARS else None
+    return None
+
+
+def insert_excerpt_break(body: str, chars: int = EXCERPT_CHARS, images: int = EXCERPT_IMAGES) -> str:
+    """在段落边界插入 <!-- more -->；已有分隔符或文章较短时原样返回"""
+    if has_excerpt(body):
+        return body
+    lines = body.split("\n")
+    i = find_break(lines, chars, images)
+    if i is None:
+        return body
+    return "\n".join(lines[:i + 1] + [MORE_MARKER, ""] + lines[i + 1:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="为长文章插入 <!-- more --> 摘要分隔符")
+    parser.add_argument("--dry-run", action="store_true", help="只打印结果，不写文件")
+    parser.add_argument("--chars", type=int, default=EXCERPT_CHARS, help="摘要字数预算")
+    parser.add_argument("--images", type=int, default=EXCERPT_IMAGES, help="摘要图片预算")
+    args = parser.parse_args()
+
+    posts = load_posts()
+    if not posts:
+        print(f"[ERROR] 未找到文章: {POSTS_DIR}")
+        return 1
+
+    changed = 0
+    for post in posts:
+        if has_excerpt(post["body"], post["fields"]):
+            continue
+        body = insert_excerpt_break(post["body"], args.chars, args.images)
+        if body == post["body"]:
+            continue
+        changed += 1
+        excerpt_chars = visible_chars(body[:body.index(MORE_MARKER)])
+        print(f"[OK] {post['file']}: 摘要 {excerpt_chars} 字")
+        if not args.dry_run:
+            write_post(post["path"], join_front_matter(post["fm"] or "", body))
+
+    print(f"\n[SUMMARY] posts={len(posts)}, changed={changed}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
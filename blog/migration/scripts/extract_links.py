@@ -3,19 +3,31 @@
 """
 文章链接提取脚本
 尝试从微信公众号精选页面提取所有文章链接
+
+增量模式（--incremental）：
+- 以 articles_list.json 中已知的最新 msgid/时间戳为水位线
+- 通过专辑 JSON 接口从新到旧翻页（显式传 is_reverse=0），遇到已知文章即停止；
+  如果某一页的时间戳不是从新到旧（接口顺序变了），不再提前停止，翻完全部页面只补新文章
+- 只把新文章补充进 articles_list.json，日常同步通常只需 1~2 次请求
+
+专辑和输出位置来自 sources.json（sources.py），--source 选择专辑，默认第一个；
+多个专辑并发同步见 ingest_sources.py
 """
 
-import os
 import sys
-import json
 import re
+import argparse
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse, parse_qs
 
+from sources import load_source
+
 # 配置
-ALBUM_URL = "https://mp.weixin.qq.com/mp/appmsgalbum?action=getalbum&album_id=1417552598718332928&__biz=MzIxMjYyMDA2Nw==#wechat_redirect"
-OUTPUT_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "articles_list.json")
+ALBUM_API = "https://mp.weixin.qq.com/mp/appmsgalbum"
+PAGE_SIZE = 10
+# 专辑接口的排序参数：0 为从新到旧（默认），1 为从旧到新
+ALBUM_ORDER_NEWEST_FIRST = "0"
+MAX_PAGES = 50
 
 # 请求头
 HEADERS = {
@@ -30,6 +42,9 @@ HEADERS = {
 
 def extract_links_from_html(html_content):
     """从HTML中提取文章链接"""
+    # 只有解析专辑 HTML 页面时需要 bs4，增量同步走 JSON 接口不需要
+    from bs4 import BeautifulSoup
+
     articles = []
     soup = BeautifulSoup(html_content, 'html.parser')
     
@@ -87,16 +102,16 @@ def extract_links_from_html(html_content):
     
     return articles
 
-def fetch_album_page():
+def fetch_album_page(url):
     """获取精选页面内容"""
     print("正在访问精选文章页面...")
-    print(f"URL: {ALBUM_URL}\n")
+    print(f"URL: {url}\n")
     
     try:
         session = requests.Session()
         session.headers.update(HEADERS)
         
-        response = session.get(ALBUM_URL, timeout=30, allow_redirects=True)
+        response = session.get(url, timeout=30, allow_redirects=True)
         response.encoding = 'utf-8'
         
         print(f"状态码: {response.status_code}")
@@ -112,17 +127,148 @@ def fetch_album_page():
         print(f"访问页面时出错: {str(e)}")
         return None
 
+def article_key(url):
+    """文章唯一标识 (mid, idx)；短链接无法解析时返回 None"""
+    query = parse_qs(urlparse(url or "").query)
+    mid = query.get("mid", [None])[0]
+    if not mid:
+        return None
+    return mid, query.get("idx", ["1"])[0]
+
+
+def fetch_album_json(session, biz, album_id, begin_msgid=None, begin_itemidx=None):
+    """请求专辑 JSON 接口的一页，返回 (文章列表, 是否还有更多)"""
+    params = {
+        "action": "getalbum",
+        "__biz": biz,
+        "album_id": album_id,
+        "count": PAGE_SIZE,
+        "is_reverse": ALBUM_ORDER_NEWEST_FIRST,
+        "f": "json",
+    }
+    if begin_msgid:
+        params["begin_msgid"] = begin_msgid
+        params["begin_itemidx"] = begin_itemidx
+    response = session.get(ALBUM_API, params=params, timeout=30)
+    response.raise_for_status()
+    data = response.json().get("getalbum_resp", {})
+    items = data.get("article_list") or []
+    # 只有一篇时接口返回的是对象而不是数组
+    if isinstance(items, dict):
+        items = [items]
+    return items, str(data.get("continue_flag", "0")) == "1"
+
+
+def newest_first(items) -> bool:
+    """一页文章的 create_time 是否从新到旧（缺时间戳的条目不参与判断）"""
+    stamps = [int(item.get("create_time") or 0) for item in items]
+    stamps = [ts for ts in stamps if ts]
+    return all(a >= b for a, b in zip(stamps, stamps[1:]))
+
+
+def incremental_sync(articles, biz, album_id):
+    """从新到旧翻页，直到遇到已知文章，返回 (新文章列表, 请求次数)
+
+    提前停止依赖接口按从新到旧返回；某一页不是这个顺序时改为翻完全部页面，
+    只跳过已知文章，不会因为第一页就是旧文章而漏掉新文章。
+    """
+    known = {key for key in (article_key(a.get("url")) for a in articles) if key}
+    newest_ts = max((a.get("timestamp") or 0 for a in articles), default=0)
+
+    session = requests.Session()
+    session.headers.update(HEADERS)
+
+    new_articles = []
+    begin = (None, None)
+    requests_made = 0
+    ordered = True
+    while requests_made < MAX_PAGES:
+        items, has_more = fetch_album_json(session, biz, album_id, *begin)
+        requests_made += 1
+
+        ordered = ordered and newest_first(items)
+        reached_known = False
+        for item in items:
+            key = (str(item.get("msgid")), str(item.get("itemidx", "1")))
+            ts = int(item.get("create_time") or 0)
+            if not ordered:
+                if key in known:
+                    continue
+            elif key in known or (newest_ts and ts and ts < newest_ts):
+                reached_known = True
+                break
+            known.add(key)
+            url = (item.get("url") or "").split("#", 1)[0].replace("http://", "https://", 1)
+            new_articles.append({
+                "title": item.get("title") or "未命名文章",
+                "url": url,
+                "timestamp": ts or None,
+                "msgid": key[0],
+            })
+
+        if reached_known or not has_more or not items:
+            break
+        begin = (items[-1].get("msgid"), items[-1].get("itemidx", "1"))
+
+    return new_articles, requests_made
+
+
+def merge_articles(articles, new_articles):
+    """把新文章并入列表，保持新的在前"""
+    merged = new_articles + articles
+    merged.sort(key=lambda x: x.get("timestamp") or 0, reverse=True)
+    return merged
+
+
+def main_incremental(source):
+    """增量同步：只追加比已知最新文章更新的记录"""
+    articles = source.load_articles()
+    print(f"[{source.name}] 已知文章: {len(articles)} 篇，开始增量同步...")
+
+    try:
+        new_articles, requests_made = incremental_sync(articles, source.biz, source.album_id)
+    except Exception as e:
+        print(f"[ERROR] 增量同步失败: {str(e)}")
+        return 1
+
+    print(f"请求次数: {requests_made}，新文章: {len(new_articles)} 篇")
+    if not new_articles:
+        return 0
+
+    for article in new_articles:
+        print(f"  + {article['title']}")
+
+    source.save_articles(merge_articles(articles, new_articles))
+    print(f"[OK] 文章列表已更新: {source.articles_list_file}")
+    return 0
+
+
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="提取微信公众号专辑文章链接")
+    parser.add_argument("--incremental", action="store_true",
+                        help="只拉取比 articles_list.json 中最新文章更新的记录")
+    parser.add_argument("--source", help="sources.json 中的专辑（<公众号>/<专辑>），默认第一个")
+    args = parser.parse_args()
+
+    try:
+        source = load_source(args.source)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        return 1
+    
     print("=" * 60)
     print("微信公众号文章链接提取工具")
     print("=" * 60)
+    
+    if args.incremental:
+        return main_incremental(source)
     print("\n注意：由于微信公众号的反爬虫机制，")
     print("      此脚本可能无法直接获取链接。")
     print("      如果失败，请使用浏览器控制台脚本。\n")
     
     # 尝试获取页面
-    html_content = fetch_album_page()
+    html_content = fetch_album_page(source.album_url)
     
     if not html_content:
         print("\n无法获取页面内容。")
@@ -145,11 +291,9 @@ def main():
             print(f"   {article['url']}\n")
         
         # 保存到文件
-        os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
-        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-            json.dump(articles, f, ensure_ascii=False, indent=2)
+        source.save_articles(articles)
         
-        print(f"[OK] 文章列表已保存到: {OUTPUT_FILE}")
+        print(f"[OK] 文章列表已保存到: {source.articles_list_file}")
         print(f"\n共提取 {len(articles)} 篇文章")
         
         if len(articles) < 36:
@@ -160,4 +304,4 @@ def main():
         print("\n建议使用浏览器控制台脚本提取链接")
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
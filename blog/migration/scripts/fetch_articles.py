@@ -3,12 +3,16 @@
 """
 微信公众号文章抓取脚本
 从精选文章页面获取文章列表和内容
+
+专辑和数据目录来自 sources.json（sources.py），--source 选择专辑，默认第一个；
+逐篇抓取时输出进度行，每篇的明细按 --log-level 过滤（progress.py）
 """
 
 import os
 import sys
 import json
 import time
+import argparse
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
@@ -17,11 +21,8 @@ from urllib.parse import urlparse, parse_qs
 # 添加项目根目录到路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# 配置
-ALBUM_URL = "https://mp.weixin.qq.com/mp/appmsgalbum?action=getalbum&album_id=1417552598718332928&__biz=MzIxMjYyMDA2Nw==#wechat_redirect"
-OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
-ARTICLES_LIST_FILE = os.path.join(OUTPUT_DIR, "articles_list.json")
-ARTICLES_RAW_DIR = os.path.join(OUTPUT_DIR, "articles_raw")
+from sources import load_source
+from progress import Progress, add_progress_args, log
 
 # 请求头
 HEADERS = {
@@ -33,12 +34,16 @@ HEADERS = {
     'Upgrade-Insecure-Requests': '1',
 }
 
-def create_directories():
+def raw_dir(source):
+    """原始 HTML 保存在来源数据目录下的 articles_raw/"""
+    return os.path.join(source.data_dir, "articles_raw")
+
+def create_directories(source):
     """创建必要的目录"""
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    os.makedirs(ARTICLES_RAW_DIR, exist_ok=True)
+    os.makedirs(source.data_dir, exist_ok=True)
+    os.makedirs(raw_dir(source), exist_ok=True)
 
-def fetch_article_list():
+def fetch_article_list(album_url):
     """
     从专辑页面获取文章列表
     注意：微信公众号页面可能需要登录或使用特殊方式访问
@@ -46,11 +51,11 @@ def fetch_article_list():
     articles = []
     
     print("正在尝试获取文章列表...")
-    print(f"专辑URL: {ALBUM_URL}")
+    print(f"专辑URL: {album_url}")
     
     try:
         # 尝试访问专辑页面
-        response = requests.get(ALBUM_URL, headers=HEADERS, timeout=30)
+        response = requests.get(album_url, headers=HEADERS, timeout=30)
         response.encoding = 'utf-8'
         
         if response.status_code == 200:
@@ -86,12 +91,12 @@ def fetch_article_list():
     
     return articles
 
-def fetch_article_content(article_url, article_title):
+def fetch_article_content(article_url, article_title, articles_raw_dir):
     """
     获取单篇文章的详细内容
     """
     try:
-        print(f"正在抓取: {article_title}")
+        log("debug", f"正在抓取: {article_title}")
         
         response = requests.get(article_url, headers=HEADERS, timeout=30)
         response.encoding = 'utf-8'
@@ -99,7 +104,7 @@ def fetch_article_content(article_url, article_title):
         if response.status_code == 200:
             # 保存原始HTML
             safe_title = "".join(c for c in article_title if c.isalnum() or c in (' ', '-', '_')).strip()[:50]
-            html_file = os.path.join(ARTICLES_RAW_DIR, f"{safe_title}.html")
+            html_file = os.path.join(articles_raw_dir, f"{safe_title}.html")
             
             with open(html_file, 'w', encoding='utf-8') as f:
                 f.write(response.text)
@@ -130,40 +135,51 @@ def fetch_article_content(article_url, article_title):
                     'publish_date': publish_date.isoformat() if publish_date else None
                 }
             else:
-                print(f"  警告：无法找到文章内容区域")
+                log("warn", f"  [WARN] {article_title}: 无法找到文章内容区域")
                 return None
                 
         else:
-            print(f"  错误：访问失败，状态码: {response.status_code}")
+            log("warn", f"  [FAIL] {article_title}: 访问失败，状态码: {response.status_code}")
             return None
             
     except Exception as e:
-        print(f"  错误：抓取文章内容时出错: {str(e)}")
+        log("error", f"  [ERROR] {article_title}: 抓取文章内容时出错: {str(e)}")
         return None
 
-def save_articles_list(articles):
+def save_articles_list(articles, path):
     """保存文章列表到JSON文件"""
-    with open(ARTICLES_LIST_FILE, 'w', encoding='utf-8') as f:
+    with open(path, 'w', encoding='utf-8') as f:
         json.dump(articles, f, ensure_ascii=False, indent=2)
-    print(f"\n文章列表已保存到: {ARTICLES_LIST_FILE}")
+    print(f"\n文章列表已保存到: {path}")
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="从专辑页抓取文章列表和内容")
+    parser.add_argument("--source", help="sources.json 中的专辑（<公众号>/<专辑>），默认第一个")
+    add_progress_args(parser)
+    args = parser.parse_args()
+
+    try:
+        source = load_source(args.source)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        return 1
+
     print("=" * 60)
     print("微信公众号文章抓取工具")
     print("=" * 60)
     
-    create_directories()
+    create_directories(source)
     
     # 尝试获取文章列表
-    articles = fetch_article_list()
+    articles = fetch_article_list(source.album_url)
     
     if not articles:
         print("\n" + "=" * 60)
         print("无法自动获取文章列表")
         print("=" * 60)
         print("\n请手动创建文章列表文件:")
-        print(f"文件路径: {ARTICLES_LIST_FILE}")
+        print(f"文件路径: {source.articles_list_file}")
         print("\n格式示例:")
         print("""
 [
@@ -182,22 +198,26 @@ def main():
         return
     
     # 保存文章列表
-    save_articles_list(articles)
+    save_articles_list(articles, source.articles_list_file)
     
     # 抓取每篇文章的详细内容
     print("\n开始抓取文章内容...")
     articles_with_content = []
     
-    for i, article in enumerate(articles, 1):
-        print(f"\n[{i}/{len(articles)}] {article['title']}")
-        
-        content_data = fetch_article_content(article['url'], article['title'])
-        
-        if content_data:
-            articles_with_content.append(content_data)
-        
-        # 控制请求频率
-        time.sleep(2)
+    with Progress.from_args(args, total=len(articles), label="抓取") as progress:
+        for i, article in enumerate(articles, 1):
+            log("debug", f"[{i}/{len(articles)}] {article['title']}")
+
+            content_data = fetch_article_content(article['url'], article['title'], raw_dir(source))
+
+            if content_data:
+                articles_with_content.append(content_data)
+                progress.advance("ok", title=article['title'])
+            else:
+                progress.advance("fail", title=article['title'])
+
+            # 控制请求频率
+            time.sleep(2)
     
     # 更新文章列表，添加内容信息
     for article in articles:
@@ -206,11 +226,11 @@ def main():
                 article.update(content)
                 break
     
-    save_articles_list(articles)
+    save_articles_list(articles, source.articles_list_file)
     
     print("\n" + "=" * 60)
     print(f"抓取完成！共获取 {len(articles_with_content)} 篇文章")
     print("=" * 60)
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
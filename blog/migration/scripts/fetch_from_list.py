@@ -11,11 +11,14 @@ import json
 import os
 import re
 import time
+import argparse
 from pathlib import Path
 
 import requests
 from bs4 import BeautifulSoup
 
+from progress import Progress, add_progress_args, log
+
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 LIST_FILE = os.path.join(DATA_DIR, "articles_list.json")
@@ -63,6 +66,10 @@ def is_blocked(html: str) -> bool:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="按 articles_list.json 逐篇抓取文章 HTML")
+    add_progress_args(parser)
+    args = parser.parse_args()
+
     if not os.path.exists(LIST_FILE):
         raise SystemExit(f"Missing {LIST_FILE}")
 
@@ -84,62 +91,68 @@ def main():
     ok = 0
     failed = 0
 
-    for i, item in enumerate(items, 1):
-        title = item.get("title", f"post-{i}")
-        url = item.get("url")
-        if not url:
-            updated.append(item)
-            failed += 1
-            continue
-
-        print(f"[{i}/{len(items)}] fetching: {title}")
-
-        try:
-            resp = fetch_one(session, url)
-            if resp.status_code != 200:
-                print(f"  [WARN] status={resp.status_code}")
+    with Progress.from_args(args, total=len(items), label="抓取") as progress:
+        for i, item in enumerate(items, 1):
+            title = item.get("title", f"post-{i}")
+            url = item.get("url")
+            if not url:
                 updated.append(item)
                 failed += 1
-                time.sleep(1)
+                progress.advance("fail", title=title)
                 continue
 
-            html = resp.text
-            if is_blocked(html):
-                print("  [ERROR] blocked by wechat (captcha/limit). Stop here.")
-                # 立刻保存当前进度
-                with open(LIST_FILE, "w", encoding="utf-8") as wf:
-                    json.dump(updated + items[i - 1 :], wf, ensure_ascii=False, indent=2)
-                raise SystemExit("Blocked. Please retry later or provide cookies.")
-
-            filename = f"{i:02d}-{safe_filename(title)}.html"
-            html_path = os.path.join(RAW_DIR, filename)
-            with open(html_path, "w", encoding="utf-8") as wf:
-                wf.write(html)
-
-            soup = BeautifulSoup(html, "html.parser")
-            content_div = soup.find("div", id="js_content") or soup.find("div", class_="rich_media_content")
-            if not content_div:
-                print("  [WARN] content div not found")
+            log("debug", f"[{i}/{len(items)}] fetching: {title}")
+
+            try:
+                resp = fetch_one(session, url)
+                if resp.status_code != 200:
+                    log("warn", f"  [WARN] status={resp.status_code}: {title}")
+                    updated.append(item)
+                    failed += 1
+                    progress.advance("fail", title=title)
+                    time.sleep(1)
+                    continue
+
+                html = resp.text
+                if is_blocked(html):
+                    log("error", "  [ERROR] blocked by wechat (captcha/limit). Stop here.")
+                    # 立刻保存当前进度
+                    with open(LIST_FILE, "w", encoding="utf-8") as wf:
+                        json.dump(updated + items[i - 1 :], wf, ensure_ascii=False, indent=2)
+                    raise SystemExit("Blocked. Please retry later or provide cookies.")
+
+                filename = f"{i:02d}-{safe_filename(title)}.html"
+                html_path = os.path.join(RAW_DIR, filename)
+                with open(html_path, "w", encoding="utf-8") as wf:
+                    wf.write(html)
+
+                soup = BeautifulSoup(html, "html.parser")
+                content_div = soup.find("div", id="js_content") or soup.find("div", class_="rich_media_content")
+                if not content_div:
+                    log("warn", f"  [WARN] content div not found: {title}")
+                    updated.append(item)
+                    failed += 1
+                    progress.advance("fail", title=title)
+                    time.sleep(1)
+                    continue
+
+                new_item = dict(item)
+                new_item["html_file"] = html_path
+                new_item["content"] = str(content_div)
+                updated.append(new_item)
+                ok += 1
+                progress.advance("ok", title=title)
+
+                # 友好一点，避免频率过高
+                time.sleep(1.5)
+            except SystemExit:
+                raise
+            except Exception as e:
+                log("error", f"  [ERROR] {title}: {e}")
                 updated.append(item)
                 failed += 1
-                time.sleep(1)
-                continue
-
-            new_item = dict(item)
-            new_item["html_file"] = html_path
-            new_item["content"] = str(content_div)
-            updated.append(new_item)
-            ok += 1
-
-            # 友好一点，避免频率过高
-            time.sleep(1.5)
-        except SystemExit:
-            raise
-        except Exception as e:
-            print(f"  [ERROR] {e}")
-            updated.append(item)
-            failed += 1
-            time.sleep(1.5)
+                progress.advance("fail", title=title)
+                time.sleep(1.5)
 
     with open(LIST_FILE, "w", encoding="utf-8") as wf:
         json.dump(updated, wf, ensure_ascii=False, indent=2)
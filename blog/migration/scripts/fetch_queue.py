@@ -0,0 +1,433 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+基于 SQLite 的持久化抓取队列 + 多进程抓取 worker
+- 队列文件：migration/data/fetch_queue.sqlite3
+- 每个任务记录租约（owner/过期时间）、尝试次数、下次可执行时间、错误类别
+- 多个 worker 进程（同一台机器）安全地共享同一个队列
+- worker 崩溃后租约自动过期，任务会被其他 worker 重新领取；租约过期也计入尝试次数，
+  达到 MAX_ATTEMPTS 的任务标记为 failed（error_class=lease），不再重新领取
+- worker 只读写队列、不输出；主进程轮询队列里的结果，统一显示进度行和分级明细（progress.py）
+
+用法：
+    python scripts/fetch_queue.py enqueue                      # 从 articles_list.json 入队
+    python scripts/fetch_queue.py work -n 4                    # 启动 4 个 requests worker
+    python scripts/fetch_queue.py work -n 2 --backend playwright
+    python scripts/fetch_queue.py work -n 4 --verbose          # 显示每篇文章的结果
+    python scripts/fetch_queue.py status                       # 查看队列状态
+    python scripts/fetch_queue.py retry                        # 把失败任务重新放回队列
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import sqlite3
+import argparse
+import multiprocessing
+from datetime import datetime
+
+from progress import Progress, add_progress_args, log
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # blog/migration
+DATA_DIR = os.path.join(BASE_DIR, "data")
+ARTICLES_LIST_FILE = os.path.join(DATA_DIR, "articles_list.json")
+OUTPUT_DIR = os.path.join(DATA_DIR, "wechatsync_md")
+QUEUE_DB_FILE = os.path.join(DATA_DIR, "fetch_queue.sqlite3")
+
+# 租约时长：worker 在此时间内未完成任务，视为崩溃，任务可被重新领取
+LEASE_SECONDS = 180
+# 最大尝试次数，超过后任务标记为 failed
+MAX_ATTEMPTS = 5
+# 主进程轮询队列结果的间隔（秒）
+REPORT_INTERVAL = 1.0
+
+# 错误类别 -> 重试基准等待（秒）；None 表示不再重试
+RETRY_BACKOFF = {
+    "blocked": 600,
+    "timeout": 30,
+    "network": 30,
+    "parse": None,
+    "other": 60,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    url           TEXT PRIMARY KEY,
+    title         TEXT,
+    timestamp     INTEGER,
+    status        TEXT NOT NULL DEFAULT 'pending',
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    next_eligible REAL NOT NULL DEFAULT 0,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    error_class   TEXT,
+    error         TEXT,
+    output        TEXT,
+    updated       REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (status, next_eligible);
+"""
+
+
+def classify_error(message: str) -> str:
+    """把抓取错误信息归类，决定重试策略"""
+    msg = (message or "").lower()
+    if "拦截" in msg or "captcha" in msg or "blocked" in msg:
+        return "blocked"
+    if "超时" in msg or "timeout" in msg or "timed out" in msg:
+        return "timeout"
+    if "未找到文章内容" in msg or "无法提取" in msg:
+        return "parse"
+    if "connection" in msg or "连接" in msg or "status" in msg:
+        return "network"
+    return "other"
+
+
+class JobQueue:
+    """SQLite 任务队列；每个进程各自持有一个连接"""
+
+    def __init__(self, path: str = QUEUE_DB_FILE):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # isolation_level=None：手动控制事务，领取任务时用 BEGIN IMMEDIATE 加写锁
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def enqueue(self, articles, done_titles=()):
+        """批量入队；已存在的任务保持原状态。返回新增数量"""
+        now = time.time()
+        done_titles = set(done_titles)
+        added = 0
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for article in articles:
+                url = article.get("url")
+                if not url:
+                    continue
+                title = article.get("title", "")
+                status = "done" if title in done_titles else "pending"
+                cur = self.conn.execute(
+                    "INSERT OR IGNORE INTO jobs (url, title, timestamp, status, updated) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (url, title, article.get("timestamp"), status, now),
+                )
+                added += cur.rowcount
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def lease(self, owner: str, lease_seconds: int = LEASE_SECONDS):
+        """领取一个可执行任务（待处理且到期，或租约已过期且未用完尝试次数），没有则返回 None"""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 租约过期且尝试次数已用完的任务（worker 反复在这篇文章上崩溃）不再重新领取
+            self.conn.execute(
+                "UPDATE jobs SET status = 'failed', error_class = 'lease', error = ?, "
+                "lease_owner = NULL, lease_expires = NULL, updated = ? "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (f"租约过期 {MAX_ATTEMPTS} 次，worker 可能在处理时崩溃", now, now, MAX_ATTEMPTS),
+            )
+            row = self.conn.execute(
+                "SELECT * FROM jobs "
+                "WHERE (status = 'pending' AND next_eligible <= ?) "
+                "   OR (status = 'leased' AND lease_expires < ? AND attempts < ?) "
+                "ORDER BY next_eligible, timestamp DESC LIMIT 1",
+                (now, now, MAX_ATTEMPTS),
+            ).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated = ? WHERE url = ?",
+                (owner, now + lease_seconds, now, row["url"]),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        job = dict(row)
+        job["attempts"] += 1
+        return job
+
+    def complete(self, url: str, owner: str, output: str):
+        self.conn.execute(
+            "UPDATE jobs SET status = 'done', output = ?, error_class = NULL, error = NULL, "
+            "lease_owner = NULL, lease_expires = NULL, updated = ? "
+            "WHERE url = ? AND lease_owner = ?",
+            (output, time.time(), url, owner),
+        )
+
+    def fail(self, url: str, owner: str, attempts: int, message: str):
+        """记录失败：按错误类别指数退避，超过最大次数或不可重试则标记 failed"""
+        now = time.time()
+        error_class = classify_error(message)
+        backoff = RETRY_BACKOFF.get(error_class)
+        if backoff is None or attempts >= MAX_ATTEMPTS:
+            status, next_eligible = "failed", now
+        else:
+            status, next_eligible = "pending", now + backoff * (2 ** (attempts - 1))
+        self.conn.execute(
+            "UPDATE jobs SET status = ?, next_eligible = ?, error_class = ?, error = ?, "
+            "lease_owner = NULL, lease_expires = NULL, updated = ? "
+            "WHERE url = ? AND lease_owner = ?",
+            (status, next_eligible, error_class, (message or "")[:500], now, url, owner),
+        )
+        return status, error_class
+
+    def retry_failed(self):
+        cur = self.conn.execute(
+            "UPDATE jobs SET status = 'pending', attempts = 0, next_eligible = 0, updated = ? "
+            "WHERE status = 'failed'",
+            (time.time(),),
+        )
+        return cur.rowcount
+
+    def count_open(self) -> int:
+        """未完成的任务数（待处理、已领取）"""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'leased')"
+        ).fetchone()[0]
+
+    def updated_since(self, since: float):
+        """since 之后（含）complete/fail 过的任务，按更新时间排序"""
+        return self.conn.execute(
+            "SELECT url, title, status, attempts, error_class, error, output, updated FROM jobs "
+            "WHERE updated >= ? AND status != 'leased' AND (output IS NOT NULL OR error IS NOT NULL) "
+            "ORDER BY updated",
+            (since,),
+        ).fetchall()
+
+    def has_work(self) -> bool:
+        """是否还有未完成的任务（包括尚未到期的重试）"""
+        row = self.conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'leased')"
+        ).fetchone()
+        return row[0] > 0
+
+    def stats(self):
+        return self.conn.execute(
+            "SELECT status, COALESCE(error_class, '') AS error_class, COUNT(*) AS n "
+            "FROM jobs GROUP BY status, error_class ORDER BY status, error_class"
+        ).fetchall()
+
+
+def make_requests_fetcher():
+    from auto_fetch_articles import fetch_article
+
+    def fetch(url):
+        return fetch_article(url)
+
+    return fetch, lambda: None
+
+
+def make_playwright_fetcher():
+    from playwright.sync_api import sync_playwright
+    from auto_export_with_playwright import block_subresources, capture_article_content
+
+    pw = sync_playwright().start()
+    browser = pw.chromium.launch(headless=True, channel="msedge")
+    page = browser.new_page()
+    page.route("**/*", block_subresources(page))
+
+    def fetch(url):
+        data = capture_article_content(page, url)
+        return data if data else {"error": "无法提取内容"}
+
+    def close():
+        browser.close()
+        pw.stop()
+
+    return fetch, close
+
+
+def save_article(job: dict, content_data: dict, output_dir: str = OUTPUT_DIR, tag: str = "大东山谷精选") -> str:
+    """转换为 Markdown 并写入 output_dir（默认 wechatsync_md），返回文件路径"""
+    from auto_fetch_articles import normalize_title, html_to_markdown, clean_promo_tail, save_markdown
+
+    final_title = normalize_title(content_data.get("title") or job.get("title") or "")
+    if not final_title:
+        raise ValueError("无法提取标题")
+
+    md_content = clean_promo_tail(html_to_markdown(content_data["html"]))
+
+    timestamp = job.get("timestamp") or content_data.get("ct")
+    if timestamp:
+        date_str = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+    else:
+        date_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    front_matter = f"""---
+title: {final_title}
+date: {date_str}
+tags:
+  - {tag}
+---
+
+{md_content}
+"""
+    return save_markdown(final_title, front_matter, date_str, output_dir)
+
+
+def worker_main(backend: str, delay: float, db_path: str):
+    """worker 进程：循环领取任务直到队列清空；结果只写入队列，由主进程输出"""
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    queue = JobQueue(db_path)
+    if backend == "playwright":
+        fetch, close = make_playwright_fetcher()
+    else:
+        fetch, close = make_requests_fetcher()
+
+    try:
+        while True:
+            job = queue.lease(owner)
+            if job is None:
+                if not queue.has_work():
+                    break
+                # 还有未到期的重试或其他 worker 持有的租约，稍后再看
+                time.sleep(min(delay * 5, 10))
+                continue
+
+            url = job["url"]
+            try:
+                content_data = fetch(url)
+                if "error" in content_data:
+                    raise RuntimeError(content_data["error"])
+                output = save_article(job, content_data)
+                queue.complete(url, owner, output)
+            except Exception as e:
+                queue.fail(url, owner, job["attempts"], str(e))
+            time.sleep(delay)
+    finally:
+        close()
+        queue.close()
+
+
+def cmd_enqueue(args):
+    if not os.path.exists(ARTICLES_LIST_FILE):
+        print(f"[ERROR] 未找到文章列表文件: {ARTICLES_LIST_FILE}")
+        return 1
+    with open(ARTICLES_LIST_FILE, "r", encoding="utf-8") as f:
+        articles = json.load(f)
+
+    # 已导出的文章直接标记为完成，兼容旧的基于输出文件的判断
+    from retry_failed_articles import get_existing_files, normalize_title
+    existing = get_existing_files()
+    done_titles = {a.get("title", "") for a in articles if normalize_title(a.get("title", "")) in existing}
+
+    queue = JobQueue(args.db)
+    added = queue.enqueue(articles, done_titles)
+    queue.close()
+    print(f"[OK] 入队 {added} 篇（共 {len(articles)} 篇，已导出 {len(done_titles)} 篇）")
+    return 0
+
+
+class ResultReporter:
+    """轮询队列中 worker 写回的结果，逐条记入进度（同一条结果只报告一次）"""
+
+    def __init__(self, queue: JobQueue, progress: Progress):
+        self.queue = queue
+        self.progress = progress
+        self.since = time.time()
+        self.seen = set()
+
+    def poll(self):
+        for row in self.queue.updated_since(self.since):
+            key = (row["url"], row["updated"])
+            if key in self.seen:
+                continue
+            self.seen.add(key)
+            self.since = max(self.since, row["updated"])
+            title = row["title"]
+            if row["status"] == "done":
+                log("info", f"[OK] {os.path.basename(row['output'])}")
+                self.progress.advance("ok", title=title, attempts=row["attempts"])
+            elif row["status"] == "failed":
+                log("warn", f"[FAIL:{row['error_class']}] {title}: {row['error']}")
+                self.progress.advance("fail", title=title, attempts=row["attempts"],
+                                      error_class=row["error_class"])
+            else:
+                # 失败后按退避时间重新排队，最终结果出来前不计入进度
+                log("info", f"[RETRY:{row['error_class']}] {title}（第 {row['attempts']} 次）: {row['error']}")
+                self.progress.emit("retry", title=title, attempts=row["attempts"], error_class=row["error_class"])
+
+
+def cmd_work(args):
+    queue = JobQueue(args.db)
+    procs = []
+    with Progress.from_args(args, total=queue.count_open(), label="抓取") as progress:
+        reporter = ResultReporter(queue, progress)
+        for _ in range(args.workers):
+            p = multiprocessing.Process(target=worker_main, args=(args.backend, args.delay, args.db))
+            p.start()
+            procs.append(p)
+        try:
+            while any(p.is_alive() for p in procs):
+                reporter.poll()
+                time.sleep(REPORT_INTERVAL)
+            reporter.poll()
+        except KeyboardInterrupt:
+            log("warn", "\n[WARN] 正在停止 worker，未完成任务的租约过期后会被重新领取")
+            for p in procs:
+                p.terminate()
+    queue.close()
+    return cmd_status(args)
+
+
+def cmd_status(args):
+    queue = JobQueue(args.db)
+    rows = queue.stats()
+    queue.close()
+    print("=" * 60)
+    print("抓取队列状态")
+    print("=" * 60)
+    for row in rows:
+        label = row["status"] + (f" ({row['error_class']})" if row["error_class"] else "")
+        print(f"  {label:<24} {row['n']}")
+    return 0
+
+
+def cmd_retry(args):
+    queue = JobQueue(args.db)
+    n = queue.retry_failed()
+    queue.close()
+    print(f"[OK] 已重新放回队列: {n} 篇")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite 持久化抓取队列")
+    parser.add_argument("--db", default=QUEUE_DB_FILE, help="队列数据库路径")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("enqueue", help="从 articles_list.json 入队")
+    p_work = sub.add_parser("work", help="启动 worker 进程消费队列")
+    p_work.add_argument("-n", "--workers", type=int, default=2, help="worker 进程数")
+    p_work.add_argument("--backend", choices=["requests", "playwright"], default="requests")
+    p_work.add_argument("--delay", type=float, default=2.0, help="每个 worker 两次请求之间的间隔（秒）")
+    add_progress_args(p_work)
+    sub.add_parser("status", help="查看队列状态")
+    sub.add_parser("retry", help="把失败任务重新放回队列")
+
+    args = parser.parse_args()
+    handlers = {
+        "enqueue": cmd_enqueue,
+        "work": cmd_work,
+        "status": cmd_status,
+        "retry": cmd_retry,
+    }
+    return handlers[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
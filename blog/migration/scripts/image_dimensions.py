@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+为文章图片补充宽高和懒加载属性，减少页面布局抖动：
+- 只读取图片文件头解析尺寸（PNG/JPEG/GIF/WebP/BMP）：站内图片读本地文件，
+  外部图片用 Range 请求只下载前 64KB
+- 尺寸按图片地址缓存在 data/image_size_cache.json
+- Markdown 图片改写为 <img width height>；首屏以下的图片再加
+  loading="lazy" decoding="async"（首屏：正文第一张图片，或出现在前 FIRST_SCREEN_CHARS 个字符内）
+- 多篇文章并行处理；代码块中的图片不改
+
+依赖：pip install requests
+
+用法：
+    python scripts/image_dimensions.py              # 处理 _posts 中所有文章
+    python scripts/image_dimensions.py --dry-run
+"""
+
+import os
+import re
+import sys
+import json
+import struct
+import argparse
+import threading
+from html import escape
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from post_index import BASE_DIR, BLOG_DIR, POSTS_DIR, load_posts, read_post, join_front_matter
+from post_writer import write_post
+
+
+DATA_DIR = os.path.join(BASE_DIR, "data")
+CACHE_FILE = os.path.join(DATA_DIR, "image_size_cache.json")
+SOURCE_DIR = os.path.join(BLOG_DIR, "source")
+
+# 首屏范围：这之后出现的图片才懒加载
+FIRST_SCREEN_CHARS = 300
+HEADER_BYTES = 64 * 1024
+# 文件头里 EXIF 缩略图较大的 JPEG，第一次没解析出来时再多读一些
+HEADER_BYTES_RETRY = 512 * 1024
+WORKERS = 8
+TIMEOUT = 15
+
+MD_IMAGE_RE = re.compile(r'!\[([^\]]*)\]\(([^)\s]+)(?:\s+"([^"]*)")?\)')
+
+
+def parse_image_size(data: bytes):
+    """从文件头解析 (宽, 高)；格式不支持或数据不够时返回 None"""
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and len(data) >= 24:
+        return struct.unpack(">II", data[16:24])
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        return struct.unpack("<HH", data[6:10])
+    if data[:2] == b"BM" and len(data) >= 26:
+        w, h = struct.unpack("<ii", data[18:26])
+        return w, abs(h)
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP" and len(data) >= 30:
+        chunk = data[12:16]
+        if chunk == b"VP8 ":
+            w, h = struct.unpack("<HH", data[26:30])
+            return w & 0x3FFF, h & 0x3FFF
+        if chunk == b"VP8L":
+            bits = int.from_bytes(data[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8X":
+            return int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+        return None
+    if data[:2] == b"\xff\xd8":
+        return parse_jpeg_size(data)
+    return None
+
+
+def parse_jpeg_size(data: bytes):
+    """顺序跳过 JPEG 段，直到 SOFn 段"""
+    i = 2
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            i += 2
+            continue
+        length = struct.unpack(">H", data[i + 2:i + 4])[0]
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            h, w = struct.unpack(">HH", data[i + 5:i + 9])
+            return w, h
+        i += 2 + length
+    return None
+
+
+def read_header(url: str, size: int, session=None) -> bytes:
+    """读取图片开头 size 个字节"""
+    if url.startswith("/"):
+        with open(os.path.join(SOURCE_DIR, url.lstrip("/")), "rb") as f:
+            return f.read(size)
+    headers = {"Range": f"bytes=0-{size - 1}"}
+    with session.get(url, headers=headers, timeout=TIMEOUT, stream=True) as resp:
+        resp.raise_for_status()
+        # 服务器不支持 Range 时会返回整个文件，只读需要的部分
+        return resp.raw.read(size, decode_content=True)
+
+
+def probe_size(url: str, session=None):
+    """探测图片尺寸；格式无法识别时返回 None，读取失败时抛出异常"""
+    data = read_header(url, HEADER_BYTES, session)
+    size = parse_image_size(data)
+    if size is None and len(data) >= HEADER_BYTES:
+        size = parse_image_size(read_header(url, HEADER_BYTES_RETRY, session))
+    return list(size) if size else None
+
+
+class SizeCache:
+    """图片地址 -> [宽, 高]（格式无法识别记为 None）；多线程共享
+
+    下载/读取失败不写缓存，下次运行再试。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.entries = {}
+        self.probed = 0
+        if os.path.exists(CACHE_FILE):
+            with open(CACHE_FILE, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def get(self, url: str, session=None):
+        with self._lock:
+            if url in self.entries:
+                return self.entries[url]
+        if session is None and not url.startswith("/"):
+            return None
+        try:
+            size = probe_size(url, session)
+        except Exception as e:
+            print(f"[WARN] 无法获取图片尺寸: {url}（{type(e).__name__}）")
+            return None
+        with self._lock:
+            self.entries[url] = size
+            self.probed += 1
+        return size
+
+    def save(self):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        with self._lock, open(CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+
+
+def img_tag(url: str, alt: str, title, size, lazy: bool) -> str:
+    attrs = [f'src="{escape(url)}"', f'alt="{escape(alt)}"']
+    if title:
+        attrs.append(f'title="{escape(title)}"')
+    attrs.append(f'width="{size[0]}" height="{size[1]}"')
+    if lazy:
+        attrs.append('loading="lazy" decoding="async"')
+    return f"<img {' '.join(attrs)}>"
+
+
+def add_image_sizes(body: str, cache: SizeCache, session=None) -> str:
+    """把 Markdown 图片改写为带宽高的 <img>；尺寸未知的图片保持原样"""
+    out = []
+    offset = 0
+    seen_images = 0
+    in_code = False
+    for line in body.split("\n"):
+        if line.lstrip().startswith(("```", "~~~")):
+            in_code = not in_code
+        if not in_code and "![" in line:
+            def replace(m):
+                nonlocal seen_images
+                lazy = seen_images > 0 and offset + m.start() >= FIRST_SCREEN_CHARS
+                seen_images += 1
+                size = cache.get(m.group(2), session)
+                if not size:
+                    return m.group(0)
+                return img_tag(m.group(2), m.group(1), m.group(3), size, lazy)
+
+            line = MD_IMAGE_RE.sub(replace, line)
+        out.append(line)
+        offset += len(line) + 1
+    return "\n".join(out)
+
+
+def make_session():
+    try:
+        import requests
+    except ImportError:
+        return None
+    session = requests.Session()
+    session.headers["User-Agent"] = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    )
+    return session
+
+
+def process_posts(posts, dry_run: bool = False, workers: int = WORKERS) -> list:
+    """并行处理多篇文章，返回内容有变化的文章"""
+    cache = SizeCache()
+    session = make_session()
+
+    def work(post):
+        body = add_image_sizes(post["body"], cache, session)
+        if body == post["body"]:
+            return None
+        if not dry_run:
+            write_post(post["path"], join_front_matter(post["fm"] or "", body))
+        return post
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        changed = [p for p in pool.map(work, posts) if p is not None]
+    cache.save()
+    print(f"[INFO] 图片尺寸：新探测 {cache.probed} 张，缓存共 {len(cache.entries)} 张")
+    return changed
+
+
+def size_files(paths) -> list:
+    """处理指定文章（供导入脚本调用），返回实际改写的文件"""
+    posts = [read_post(Path(p)) for p in paths]
+    return [p["path"] for p in process_posts(posts)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="为文章图片补充宽高和懒加载属性")
+    parser.add_argument("--dry-run", action="store_true", help="只统计，不写文件")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="并行处理的文章数")
+    args = parser.parse_args()
+
+    posts = load_posts()
+    if not posts:
+        print(f"[ERROR] 未找到文章: {POSTS_DIR}")
+        return 1
+
+    changed = process_posts(posts, args.dry_run, args.workers)
+    for post in changed:
+        print(f"[OK] {post['file']}")
+    print(f"\n[SUMMARY] posts={len(posts)}, changed={len(changed)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
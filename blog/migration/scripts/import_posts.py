@@ -8,13 +8,17 @@
 import os
 import sys
 import json
-import shutil
+import argparse
 from pathlib import Path
 from datetime import datetime
 
 # 添加项目根目录到路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from excerpt import insert_excerpt_break
+from post_index import split_front_matter, join_front_matter
+from progress import Progress, add_progress_args, log
+
 # 配置
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 BLOG_POSTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "source", "_posts")
@@ -68,40 +72,39 @@ def generate_filename(article):
     
     return filename
 
-def import_article(article):
-    """导入单篇文章"""
+def import_article(article, writer):
+    """导入单篇文章（文件名在 writer 中预留，经临时文件原子写入）"""
     title = article.get('title', '未命名文章')
     markdown_file = article.get('markdown_file', '')
     
     if not markdown_file or not os.path.exists(markdown_file):
-        print(f"  错误：找不到Markdown文件: {markdown_file}")
+        log("error", f"  错误：找不到Markdown文件: {markdown_file}")
         return None
     
-    # 生成目标文件名
-    target_filename = generate_filename(article)
-    target_path = os.path.join(BLOG_POSTS_DIR, target_filename)
-    
-    # 如果文件已存在，添加序号
-    if os.path.exists(target_path):
-        base_name = os.path.splitext(target_filename)[0]
-        ext = os.path.splitext(target_filename)[1]
-        counter = 1
-        while os.path.exists(target_path):
-            target_filename = f"{base_name}-{counter}{ext}"
-            target_path = os.path.join(BLOG_POSTS_DIR, target_filename)
-            counter += 1
-    
-    # 复制文件
     try:
-        shutil.copy2(markdown_file, target_path)
-        print(f"  ✓ 已导入: {target_filename}")
-        return target_path
+        with open(markdown_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        # 长文在段落边界插入 <!-- more -->，首页只渲染摘要
+        fm, body = split_front_matter(content)
+        body = insert_excerpt_break(body)
+        content = body if fm is None else join_front_matter(fm, body)
+        # 生成目标文件名，已存在时在内存中追加序号；已有文件内容相同时直接复用
+        target_path = writer.reserve(generate_filename(article), content)
+        if writer.write(target_path, content, source=os.path.basename(markdown_file)):
+            log("info", f"  ✓ 已导入: {target_path.name}")
+        else:
+            log("info", f"  - 未变化: {target_path.name}")
+        return str(target_path)
     except Exception as e:
-        print(f"  ✗ 导入失败: {str(e)}")
+        log("error", f"  ✗ 导入失败: {str(e)}")
         return None
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="将转换后的文章导入 Hexo 的 _posts 目录")
+    add_progress_args(parser)
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("文章导入工具")
     print("=" * 60)
@@ -131,26 +134,44 @@ def main():
     except EOFError:
         print("检测到非交互环境，默认继续导入。")
     
-    # 导入文章
+    # 导入文章（目录只读取一次，整批结束后更新一次清单）
+    from post_writer import PostWriter
+    writer = PostWriter(BLOG_POSTS_DIR)
     imported = []
     failed = []
     
-    for i, article in enumerate(articles, 1):
-        print(f"[{i}/{len(articles)}] {article.get('title', '未命名文章')}")
-        result = import_article(article)
+    with Progress.from_args(args, total=len(articles), label="导入") as progress:
+        for i, article in enumerate(articles, 1):
+            title = article.get('title', '未命名文章')
+            log("debug", f"[{i}/{len(articles)}] {title}")
+            changed_before = len(writer.changed)
+            result = import_article(article, writer)
+            
+            if result:
+                imported.append(result)
+                status = "ok" if len(writer.changed) > changed_before else "unchanged"
+            else:
+                failed.append(title)
+                status = "fail"
+            progress.advance(status, title=title)
+        writer.commit()
         
-        if result:
-            imported.append(result)
-        else:
-            failed.append(article.get('title', '未命名文章'))
+        # 导入后处理：自动标签/分类、图片尺寸、目录页（只处理实际改写的文章）
+        from import_wechatsync_md import finish_import
+        finish_import(writer.changed)
     
     # 输出结果
     print("\n" + "=" * 60)
     print("导入完成")
     print("=" * 60)
-    print(f"成功导入: {len(imported)} 篇")
+    print(f"成功导入: {len(imported)} 篇（改写 {len(writer.changed)} 篇，未变化 {len(writer.unchanged)} 篇）")
     print(f"导入失败: {len(failed)} 篇")
     
+    if writer.changed:
+        print("\n改写的文章:")
+        for path in writer.changed:
+            print(f"  - {path.name}")
+    
     if failed:
         print("\n失败的文章:")
         for title in failed:
@@ -7,15 +7,43 @@
 - 规则：
   - 如果没有 front-matter，则自动补齐 title/date/tags
   - date 优先用 migration/data/articles_list.json 里同名文章的 timestamp
+    （标题有标点/全角/后缀差异时按字符三元组模糊匹配）
   - 清理文章末尾微信公众号引流（截断尾巴）
+  - 正文内嵌的 data URI 图片解码到 source/images/<hash>.<ext>，正文只保留短链接
+  - 指向本站已有文章的微信链接改写为站内链接，其余微信链接删除
   - 避免重复：若现有 _posts 中已存在同名 title，则跳过
+  - 文件名冲突在内存中解决，文章经临时文件原子写入，整批结束后更新一次
+    data/posts_manifest.json；内容没变的文章不改写（post_writer.py）
+  - 导入后按正文自动分配标签/分类（auto_tags.py）
+  - front-matter 写入字数/阅读时长（reading_stats.py）
+  - 长文在段落边界插入 <!-- more --> 摘要分隔符（excerpt.py）
+  - 图片补充宽高，首屏以下的图片懒加载（image_dimensions.py）
+  - 导入后重新生成文章目录页（build_catalog.py）
+  - 批量导入只显示一行进度，逐篇明细用 --verbose 打开（progress.py）
 """
 
 import os
 import re
+import sys
 import json
+import argparse
+import html
+import base64
+import binascii
+import hashlib
+import tempfile
+import unicodedata
 from pathlib import Path
 from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
+
+from reading_stats import compute_stats
+from excerpt import insert_excerpt_break
+from promo_matcher import PromoMatcher
+from post_index import load_post_index, load_permalink_pattern, build_permalink
+from post_writer import PostWriter, mark_processed
+from progress import Progress, add_progress_args, log
+from memory_profile import MemoryProfiler, add_memory_args
 
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # blog/migration
@@ -25,6 +53,7 @@ ARTICLES_LIST_FILE = os.path.join(DATA_DIR, "articles_list.json")
 
 BLOG_DIR = os.path.dirname(BASE_DIR)  # blog/
 POSTS_DIR = os.path.join(BLOG_DIR, "source", "_posts")
+IMAGES_DIR = os.path.join(BLOG_DIR, "source", "images")
 
 
 PROMO_TAIL_PATTERNS = [
@@ -42,7 +71,6 @@ PROMO_TAIL_PATTERNS = [
     r"↓.*点击.*小程序.*购买.*↓",
     r"小程序.*购买",
     r"微信公众",
-    r"mp\.weixin\.qq\.com",
     r"往期精彩回顾",
     r"近期文章回顾",
     r"近期.*文章回顾",
@@ -78,6 +106,18 @@ PROMO_HEAD_PATTERNS = [
 ]
 
 
+PROMO_TAIL_MATCHER = PromoMatcher(PROMO_TAIL_PATTERNS)
+PROMO_HEAD_MATCHER = PromoMatcher(PROMO_HEAD_PATTERNS)
+
+# 行内广告文案（整段删除）
+INLINE_AD_MATCHER = PromoMatcher([
+    r"↓.*点击.*小程序.*购买.*↓",  # "↓点击小程序购买↓"等
+    r"点击.*小程序.*购买",
+    r"—+.*广告.*分界线.*—+",  # 广告分界线
+    r"—{3,}.*—{3,}",  # 多个连续的分隔线
+])
+
+
 DATE_CN_RE = re.compile(r"(\d{4})年(\d{1,2})月(\d{1,2})日")
 
 
@@ -92,11 +132,112 @@ def normalize_title(s: str) -> str:
     return s
 
 
-def clean_wechat_links(text: str) -> str:
-    """清理微信公众号链接和广告内容"""
+def wechat_article_ids(url: str):
+    """从微信文章链接中取出 ((mid, idx), sn)；不是长链接时返回 (None, None)"""
+    query = parse_qs(urlsplit(html.unescape(url)).query)
+    mid = query.get("mid", [None])[0]
+    sn = query.get("sn", [None])[0]
+    key = (mid, query.get("idx", ["1"])[0]) if mid else None
+    return key, sn
+
+
+class WechatLinkIndex:
+    """微信文章标识 -> 本站文章链接
+
+    articles_list.json 提供 (mid, idx)/sn -> 标题，_posts 提供 标题 -> 站内链接，
+    查找时都是字典命中；标识查不到时再用链接文字按标题匹配。
+    """
+
+    def __init__(self):
+        self.title_by_key = {}
+        self.title_by_sn = {}
+        self.url_by_title = {}
+
+    def add_article(self, title: str, url: str):
+        key, sn = wechat_article_ids(url)
+        title = normalize_title(title)
+        if key:
+            self.title_by_key[key] = title
+        if sn:
+            self.title_by_sn[sn] = title
+
+    def add_post(self, title: str, url: str):
+        self.url_by_title[normalize_title(title)] = url
+
+    def resolve(self, url: str, text: str = None):
+        """返回站内链接；找不到对应文章时返回 None"""
+        key, sn = wechat_article_ids(url)
+        title = self.title_by_key.get(key) or self.title_by_sn.get(sn)
+        if title and title in self.url_by_title:
+            return self.url_by_title[title]
+        if text:
+            return self.url_by_title.get(normalize_title(text.strip("*_ ")))
+        return None
+
+
+def load_article_lists(list_files=None) -> list:
+    """读取一个或多个来源的 articles_list.json（默认 data/articles_list.json），合并返回"""
+    items = []
+    for path in list_files or [ARTICLES_LIST_FILE]:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                items += json.load(f)
+    return items
+
+
+def load_link_index(list_files=None) -> WechatLinkIndex:
+    """由 articles_list.json 和 _posts 的 front-matter 索引构建 WechatLinkIndex"""
+    index = WechatLinkIndex()
+    for it in load_article_lists(list_files):
+        if it.get("title") and it.get("url"):
+            index.add_article(it["title"], it["url"])
+    if os.path.exists(POSTS_DIR):
+        for entry in load_post_index():
+            index.add_post(entry["title"], entry["url"])
+    return index
+
+
+WECHAT_MD_LINK_RE = re.compile(r'\[([^\]]*)\]\((https?://[^\)]*mp\.weixin\.qq\.com[^\)]*)\)')
+WECHAT_URL_RE = re.compile(r'https?://mp\.weixin\.qq\.com/[^\s\)\]]*')
+
+
+def relink_wechat_links(line: str, link_index: WechatLinkIndex):
+    """把能对应到本站文章的微信链接改写为站内链接，对应不上的去掉链接（Markdown 链接保留文字）
+
+    返回 (改写后的行, 改写为站内链接的数量)。
+    """
+    resolved = 0
+
+    def md_link(m):
+        nonlocal resolved
+        local = link_index.resolve(m.group(2), m.group(1))
+        if not local:
+            return m.group(1)
+        resolved += 1
+        return f"[{m.group(1)}]({local})"
+
+    def bare_url(m):
+        nonlocal resolved
+        local = link_index.resolve(m.group(0))
+        if not local:
+            return ""
+        resolved += 1
+        return local
+
+    line = WECHAT_MD_LINK_RE.sub(md_link, line)
+    return WECHAT_URL_RE.sub(bare_url, line), resolved
+
+
+def clean_wechat_links(text: str, link_index: WechatLinkIndex = None) -> str:
+    """清理微信公众号链接和广告内容；传入 link_index 时站内互链改写为本站链接"""
     lines = text.split("\n")
     cleaned_lines = []
     for line in lines:
+        if link_index is not None and "mp.weixin.qq.com" in line:
+            relinked, resolved = relink_wechat_links(line, link_index)
+            # 有站内互链的行保留下来，只去掉其中对应不上的微信链接
+            if resolved:
+                line = relinked
         # 跳过包含微信公众号链接的行
         if "mp.weixin.qq.com" in line or "__biz=" in line:
             continue
@@ -104,14 +245,8 @@ def clean_wechat_links(text: str) -> str:
         line = re.sub(r'\[([^\]]+)\]\(https?://[^\)]*mp\.weixin\.qq\.com[^\)]*\)', r'\1', line)
         line = re.sub(r'https?://[^\s]*mp\.weixin\.qq\.com[^\s]*', '', line)
         
-        # 删除行内的广告内容
-        # 删除"↓点击小程序购买↓"等
-        line = re.sub(r'↓.*点击.*小程序.*购买.*↓', '', line, flags=re.IGNORECASE)
-        line = re.sub(r'点击.*小程序.*购买', '', line, flags=re.IGNORECASE)
-        
-        # 删除广告分界线
-        line = re.sub(r'—+.*广告.*分界线.*—+', '', line, flags=re.IGNORECASE)
-        line = re.sub(r'—{3,}.*—{3,}', '', line)  # 删除多个连续的分隔线
+        # 删除行内的广告内容和广告分界线
+        line = INLINE_AD_MATCHER.sub(line)
         
         cleaned_lines.append(line)
     return "\n".join(cleaned_lines)
@@ -208,6 +343,12 @@ def remove_empty_image_captions(text: str) -> str:
         # 检查是否是图片说明（括号内的说明文字，如"（不同步的悬浮照|2018.06|大东山谷 摄）"）
         is_caption = False
         
+        # 图片本身不是说明（图片地址里常带 image/photo 等关键词）
+        if '![' in line or '<img' in line:
+            cleaned_lines.append(line)
+            i += 1
+            continue
+        
         # 模式1: 括号内的说明文字（全角或半角括号）
         if re.match(r'^[（(].*[）)]$', stripped):
             # 检查是否包含图片说明关键词
@@ -235,8 +376,8 @@ def remove_empty_image_captions(text: str) -> str:
         # 在行内查找并删除括号内的图片说明
         if not is_caption and stripped:
             # 查找括号内的图片说明并删除（更精确的匹配）
-            # 匹配包含"摄"、"照"、"|"等关键词的括号内容
-            line_cleaned = re.sub(r'[（(][^）)]*(?:摄|照|photo|image|©|来源|via|大东山谷|孟祥志|村子)[^）)]*[）)]', '', line)
+            # 匹配包含"摄"、"照"、"|"等关键词的括号内容；紧跟 "]" 的是链接地址，不能删
+            line_cleaned = re.sub(r'(?<!\])[（(][^）)]*(?:摄|照|photo|image|©|来源|via|大东山谷|孟祥志|村子)[^）)]*[）)]', '', line)
             if line_cleaned != line:
                 line = line_cleaned.strip()
                 if not line:  # 如果删除后行为空，跳过
@@ -288,11 +429,7 @@ def strip_promo_head(md: str) -> str:
         if not s:
             continue
         # 检查是否是推广内容
-        is_promo = False
-        for pat in PROMO_HEAD_PATTERNS:
-            if re.search(pat, s, re.IGNORECASE):
-                is_promo = True
-                break
+        is_promo = PROMO_HEAD_MATCHER.search(s) is not None
         # 如果找到非推广内容，停止
         if not is_promo and len(s) > 5:  # 至少5个字符，避免误删
             break
@@ -304,7 +441,11 @@ def strip_promo_head(md: str) -> str:
 
 
 def strip_promo_tail(md: str) -> str:
-    """清理文章末尾的推广内容"""
+    """清理文章末尾的推广内容
+
+    在 clean_wechat_links 之后运行：微信链接此时已改写为站内链接或删除，
+    不再把"含微信链接的行"当作推广标记，以免从站内互链处截掉后文。
+    """
     lines = md.split("\n")
     cut_idx = None
     
@@ -314,10 +455,8 @@ def strip_promo_tail(md: str) -> str:
         if not s:
             continue
         # 检查是否是推广标记
-        for pat in PROMO_TAIL_PATTERNS:
-            if re.search(pat, s, re.IGNORECASE):
-                cut_idx = idx
-                break
+        if PROMO_TAIL_MATCHER.search(s):
+            cut_idx = idx
         # 额外检查：如果包含"感谢关注"或"求关注"且包含"近期"或"推荐"，也认为是推广内容
         if cut_idx is None:
             if ("感谢关注" in s or "求关注" in s) and ("近期" in s or "推荐" in s or "原创" in s):
@@ -327,12 +466,9 @@ def strip_promo_tail(md: str) -> str:
             break
     
     if cut_idx is None:
-        # 如果没有找到明确的推广标记，检查是否有微信公众号链接或广告内容
+        # 如果没有找到明确的推广标记，检查是否有广告内容
         for idx in range(len(lines) - 1, max(0, len(lines) - 20), -1):  # 只检查最后20行
             s = lines[idx].strip()
-            if "mp.weixin.qq.com" in s or "__biz=" in s:
-                cut_idx = idx
-                break
             # 检查是否包含"感谢关注"、"近期"等关键词（更宽松的匹配）
             if ("感谢关注" in s or "求关注" in s) and ("近期" in s or "推荐" in s or "原创" in s or "公众号" in s):
                 cut_idx = idx
@@ -347,12 +483,12 @@ def strip_promo_tail(md: str) -> str:
         # 如果前一行是空行，继续向上
         if not prev_line:
             cut_idx -= 1
-        # 如果前一行包含微信公众号链接，也删除
-        elif "mp.weixin.qq.com" in prev_line or "__biz=" in prev_line:
-            cut_idx -= 1
         # 如果前一行看起来像文章推荐标题（短行，可能是链接）
         elif len(prev_line) < 30 and ("[" in prev_line or "http" in prev_line):
             cut_idx -= 1
+        # 推广块之间的分隔线（* * *、---）
+        elif re.fullmatch(r"([*\-_]\s*){3,}", prev_line):
+            cut_idx -= 1
         else:
             break
     
@@ -365,11 +501,8 @@ def strip_promo_tail(md: str) -> str:
         s = result_lines[idx].strip()
         if not s:
             continue
-        for pat in PROMO_TAIL_PATTERNS:
-            if re.search(pat, s, re.IGNORECASE):
-                # 找到推广内容，删除从这一行开始的所有内容
-                return "\n".join(result_lines[:idx]).rstrip()
-        if "mp.weixin.qq.com" in s or "__biz=" in s:
+        if PROMO_TAIL_MATCHER.search(s):
+            # 找到推广内容，删除从这一行开始的所有内容
             return "\n".join(result_lines[:idx]).rstrip()
     
     return result
@@ -397,18 +530,126 @@ def get_title_from_md(body: str, fallback: str) -> str:
     return normalize_title(fallback)
 
 
-def load_article_dates():
-    """从 articles_list.json 读取 title->timestamp 映射"""
-    mapping = {}
-    if not os.path.exists(ARTICLES_LIST_FILE):
-        return mapping
-    with open(ARTICLES_LIST_FILE, "r", encoding="utf-8") as f:
-        items = json.load(f)
-    for it in items:
+# 模糊匹配标题的最低相似度（字符三元组 Dice 系数）
+TITLE_SIMILARITY_THRESHOLD = 0.6
+# 前缀匹配（标题加了后缀）时，较短的标题至少要有这么多字，且占较长标题的这么大比例
+# （"念四哥（转载）"不会匹配到"念四哥"）
+MIN_PREFIX_CHARS = 3
+MIN_PREFIX_RATIO = 0.75
+
+
+def title_key(s: str) -> str:
+    """模糊匹配用的标题形式：全角转半角、小写，只保留文字和数字"""
+    s = unicodedata.normalize("NFKC", normalize_title(s)).lower()
+    # 重复下载/导出时文件名追加的 "-1" "-2"
+    s = re.sub(r"-\d+$", "", s)
+    return "".join(ch for ch in s if ch.isalnum())
+
+
+def title_trigrams(key: str) -> set:
+    padded = f"^{key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleDateIndex:
+    """标题 -> 发布时间戳；精确匹配不到时用字符三元组倒排索引做模糊匹配
+
+    查询只访问与标题有共同三元组的候选（再按长度过滤），不与全部标题逐一比较。
+    一个标题是另一个加了短后缀（如"（转载）"）时，即使三元组相似度不够也视为命中；
+    标题中的数字必须一致（系列文章"（1）""（2）"只差一个数字），
+    相似度最高的候选有多个且时间戳不同时视为歧义，都不返回结果。
+    """
+
+    def __init__(self, threshold: float = TITLE_SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.exact = {}
+        self.by_key = {}
+        self.titles = []
+        self.keys = []
+        self.grams = []
+        self.numbers = []
+        self.postings = {}
+
+    def add(self, title: str, ts: int):
+        title = normalize_title(title)
+        self.exact[title] = ts
+        key = title_key(title)
+        if not key or key in self.by_key:
+            return
+        self.by_key[key] = (ts, title)
+        idx = len(self.titles)
+        grams = title_trigrams(key)
+        self.titles.append(title)
+        self.keys.append(key)
+        self.grams.append(grams)
+        self.numbers.append(re.findall(r"\d+", key))
+        for g in grams:
+            self.postings.setdefault(g, []).append(idx)
+
+    def __len__(self):
+        return len(self.exact)
+
+    def __contains__(self, title):
+        return self.get(title) is not None
+
+    def lookup(self, title: str):
+        """返回 (时间戳, 匹配到的标题, 相似度)；找不到时返回 None"""
+        title = normalize_title(title)
+        if title in self.exact:
+            return self.exact[title], title, 1.0
+        key = title_key(title)
+        if key in self.by_key:
+            ts, matched = self.by_key[key]
+            return ts, matched, 1.0
+        if not key:
+            return None
+        numbers = re.findall(r"\d+", key)
+
+        grams = title_trigrams(key)
+        # Dice >= t 要求候选三元组数在 [t/(2-t), (2-t)/t] 倍之间
+        t = self.threshold
+        lo, hi = len(grams) * t / (2 - t), len(grams) * (2 - t) / t
+        common = {}
+        for g in grams:
+            for idx in self.postings.get(g, ()):
+                common[idx] = common.get(idx, 0) + 1
+
+        best_score, best = 0.0, []
+        for idx, n in common.items():
+            size = len(self.grams[idx])
+            other = self.keys[idx]
+            shorter, longer = sorted((other, key), key=len)
+            is_prefix = (len(shorter) >= MIN_PREFIX_CHARS and len(shorter) >= MIN_PREFIX_RATIO * len(longer)
+                         and longer.startswith(shorter))
+            if not (is_prefix or lo <= size <= hi) or self.numbers[idx] != numbers:
+                continue
+            score = 2 * n / (len(grams) + size)
+            if is_prefix:
+                score = max(score, t)
+            if score > best_score:
+                best_score, best = score, [idx]
+            elif score == best_score:
+                best.append(idx)
+        if best_score < t or not best:
+            return None
+        stamps = {self.by_key[self.keys[i]][0] for i in best}
+        if len(stamps) > 1:
+            return None
+        return stamps.pop(), self.titles[best[0]], best_score
+
+    def get(self, title: str, default=None):
+        hit = self.lookup(title)
+        return hit[0] if hit else default
+
+
+def load_article_dates(list_files=None) -> TitleDateIndex:
+    """从 articles_list.json 读取 title->timestamp 映射（支持模糊匹配）"""
+    mapping = TitleDateIndex()
+    for it in load_article_lists(list_files):
         t = normalize_title(it.get("title", ""))
         ts = it.get("timestamp")
         if t and ts:
-            mapping[t] = int(ts)
+            mapping.add(t, int(ts))
     return mapping
 
 
@@ -435,11 +676,325 @@ def safe_filename(s: str) -> str:
     return s or "post"
 
 
+DATA_URI_PREFIX = "data:image/"
+DATA_URI_EXT = {"jpeg": "jpg", "jpg": "jpg", "png": "png", "gif": "gif", "webp": "webp", "bmp": "bmp", "svg+xml": "svg"}
+# base64 分块解码，块大小须是 4 的倍数
+DATA_URI_CHUNK = 1 << 20
+NON_BASE64_RE = re.compile(r"[^A-Za-z0-9+/=]")
+
+
+def save_data_uri(text: str, start: int, end: int, ext: str, images_dir: str) -> str:
+    """分块解码 text[start:end] 的 base64 数据，写入以内容哈希命名的文件，返回文件名"""
+    os.makedirs(images_dir, exist_ok=True)
+    digest = hashlib.sha1()
+    fd, tmp_path = tempfile.mkstemp(dir=images_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for k in range(start, end, DATA_URI_CHUNK):
+                chunk = base64.b64decode(text[k:min(k + DATA_URI_CHUNK, end)], validate=True)
+                digest.update(chunk)
+                f.write(chunk)
+        name = f"{digest.hexdigest()[:16]}.{ext}"
+        os.replace(tmp_path, os.path.join(images_dir, name))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return name
+
+
+def extract_data_uri_images(text: str, images_dir: str = IMAGES_DIR):
+    """把正文中的 data URI 图片解码为 source/images/ 下的文件，返回 (新正文, 文件名列表)
+
+    只用 find 顺序扫描，不对大段 base64 做正则回溯；同一张图片只保存一份。
+    """
+    out = []
+    saved = []
+    pos = 0
+    while True:
+        i = text.find(DATA_URI_PREFIX, pos)
+        if i == -1:
+            break
+        semi = text.find(";base64,", i, i + 64)
+        ext = DATA_URI_EXT.get(text[i + len(DATA_URI_PREFIX):semi].lower()) if semi != -1 else None
+        if ext is None:
+            out.append(text[pos:i + len(DATA_URI_PREFIX)])
+            pos = i + len(DATA_URI_PREFIX)
+            continue
+        start = semi + len(";base64,")
+        m = NON_BASE64_RE.search(text, start)
+        end = m.start() if m else len(text)
+        try:
+            # 数据须非空且紧跟链接/属性的结束符，否则视为损坏
+            if end == start or (m and text[end] not in ')"\'> \n'):
+                raise ValueError
+            name = save_data_uri(text, start, end, ext, images_dir)
+        except (binascii.Error, ValueError):
+            log("warn", f"[WARN] 无法解码的 data URI 图片，保留原样（{end - start} 字节）")
+            out.append(text[pos:end])
+            pos = end
+            continue
+        out.append(text[pos:i])
+        out.append(f"/images/{name}")
+        saved.append(name)
+        pos = end
+    out.append(text[pos:])
+    return "".join(out), saved
+
+
+def clean_body(body: str, link_index: WechatLinkIndex = None) -> str:
+    """按固定顺序执行全部正文清理步骤"""
+    # 1. 清理分隔符（dadong*shangu 等）
+    body_clean = clean_separators(body)
+    
+    # 2. 清理开头的推广内容
+    body_clean = strip_promo_head(body_clean)
+    
+    # 3. 清理微信公众号链接：站内互链先改写，再判断末尾推广，避免从互链处截断正文
+    body_clean = clean_wechat_links(body_clean, link_index)
+    
+    # 4. 清理末尾的推广内容
+    body_clean = strip_promo_tail(body_clean)
+    
+    # 5. 删除没有图片的图片说明
+    body_clean = remove_empty_image_captions(body_clean)
+    
+    # 6. 若正文首行是 "# title"，去掉避免重复显示（可选）
+    body_lines = body_clean.splitlines()
+    if body_lines and re.match(r"^\s*#\s+", body_lines[0]):
+        body_clean = "\n".join(body_lines[1:]).lstrip()
+    
+    # 7. 清理多余的空行和空白字符
+    return clean_extra_whitespace(body_clean)
+
+
+def read_export(fp: Path):
+    """读取单个导出文件，返回 (raw, fm, body, title)"""
+    raw = fp.read_text(encoding="utf-8", errors="ignore")
+    fm, body = parse_front_matter(raw)
+
+    title_guess = fp.stem
+    title = None
+    if fm:
+        m = re.search(r"^title:\s*(.+)\s*$", fm, re.MULTILINE)
+        if m:
+            title = normalize_title(m.group(1))
+    if not title:
+        title = get_title_from_md(body, title_guess)
+    return raw, fm, body, title
+
+
+def build_post(fp: Path, raw: str, fm, body: str, title: str, date_map: TitleDateIndex,
+               link_index: WechatLinkIndex = None):
+    """生成导入后的完整文章，返回 (ts, out_text)"""
+    # 处理日期：优先用列表映射；否则从正文中找中文日期；否则用文件mtime
+    ts = None
+    hit = date_map.lookup(title)
+    if hit:
+        ts, matched, score = hit
+        if score < 1.0:
+            log("info", f"[DATE] 模糊匹配标题: {title} -> {matched}（相似度 {score:.2f}）")
+    if not ts:
+        m = DATE_CN_RE.search(raw)
+        if m:
+            y, mo, d = map(int, m.groups())
+            ts = int(datetime(y, mo, d, 0, 0, 0).timestamp())
+    if not ts:
+        ts = int(fp.stat().st_mtime)
+
+    date_str = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+
+    body_clean = clean_body(body, link_index)
+    # 字数/阅读时长在导入时算一次，站点构建时直接读取
+    wordcount, min2read = compute_stats(body_clean)
+    # 长文在段落边界插入 <!-- more -->，首页只渲染摘要
+    body_clean = insert_excerpt_break(body_clean)
+
+    if not fm:
+        fm_out = "\n".join(
+            [
+                "---",
+                f"title: {title}",
+                f"date: {date_str}",
+                "tags:",
+                "  - 大东山谷精选",
+                f"wordcount: {wordcount}",
+                f"min2read: {min2read}",
+                "---",
+                "",
+            ]
+        )
+        out_text = fm_out + body_clean.strip() + "\n"
+    else:
+        # 保留原front-matter，但确保有 date/tags
+        fm_lines = fm.splitlines()
+        if not any(l.startswith("date:") for l in fm_lines):
+            fm_lines.append(f"date: {date_str}")
+        if not any(l.startswith("tags:") for l in fm_lines):
+            fm_lines.append("tags:")
+            fm_lines.append("  - 大东山谷精选")
+        if not any(l.startswith("wordcount:") for l in fm_lines):
+            fm_lines.append(f"wordcount: {wordcount}")
+        if not any(l.startswith("min2read:") for l in fm_lines):
+            fm_lines.append(f"min2read: {min2read}")
+        fm_out = "---\n" + "\n".join(fm_lines).strip() + "\n---\n\n"
+        out_text = fm_out + body_clean.strip() + "\n"
+
+    return ts, out_text
+
+
+def unique_out_path(title: str, ts: int, writer: PostWriter) -> Path:
+    """在 writer 的内存文件名登记中预留输出路径（冲突时追加序号）"""
+    out_name = f"{datetime.fromtimestamp(ts).strftime('%Y-%m-%d')}-{safe_filename(title)}.md"
+    return writer.reserve(out_name)
+
+
+def import_file(fp: Path, date_map: TitleDateIndex, existing_titles: set, out_path: Path = None,
+                link_index: WechatLinkIndex = None, writer: PostWriter = None):
+    """导入单个导出文件，返回 (title, 输出路径)；重复标题时输出路径为 None
+
+    out_path 不为空时直接覆盖该文件（用于监听模式下源文件被再次修改）。
+    传入 link_index 时改写站内互链，并把新文章加入索引供后续文章引用。
+    批量导入时传入同一个 writer，由调用方在整批结束后 commit；
+    不传时单独建一个 writer 并立即 commit。内容与磁盘相同时不改写文件
+    （仍返回输出路径），实际改写的文章见 writer.changed。
+    """
+    raw, fm, body, title = read_export(fp)
+    if out_path is None and title in existing_titles:
+        log("info", f"[SKIP] duplicate title: {title}")
+        return title, None
+
+    # 先把内嵌图片落盘，后续清理步骤只处理短文本
+    if DATA_URI_PREFIX in raw:
+        raw, saved = extract_data_uri_images(raw)
+        fm, body = parse_front_matter(raw)
+        if saved:
+            log("info", f"[IMG] {title}: 提取内嵌图片 {len(saved)} 张")
+
+    ts, out_text = build_post(fp, raw, fm, body, title, date_map, link_index)
+    batch = writer
+    if batch is None:
+        batch = PostWriter(POSTS_DIR)
+    if out_path is None:
+        out_path = unique_out_path(title, ts, batch)
+
+    changed = batch.write(out_path, out_text, source=fp.name)
+    if writer is None:
+        batch.commit()
+    existing_titles.add(title)
+    if link_index is not None:
+        permalink = build_permalink(load_permalink_pattern(), datetime.fromtimestamp(ts), out_path.stem)
+        link_index.add_post(title, permalink)
+    if changed:
+        log("info", f"[OK] imported: {out_path.name}")
+    else:
+        log("info", f"[SKIP] unchanged: {out_path.name}")
+    return title, out_path
+
+
+def retag_imported(paths):
+    """为新导入的文章自动分配标签/分类（需要 numpy/scipy，未安装时保留默认标签）"""
+    if not paths:
+        return
+    try:
+        from auto_tags import retag_files
+    except ImportError as e:
+        log("warn", f"[WARN] 跳过自动标签（{e}）")
+        return
+    for path in retag_files(paths):
+        log("info", f"[TAG] {path.name}")
+
+
+def invalidate_tag_model():
+    """_posts 有新文章时丢弃本进程已拟合的标签模型（还没加载 auto_tags 时无需处理）"""
+    auto_tags = sys.modules.get("auto_tags")
+    if auto_tags is not None:
+        auto_tags.invalidate_model()
+
+
+def strip_imported_promo_images(paths):
+    """删除新导入文章中反复出现的推广图片（需要 Pillow/requests，未安装时跳过）"""
+    if not paths:
+        return
+    try:
+        import PIL  # noqa: F401
+        import requests  # noqa: F401
+    except ImportError as e:
+        log("warn", f"[WARN] 跳过推广图片检测（缺少 {e.name}: pip install Pillow requests）")
+        return
+    from promo_images import strip_files
+    for path in strip_files(paths):
+        log("info", f"[PROMO] {path.name}: 已删除推广图片")
+
+
+def size_imported_images(paths):
+    """为新导入文章的图片补充宽高和懒加载属性"""
+    if not paths:
+        return
+    from image_dimensions import size_files
+    for path in size_files(paths):
+        log("info", f"[IMG] {path.name}: 已补充图片尺寸")
+
+
+def rebuild_catalog():
+    """导入后重新生成文章目录页（内容不变时不改写）"""
+    from build_catalog import update_catalog
+    if update_catalog():
+        print("[OK] 已更新文章目录页")
+
+
+def import_batch(in_files, date_map: TitleDateIndex, existing_titles: set, link_index: WechatLinkIndex,
+                 writer: PostWriter, progress: Progress) -> int:
+    """逐个导入并推进进度，整批结束后提交一次；返回因重复标题跳过的数量"""
+    skipped = 0
+    for fp in in_files:
+        changed_before = len(writer.changed)
+        _, out_path = import_file(fp, date_map, existing_titles, link_index=link_index, writer=writer)
+        if out_path is None:
+            skipped += 1
+            progress.advance("skip", file=fp.name)
+        elif len(writer.changed) > changed_before:
+            progress.advance("ok", file=fp.name, post=out_path.name)
+        else:
+            progress.advance("unchanged", file=fp.name, post=out_path.name)
+    writer.commit()
+    return skipped
+
+
+def print_changed(paths):
+    """列出本次改写的文章（不受 --log-level 影响，与 import_posts.py 一致）"""
+    if paths:
+        print("\n改写的文章:")
+        for path in paths:
+            print(f"  - {Path(path).name}")
+
+
+def finish_import(paths):
+    """导入后处理：自动标签、推广图片、图片尺寸，有改动时重新生成目录页
+
+    全部成功后才在清单里记录处理结果；中途出错时这些文章下次导入会重新写入并再处理一次。
+    """
+    retag_imported(paths)
+    strip_imported_promo_images(paths)
+    size_imported_images(paths)
+    if paths:
+        rebuild_catalog()
+    mark_processed(paths)
+
+
 def main():
+    parser = argparse.ArgumentParser(description="将 Wechatsync 导出的 Markdown 批量导入 Hexo")
+    add_progress_args(parser)
+    add_memory_args(parser)
+    args = parser.parse_args()
+    profiler = MemoryProfiler.from_args(args, "import_wechatsync_md")
+
     os.makedirs(POSTS_DIR, exist_ok=True)
 
-    date_map = load_article_dates()
-    existing_titles = get_existing_titles()
+    with profiler.stage("load"):
+        date_map = load_article_dates()
+        existing_titles = get_existing_titles()
+        link_index = load_link_index()
+        writer = PostWriter(POSTS_DIR)
 
     in_files = sorted(Path(IN_DIR).glob("*.md"))
     if not in_files:
@@ -447,105 +1002,18 @@ def main():
         print("请先用 Wechatsync 导出 Markdown 到该目录。")
         return 1
 
-    imported = 0
-    skipped = 0
+    with Progress.from_args(args, total=len(in_files), label="导入") as progress:
+        with profiler.stage("import"):
+            skipped = import_batch(in_files, date_map, existing_titles, link_index, writer, progress)
+        imported = writer.changed
 
-    for fp in in_files:
-        raw = fp.read_text(encoding="utf-8", errors="ignore")
-        fm, body = parse_front_matter(raw)
+        with profiler.stage("post"):
+            finish_import(imported)
+    profiler.save(input_files=len(in_files), imported=len(imported))
 
-        title_guess = fp.stem
-        title = None
-        if fm:
-            m = re.search(r"^title:\s*(.+)\s*$", fm, re.MULTILINE)
-            if m:
-                title = normalize_title(m.group(1))
-        if not title:
-            title = get_title_from_md(body, title_guess)
-
-        if title in existing_titles:
-            print(f"[SKIP] duplicate title: {title}")
-            skipped += 1
-            continue
-
-        # 处理日期：优先用列表映射；否则从正文中找中文日期；否则用文件mtime
-        ts = date_map.get(title)
-        if not ts:
-            m = DATE_CN_RE.search(raw)
-            if m:
-                y, mo, d = map(int, m.groups())
-                ts = int(datetime(y, mo, d, 0, 0, 0).timestamp())
-        if not ts:
-            ts = int(fp.stat().st_mtime)
-
-        date_str = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
-
-        # 清理文章内容
-        # 1. 清理分隔符（dadong*shangu 等）
-        body_clean = clean_separators(body)
-        
-        # 2. 清理开头的推广内容
-        body_clean = strip_promo_head(body_clean)
-        
-        # 3. 清理末尾的推广内容
-        body_clean = strip_promo_tail(body_clean)
-        
-        # 4. 清理微信公众号链接
-        body_clean = clean_wechat_links(body_clean)
-        
-        # 5. 删除没有图片的图片说明
-        body_clean = remove_empty_image_captions(body_clean)
-        
-        # 6. 若正文首行是 "# title"，去掉避免重复显示（可选）
-        body_lines = body_clean.splitlines()
-        if body_lines and re.match(r"^\s*#\s+", body_lines[0]):
-            body_clean = "\n".join(body_lines[1:]).lstrip()
-        
-        # 7. 清理多余的空行和空白字符
-        body_clean = clean_extra_whitespace(body_clean)
-
-        if not fm:
-            fm_out = "\n".join(
-                [
-                    "---",
-                    f"title: {title}",
-                    f"date: {date_str}",
-                    "tags:",
-                    "  - 大东山谷精选",
-                    "---",
-                    "",
-                ]
-            )
-            out_text = fm_out + body_clean.strip() + "\n"
-        else:
-            # 保留原front-matter，但确保有 date/tags
-            fm_lines = fm.splitlines()
-            if not any(l.startswith("date:") for l in fm_lines):
-                fm_lines.append(f"date: {date_str}")
-            if not any(l.startswith("tags:") for l in fm_lines):
-                fm_lines.append("tags:")
-                fm_lines.append("  - 大东山谷精选")
-            fm_out = "---\n" + "\n".join(fm_lines).strip() + "\n---\n\n"
-            out_text = fm_out + body_clean.strip() + "\n"
-
-        out_name = f"{datetime.fromtimestamp(ts).strftime('%Y-%m-%d')}-{safe_filename(title)}.md"
-        out_path = Path(POSTS_DIR) / out_name
-        # 避免文件名冲突
-        if out_path.exists():
-            suffix = 1
-            while True:
-                candidate = Path(POSTS_DIR) / f"{out_path.stem}-{suffix}{out_path.suffix}"
-                if not candidate.exists():
-                    out_path = candidate
-                    break
-                suffix += 1
-
-        out_path.write_text(out_text, encoding="utf-8")
-        existing_titles.add(title)
-        imported += 1
-        print(f"[OK] imported: {out_path.name}")
-
-    print(f"\n[SUMMARY] imported={imported}, skipped={skipped}, input_files={len(in_files)}")
+    print_changed(imported)
+    print(f"\n[SUMMARY] imported={len(imported)}, unchanged={len(writer.unchanged)}, "
+          f"skipped={skipped}, input_files={len(in_files)}")
     return 0
 
 
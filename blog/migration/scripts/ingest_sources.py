@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+多公众号 / 多专辑抓取并合并导入（来源配置见 sources.json、sources.py）：
+- 同步：每个专辑通过 JSON 接口增量同步文章列表，写入各自数据目录的 articles_list.json
+- 抓取：新文章抓取后转换为 Markdown，写入各自的 wechatsync_md/；已抓取的链接记在
+  fetched.json，重复运行只抓新文章（没有 fetched.json 时按已导出的文件名补记）
+- 调度：所有来源共用一个线程池，同时进行的请求不超过全局预算 concurrency；
+  派发时按来源轮转，每个来源最多同时 per_source 个请求、两次请求至少间隔 delay 秒，
+  文章多的专辑不会占满预算；某个专辑同步完就开始抓取，不必等其他专辑
+- 导入：所有来源的 wechatsync_md 合并为一批导入 _posts（post_writer.py 整批提交一次），
+  日期和站内互链使用全部来源的文章列表，同名文章只导入一次（配置中靠前的来源优先）
+- 工作线程只发请求；转换、写文件和输出都在主线程，不需要加锁
+
+用法：
+    python scripts/ingest_sources.py                          # 全部来源：同步 + 抓取 + 导入
+    python scripts/ingest_sources.py --source dadong          # 只处理某个公众号（或 <公众号>/<专辑>）
+    python scripts/ingest_sources.py --concurrency 8 --skip-import
+    python scripts/ingest_sources.py --skip-sync --skip-fetch # 只做合并导入
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+from collections import deque
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from sources import SOURCES_FILE, load_config, select_sources
+from progress import Progress, add_progress_args, log
+
+
+class FairScheduler:
+    """按来源排队的任务；轮转派发，每个来源有并发上限和最小请求间隔"""
+
+    def __init__(self, names, per_source: int, delay: float):
+        self.order = list(names)
+        self.queues = {name: deque() for name in self.order}
+        self.running = dict.fromkeys(self.order, 0)
+        self.next_time = dict.fromkeys(self.order, 0.0)
+        self.per_source = per_source
+        self.delay = delay
+        self.cursor = 0
+
+    def add(self, name: str, task):
+        self.queues[name].append(task)
+
+    def _ready(self, name: str) -> bool:
+        return bool(self.queues[name]) and self.running[name] < self.per_source
+
+    def take(self, now: float):
+        """从上次派发的下一个来源开始找可派发的任务，返回 (来源, 任务)；暂时没有时返回 None"""
+        for i in range(len(self.order)):
+            name = self.order[(self.cursor + i) % len(self.order)]
+            if self._ready(name) and self.next_time[name] <= now:
+                self.cursor = (self.cursor + i + 1) % len(self.order)
+                self.running[name] += 1
+                self.next_time[name] = now + self.delay
+                return name, self.queues[name].popleft()
+        return None
+
+    def done(self, name: str):
+        self.running[name] -= 1
+
+    def wait_time(self, now: float):
+        """距离下一个任务可派发还要等多久（秒）；没有可派发的排队任务时返回 None"""
+        waits = [max(0.0, self.next_time[n] - now) for n in self.order if self._ready(n)]
+        return min(waits) if waits else None
+
+
+def export_stems(md_dir: str) -> set:
+    """已导出文件的标题部分（去掉 -1、-2 等重名序号）"""
+    if not os.path.isdir(md_dir):
+        return set()
+    return {re.sub(r"-\d+$", "", name[:-3]) for name in os.listdir(md_dir) if name.endswith(".md")}
+
+
+class SourceRun:
+    """一个来源在本次运行中的状态"""
+
+    def __init__(self, source):
+        self.source = source
+        self.articles = source.load_articles()
+        self.fetched = source.load_fetched()
+        self.new = 0
+        self.ok = 0
+        self.failed = 0
+
+    def seed_fetched(self):
+        """首次运行：wechatsync_md 中已有同名文件的文章视为已抓取"""
+        from auto_fetch_articles import normalize_title
+        stems = export_stems(self.source.md_dir)
+        if not stems:
+            return
+        for article in self.articles:
+            title = normalize_title(article.get("title", ""))
+            safe = re.sub(r"[\\/:*?\"<>|]", "_", title).replace(" ", "-")[:80]
+            if article.get("url") and (title in stems or safe in stems):
+                self.fetched[article["url"]] = None
+
+    def pending(self) -> list:
+        return [a for a in self.articles if a.get("url") and a["url"] not in self.fetched]
+
+
+def ingest(runs: list, settings: dict, args, sync: bool, fetch: bool):
+    """同步文章列表并抓取新文章（各来源共用并发预算）"""
+    if sync:
+        from extract_links import incremental_sync, merge_articles
+    if fetch:
+        from auto_fetch_articles import fetch_article
+        from fetch_queue import save_article
+        for run in runs:
+            if not os.path.exists(run.source.fetched_file):
+                run.seed_fetched()
+
+    by_name = {run.source.name: run for run in runs}
+    scheduler = FairScheduler(by_name, settings["per_source"], settings["delay"])
+    total = 0
+    for run in runs:
+        if sync:
+            scheduler.add(run.source.name, ("sync", list(run.articles)))
+            total += 1
+        elif fetch:
+            for article in run.pending():
+                scheduler.add(run.source.name, ("fetch", article))
+                total += 1
+
+    def execute(run, kind, payload):
+        if kind == "sync":
+            return incremental_sync(payload, run.source.biz, run.source.album_id)
+        return fetch_article(payload["url"])
+
+    budget = settings["concurrency"]
+    running = {}
+    with Progress.from_args(args, total=total, label="抓取") as progress, \
+            ThreadPoolExecutor(max_workers=budget) as pool:
+        while True:
+            now = time.monotonic()
+            while len(running) < budget:
+                picked = scheduler.take(now)
+                if picked is None:
+                    break
+                name, (kind, payload) = picked
+                future = pool.submit(execute, by_name[name], kind, payload)
+                running[future] = (name, kind, payload)
+
+            pause = scheduler.wait_time(time.monotonic()) if len(running) < budget else None
+            if not running:
+                if pause is None:
+                    break
+                time.sleep(pause)
+                continue
+            done, _ = wait(running, timeout=pause, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name, kind, payload = running.pop(future)
+                scheduler.done(name)
+                run = by_name[name]
+                if kind == "sync":
+                    try:
+                        new_articles, requests_made = future.result()
+                    except Exception as e:
+                        log("error", f"[ERROR] [{name}] 同步文章列表失败: {e}")
+                        progress.advance("fail", source=name, task="sync", error=str(e))
+                    else:
+                        run.new = len(new_articles)
+                        if new_articles:
+                            run.articles = merge_articles(run.articles, new_articles)
+                            run.source.save_articles(run.articles)
+                        log("info", f"[OK] [{name}] 同步完成：请求 {requests_made} 次，新文章 {run.new} 篇")
+                        progress.advance("sync", source=name, new=run.new)
+                    # 同步失败时仍然抓取列表中已有但未抓取的文章
+                    if fetch:
+                        pending = run.pending()
+                        for article in pending:
+                            scheduler.add(name, ("fetch", article))
+                        progress.total += len(pending)
+                    continue
+
+                title = payload.get("title", "")
+                try:
+                    content_data = future.result()
+                    if "error" in content_data:
+                        raise RuntimeError(content_data["error"])
+                    output = save_article(payload, content_data, run.source.md_dir, run.source.tag)
+                except Exception as e:
+                    run.failed += 1
+                    log("warn", f"[FAIL] [{name}] {title}: {e}")
+                    progress.advance("fail", source=name, title=title, error=str(e))
+                    continue
+                run.ok += 1
+                run.fetched[payload["url"]] = os.path.basename(output)
+                log("info", f"[OK] [{name}] {os.path.basename(output)}")
+                progress.advance("ok", source=name, title=title)
+
+    for run in runs:
+        if fetch and (run.ok or not os.path.exists(run.source.fetched_file)):
+            run.source.save_fetched(run.fetched)
+
+
+def merged_import(runs: list, args):
+    """把所有来源的 wechatsync_md 作为一批导入 _posts，返回改写的文章列表"""
+    from post_writer import PostWriter
+    from import_wechatsync_md import (
+        POSTS_DIR,
+        load_article_dates,
+        get_existing_titles,
+        load_link_index,
+        import_batch,
+        finish_import,
+        print_changed,
+    )
+
+    list_files = [run.source.articles_list_file for run in runs]
+    in_files = []
+    for run in runs:
+        in_files += sorted(Path(run.source.md_dir).glob("*.md"))
+    if not in_files:
+        print("[INFO] 没有可导入的文章")
+        return []
+
+    os.makedirs(POSTS_DIR, exist_ok=True)
+    date_map = load_article_dates(list_files)
+    existing_titles = get_existing_titles()
+    link_index = load_link_index(list_files)
+    writer = PostWriter(POSTS_DIR)
+
+    with Progress.from_args(args, total=len(in_files), label="导入") as progress:
+        skipped = import_batch(in_files, date_map, existing_titles, link_index, writer, progress)
+        finish_import(writer.changed)
+
+    print_changed(writer.changed)
+    print(f"[SUMMARY] imported={len(writer.changed)}, unchanged={len(writer.unchanged)}, "
+          f"skipped={skipped}, input_files={len(in_files)}")
+    return writer.changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="按 sources.json 并发抓取多个公众号/专辑，并合并导入 _posts")
+    parser.add_argument("--config", default=SOURCES_FILE, help="来源配置文件")
+    parser.add_argument("--source", action="append", metavar="NAME",
+                        help="只处理指定来源（<公众号>/<专辑> 或公众号名，可重复）")
+    parser.add_argument("--concurrency", type=int, help="全局并发请求数（默认取配置）")
+    parser.add_argument("--per-source", type=int, help="单个来源的并发上限（默认取配置）")
+    parser.add_argument("--delay", type=float, help="同一来源两次请求的最小间隔（秒，默认取配置）")
+    parser.add_argument("--skip-sync", action="store_true", help="不同步文章列表")
+    parser.add_argument("--skip-fetch", action="store_true", help="不抓取文章")
+    parser.add_argument("--skip-import", action="store_true", help="不导入 _posts")
+    add_progress_args(parser)
+    args = parser.parse_args()
+
+    try:
+        config = load_config(args.config)
+        sources = select_sources(config["sources"], args.source)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] 读取来源配置失败: {e}")
+        return 1
+    settings = dict(config["settings"])
+    for key in ("concurrency", "per_source", "delay"):
+        if getattr(args, key) is not None:
+            settings[key] = getattr(args, key)
+    if settings["concurrency"] < 1 or settings["per_source"] < 1:
+        print("[ERROR] concurrency 和 per_source 必须大于 0")
+        return 1
+
+    print(f"[INFO] 来源 {len(sources)} 个，并发预算 {settings['concurrency']}，"
+          f"单来源上限 {settings['per_source']}，请求间隔 {settings['delay']}s")
+    runs = [SourceRun(source) for source in sources]
+
+    sync, fetch = not args.skip_sync, not args.skip_fetch
+    if sync or fetch:
+        try:
+            ingest(runs, settings, args, sync, fetch)
+        except ImportError as e:
+            print(f"[ERROR] 缺少依赖（{e.name}）: pip install -r requirements.txt")
+            return 1
+        for run in runs:
+            print(f"[SUMMARY] {run.source.name}: new={run.new}, fetched={run.ok}, failed={run.failed}, "
+                  f"pending={len(run.pending())}")
+
+    if not args.skip_import:
+        merged_import(runs, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
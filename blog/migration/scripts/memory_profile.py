@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+按阶段统计内存（供转换、导入脚本的 --profile-memory 使用）：
+- 基于 tracemalloc：每个阶段开始/结束各拍一次快照，列出该阶段新增内存最多的代码位置
+- 每个阶段记录：耗时、阶段结束时仍占用的内存、阶段内的峰值（tracemalloc）以及进程峰值 RSS
+- 结果写入 JSON 报告（默认 data/memory_profile_<脚本>.json），带上文章数，
+  语料增长后再跑一次即可对比各阶段内存是否保持平稳
+- 未开启时所有调用都是空操作，不影响正常运行速度
+
+用法（脚本内）：
+    add_memory_args(parser)
+    profiler = MemoryProfiler.from_args(args, "convert_format")
+    with profiler.stage("convert"):
+        ...
+    profiler.save(items=len(articles))
+"""
+
+import os
+import sys
+import json
+import time
+import tracemalloc
+from datetime import datetime
+from contextlib import contextmanager
+
+from post_index import BASE_DIR
+
+
+DATA_DIR = os.path.join(BASE_DIR, "data")
+# 每个阶段列出的分配位置数
+TOP_SITES = 10
+# 快照保留的调用栈深度（按最内层的代码行归类）
+TRACE_FRAMES = 1
+
+
+def add_memory_args(parser):
+    parser.add_argument("--profile-memory", nargs="?", const="", metavar="FILE",
+                        help="按阶段统计内存并写入报告（默认 data/memory_profile_<脚本>.json）")
+    return parser
+
+
+def peak_rss() -> int:
+    """进程峰值 RSS（字节）；平台不支持时返回 None"""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位是 KB，macOS 是字节
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def site_name(filename: str, lineno: int) -> str:
+    """分配位置：migration 目录下的文件用相对路径，其他（标准库、第三方库）保留原路径"""
+    if os.path.abspath(filename).startswith(BASE_DIR + os.sep):
+        filename = os.path.relpath(filename, BASE_DIR)
+    return f"{filename}:{lineno}"
+
+
+def format_bytes(n) -> str:
+    if n is None:
+        return "-"
+    for unit in ("B", "KB", "MB"):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+class MemoryProfiler:
+    """按阶段记录内存；enabled 为 False 时 stage()/save() 什么都不做"""
+
+    def __init__(self, name: str, enabled: bool = False, report_file: str = None, top: int = TOP_SITES):
+        self.name = name
+        self.enabled = enabled
+        self.report_file = report_file or os.path.join(DATA_DIR, f"memory_profile_{name}.json")
+        self.top = top
+        self.stages = []
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+
+    @classmethod
+    def from_args(cls, args, name: str):
+        value = getattr(args, "profile_memory", None)
+        return cls(name, enabled=value is not None, report_file=value or None)
+
+    def _snapshot(self):
+        # 排除 tracemalloc 自身和导入机制的分配
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ])
+
+    @contextmanager
+    def stage(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        before = self._snapshot()
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            current, peak = tracemalloc.get_traced_memory()
+            after = self._snapshot()
+            sites = []
+            for stat in after.compare_to(before, "lineno")[:self.top]:
+                frame = stat.traceback[0]
+                sites.append({
+                    "site": site_name(frame.filename, frame.lineno),
+                    "size_diff": stat.size_diff,
+                    "count_diff": stat.count_diff,
+                    "size": stat.size,
+                })
+            self.stages.append({
+                "stage": name,
+                "seconds": round(elapsed, 3),
+                "traced_current": current,
+                "traced_peak": peak,
+                "rss_peak": peak_rss(),
+                "top_sites": sites,
+            })
+
+    def save(self, **meta):
+        """打印各阶段汇总并写入报告；meta 记录语料规模等便于对比的信息"""
+        if not self.enabled:
+            return
+        report = {
+            "script": self.name,
+            "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "python": sys.version.split()[0],
+            **meta,
+            "stages": self.stages,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.report_file)), exist_ok=True)
+        with open(self.report_file, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        print(f"\n{'阶段':<10}{'耗时 (s)':>10}{'占用':>12}{'阶段峰值':>12}{'进程峰值 RSS':>14}")
+        for s in self.stages:
+            print(f"{s['stage']:<10}{s['seconds']:>10.2f}{format_bytes(s['traced_current']):>12}"
+                  f"{format_bytes(s['traced_peak']):>12}{format_bytes(s['rss_peak']):>14}")
+            for site in s["top_sites"][:3]:
+                print(f"    {format_bytes(site['size_diff']):>10}  {site['site']}")
+        print(f"[INFO] 内存报告已保存: {self.report_file}")
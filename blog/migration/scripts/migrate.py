@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+迁移工具统一入口：
+- 子命令 list / fetch / convert / clean / import / check，每个子命令下按目标分派到对应脚本的 main()
+- 本文件只用标准库；requests、bs4、html2text、numpy 等依赖由目标脚本自己导入，
+  只有真正执行到该目标时才加载，查看帮助、check、import 等不必为抓取依赖付出启动时间
+- 目标后面的参数原样传给目标脚本（等价于直接运行 python scripts/<脚本>.py 参数...）
+- 各子命令的冷启动耗时见 benchmarks/bench_cli_startup.py
+
+用法：
+    python scripts/migrate.py                        # 列出全部子命令和目标
+    python scripts/migrate.py import                 # 默认目标：导入 Wechatsync 导出的 Markdown
+    python scripts/migrate.py import watch --poll
+    python scripts/migrate.py check catalog
+    python scripts/migrate.py fetch queue --workers 4
+"""
+
+import os
+import sys
+import importlib
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 子命令 -> 目标 -> (模块, 固定参数, 说明)；每个子命令的第一个目标为默认目标（clean 没有默认目标）
+COMMANDS = {
+    "list": {
+        "links": ("extract_links", [], "从专辑页提取文章链接（--incremental 增量）"),
+        "raw": ("process_articles_new_raw", [], "清洗浏览器提取的 articles_new_raw.json"),
+        "merge": ("merge_and_clean", [], "合并新旧文章列表并清理标题"),
+        "sources": ("sources", [], "列出 sources.json 中配置的公众号/专辑"),
+    },
+    "fetch": {
+        "queue": ("fetch_queue", [], "持久化队列 + 多进程抓取"),
+        "sources": ("ingest_sources", [], "按 sources.json 并发抓取多个公众号/专辑并合并导入"),
+        "list": ("fetch_from_list", [], "按 articles_list.json 逐篇抓取"),
+        "album": ("fetch_articles", [], "从专辑页抓取文章列表和内容"),
+        "auto": ("auto_fetch_articles", [], "批量抓取并直接转换为 Markdown"),
+        "playwright": ("auto_export_with_playwright", [], "用浏览器自动化抓取"),
+        "retry": ("retry_failed_articles", [], "重试抓取失败的文章"),
+        "manual": ("manual_fetch", [], "手动输入链接抓取"),
+        "more": ("clean_and_fetch_more", [], "清理已抓取数据并尝试获取更多"),
+    },
+    "convert": {
+        "html": ("convert_format", [], "HTML 转 Markdown"),
+    },
+    "clean": {
+        "promo-images": ("promo_images", [], "检测/删除反复出现的推广图片"),
+        "excerpt": ("excerpt", [], "为长文章插入 <!-- more -->"),
+        "images": ("image_dimensions", [], "图片补充宽高和懒加载"),
+        "stats": ("reading_stats", [], "回填字数和阅读时长"),
+        "tags": ("auto_tags", [], "自动分配标签和分类"),
+        "assets": ("asset_index", [], "报告/删除未引用的站内图片"),
+    },
+    "import": {
+        "wechatsync": ("import_wechatsync_md", [], "导入 Wechatsync 导出的 Markdown"),
+        "watch": ("watch_wechatsync_md", [], "监听导出目录并自动导入"),
+        "posts": ("import_posts", [], "导入 convert 生成的 Markdown"),
+        "catalog": ("build_catalog", [], "重新生成文章目录页"),
+        "search": ("build_search_index", [], "生成全文搜索索引"),
+        "related": ("build_related_posts", [], "预计算相关文章"),
+    },
+    "check": {
+        "links": ("check_links", [], "检查外部链接是否失效"),
+        "duplicates": ("check_duplicates", [], "检查与已有文章重复的待导入文章"),
+        "catalog": ("build_catalog", ["--check"], "检查目录页是否需要重新生成"),
+    },
+}
+
+DEFAULT_TARGETS = {"list": "links", "fetch": "queue", "convert": "html", "import": "wechatsync", "check": "links"}
+
+
+def print_usage():
+    print("用法: python scripts/migrate.py <子命令> [目标] [参数...]\n")
+    for command, targets in COMMANDS.items():
+        default = DEFAULT_TARGETS.get(command)
+        print(f"{command}")
+        for target, (module, _, desc) in targets.items():
+            mark = "*" if target == default else " "
+            print(f"  {mark} {target:<14}{desc}（{module}.py）")
+    print("\n* 为默认目标，可省略")
+
+
+def resolve(command: str, target: str = None):
+    """返回 (模块名, 固定参数)；子命令或目标不存在时抛出 KeyError"""
+    targets = COMMANDS[command]
+    return targets[target or DEFAULT_TARGETS[command]][:2]
+
+
+def load(command: str, target: str = None):
+    """导入目标脚本（此时才加载它的依赖），返回 (模块, 固定参数)"""
+    module_name, fixed_args = resolve(command, target)
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    return importlib.import_module(module_name), fixed_args
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        print_usage()
+        return 0
+
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"[ERROR] 未知子命令: {command}")
+        print_usage()
+        return 2
+    target = None
+    if rest and not rest[0].startswith("-"):
+        target, rest = rest[0], rest[1:]
+    if target is None and command not in DEFAULT_TARGETS:
+        print(f"[ERROR] {command} 需要指定目标: {', '.join(COMMANDS[command])}")
+        return 2
+    if target is not None and target not in COMMANDS[command]:
+        print(f"[ERROR] 未知目标: {command} {target}（可选: {', '.join(COMMANDS[command])}）")
+        return 2
+
+    try:
+        module, fixed_args = load(command, target)
+    except ImportError as e:
+        print(f"[ERROR] 缺少依赖（{e.name}）: pip install -r requirements.txt")
+        return 1
+
+    # 目标脚本用 argparse 读取 sys.argv，这里换成它自己的参数
+    sys.argv = [os.path.join(SCRIPTS_DIR, module.__name__ + ".py")] + fixed_args + rest
+    result = module.main()
+    return result if isinstance(result, int) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
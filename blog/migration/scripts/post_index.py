@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+读取 blog/source/_posts 的公共工具（供索引/生成类脚本共用）：
+- 拆分 front-matter 与正文，解析 title/date/tags 等常用字段
+- 按 _config.yml 中的 permalink 规则计算文章链接
+- 把 Markdown 正文转换为纯文本
+- front-matter 索引（不含正文）按文件 mtime/size 增量缓存，供目录页等生成器使用
+"""
+
+import os
+import re
+import json
+from pathlib import Path
+from datetime import datetime
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # blog/migration
+BLOG_DIR = os.path.dirname(BASE_DIR)  # blog/
+POSTS_DIR = os.path.join(BLOG_DIR, "source", "_posts")
+SITE_CONFIG_FILE = os.path.join(BLOG_DIR, "_config.yml")
+INDEX_CACHE_FILE = os.path.join(BASE_DIR, "data", "post_index_cache.json")
+
+DEFAULT_PERMALINK = ":year/:month/:day/:title/"
+
+
+def split_front_matter(text: str):
+    """拆分 front-matter 与正文，返回 (fm_text, body)；没有 front-matter 时 fm_text 为 None"""
+    if text.startswith("---\n"):
+        end = text.find("\n---", 4)
+        if end != -1:
+            body_start = text.find("\n", end + 4)
+            body = text[body_start + 1:] if body_start != -1 else ""
+            return text[4:end], body
+    return None, text
+
+
+def parse_fields(fm: str) -> dict:
+    """解析 front-matter 的简单子集：`key: value` 与 `key:` 下的 `- item` 列表"""
+    fields = {}
+    current_list = None
+    for line in (fm or "").splitlines():
+        if not line.strip():
+            continue
+        m = re.match(r"^\s+-\s*(.*?)\s*$", line)
+        if m and current_list is not None:
+            current_list.append(m.group(1))
+            continue
+        m = re.match(r"^([A-Za-z_][\w-]*):\s*(.*?)\s*$", line)
+        if not m:
+            continue
+        key, value = m.group(1), m.group(2)
+        if value:
+            fields[key] = value
+            current_list = None
+        else:
+            current_list = fields[key] = []
+    return fields
+
+
+def set_field(fm: str, key: str, value) -> str:
+    """替换（或追加）front-matter 字段；value 为列表时写成 `key:` + `  - item` 形式"""
+    if isinstance(value, (list, tuple)):
+        new_lines = [f"{key}:"] + [f"  - {v}" for v in value]
+    else:
+        new_lines = [f"{key}: {value}"]
+
+    lines = (fm or "").splitlines()
+    out = []
+    replaced = False
+    i = 0
+    while i < len(lines):
+        if re.match(rf"^{re.escape(key)}:", lines[i]):
+            i += 1
+            # 连同原来的列表项一起替换
+            while i < len(lines) and re.match(r"^\s+-", lines[i]):
+                i += 1
+            if not replaced:
+                out.extend(new_lines)
+                replaced = True
+            continue
+        out.append(lines[i])
+        i += 1
+    if not replaced:
+        out.extend(new_lines)
+    return "\n".join(out)
+
+
+def join_front_matter(fm: str, body: str) -> str:
+    """split_front_matter 的逆操作"""
+    return "---\n" + fm + "\n---\n" + body
+
+
+def as_list(value) -> list:
+    """tags/categories 既可能是单个字符串，也可能是列表"""
+    if not value:
+        return []
+    if isinstance(value, list):
+        return value
+    value = value.strip()
+    if value.startswith("[") and value.endswith("]"):
+        return [v.strip() for v in value[1:-1].split(",") if v.strip()]
+    return [value]
+
+
+def parse_date(value: str):
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime((value or "").strip(), fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def load_permalink_pattern() -> str:
+    """读取 _config.yml 中的 permalink 规则"""
+    try:
+        with open(SITE_CONFIG_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                m = re.match(r"^permalink:\s*(\S+)\s*$", line)
+                if m:
+                    return m.group(1)
+    except OSError:
+        pass
+    return DEFAULT_PERMALINK
+
+
+def build_permalink(pattern: str, date: datetime, slug: str) -> str:
+    """按 Hexo 的 permalink 占位符生成站内链接（以 / 开头）"""
+    values = {
+        ":year": f"{date.year:04d}",
+        ":month": f"{date.month:02d}",
+        ":i_month": str(date.month),
+        ":day": f"{date.day:02d}",
+        ":i_day": str(date.day),
+        ":hour": f"{date.hour:02d}",
+        ":minute": f"{date.minute:02d}",
+        ":second": f"{date.second:02d}",
+        ":title": slug,
+        ":post_title": slug,
+    }
+    url = re.sub(r":[a-z_]+", lambda m: values.get(m.group(0), m.group(0)), pattern)
+    return "/" + url.lstrip("/")
+
+
+MD_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+MD_LINK_RE = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+MD_SYMBOL_RE = re.compile(r"[#>*_`~|]+")
+
+
+def markdown_to_text(body: str) -> str:
+    """Markdown 正文转纯文本（去掉图片、链接地址、HTML 标签和格式符号）"""
+    text = MD_IMAGE_RE.sub(" ", body)
+    text = MD_LINK_RE.sub(r"\1", text)
+    text = HTML_TAG_RE.sub(" ", text)
+    text = MD_SYMBOL_RE.sub(" ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def read_post(path: Path, permalink_pattern: str = None) -> dict:
+    """读取单篇文章，返回 {path, file, title, date, tags, url, fm, fields, body}"""
+    text = path.read_text(encoding="utf-8", errors="ignore")
+    fm, body = split_front_matter(text)
+    fields = parse_fields(fm)
+    date = parse_date(fields.get("date", "")) or datetime.fromtimestamp(path.stat().st_mtime)
+    pattern = permalink_pattern or load_permalink_pattern()
+    return {
+        "path": path,
+        "file": path.name,
+        "title": fields.get("title", path.stem).strip("'\""),
+        "date": date,
+        "tags": as_list(fields.get("tags")),
+        "url": build_permalink(pattern, date, path.stem),
+        "fm": fm,
+        "fields": fields,
+        "body": body,
+    }
+
+
+def load_posts(posts_dir: str = POSTS_DIR) -> list:
+    """读取 _posts 下全部文章，按文件名排序"""
+    pattern = load_permalink_pattern()
+    return [read_post(p, pattern) for p in sorted(Path(posts_dir).glob("*.md"))]
+
+
+INDEX_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def index_entry(path: Path, permalink_pattern: str) -> dict:
+    """单篇文章的 front-matter 索引项（可直接 JSON 序列化）"""
+    post = read_post(path, permalink_pattern)
+    st = path.stat()
+    return {
+        "file": post["file"],
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "title": post["title"],
+        "date": post["date"].strftime(INDEX_DATE_FORMAT),
+        "tags": post["tags"],
+        "categories": as_list(post["fields"].get("categories")),
+        "top": post["fields"].get("top"),
+        "url": post["url"],
+    }
+
+
+def load_post_index(posts_dir: str = POSTS_DIR, cache_file: str = INDEX_CACHE_FILE) -> list:
+    """读取 _posts 的 front-matter 索引，按文件名排序
+
+    只有 mtime/size 变化的文章才重新解析；permalink 规则变化时整体重建。
+    返回项中的 date 已转换为 datetime。
+    """
+    pattern = load_permalink_pattern()
+    cache = {}
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+    if cache.get("permalink") != pattern:
+        cache = {"permalink": pattern, "posts": {}}
+    cached = cache["posts"]
+
+    entries = {}
+    dirty = False
+    for path in sorted(Path(posts_dir).glob("*.md")):
+        st = path.stat()
+        entry = cached.get(path.name)
+        if not entry or entry["mtime_ns"] != st.st_mtime_ns or entry["size"] != st.st_size:
+            entry = index_entry(path, pattern)
+            dirty = True
+        entries[path.name] = entry
+    if dirty or len(entries) != len(cached):
+        cache["posts"] = entries
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+
+    result = []
+    for entry in entries.values():
+        item = dict(entry)
+        item["date"] = datetime.strptime(entry["date"], INDEX_DATE_FORMAT)
+        result.append(item)
+    return result
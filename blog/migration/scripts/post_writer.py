@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+批量写入 _posts 的公共工具（供导入脚本共用）：
+- 目录列表只读取一次放进内存，文件名冲突在内存里加序号解决，不再逐个 stat
+- 每篇文章先写同目录下的隐藏临时文件，再 os.replace 原子替换，
+  中途崩溃不会在 _posts 留下写了一半的文章（Hexo 忽略以 . 开头的文件）
+- 整批写完后一次性更新清单 data/posts_manifest.json（文件名 -> 内容哈希、来源）
+- 内容与磁盘上的文章相同时不写文件，保留 mtime，Hexo 的 db.json 缓存和 git diff 都不受影响；
+  changed 列出实际改写的文章
+- 导入后处理（标签、图片尺寸）会再改写文章：全部成功后 mark_processed() 把处理后的哈希
+  记入清单，之后与清单 sha1 相同的导入内容才算未变化；后处理失败的文章下次导入会重写并重新处理
+- 写入的同时更新站内图片引用索引 data/asset_index.json（asset_index.py）
+- 自动标签、图片尺寸以及各回填脚本改写文章时用 write_post()，同样是原子替换
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+from datetime import datetime
+
+from post_index import BASE_DIR, POSTS_DIR
+from asset_index import AssetIndex
+
+
+MANIFEST_FILE = os.path.join(BASE_DIR, "data", "posts_manifest.json")
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def atomic_write(path: Path, data: bytes):
+    """写临时文件后 os.replace，目标文件要么是旧内容，要么是完整的新内容"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def load_manifest(manifest_file: str = MANIFEST_FILE) -> dict:
+    if os.path.exists(manifest_file):
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"posts": {}}
+
+
+def save_manifest(manifest: dict, manifest_file: str = MANIFEST_FILE):
+    os.makedirs(os.path.dirname(manifest_file), exist_ok=True)
+    atomic_write(Path(manifest_file), json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+
+
+def mark_processed(paths, manifest_file: str = MANIFEST_FILE):
+    """导入后处理全部成功后调用：记录这些文章处理后的内容哈希"""
+    paths = [Path(p) for p in paths]
+    if not paths:
+        return
+    manifest = load_manifest(manifest_file)
+    for path in paths:
+        entry = manifest["posts"].get(path.name)
+        if entry is None or not path.exists():
+            continue
+        entry["processed"] = content_hash(path.read_bytes())
+    save_manifest(manifest, manifest_file)
+
+
+def write_post(path, text: str):
+    """原子改写一篇已有文章；导入后处理（标签、图片尺寸）和各回填脚本都经这里写 _posts"""
+    atomic_write(Path(path), text.encode("utf-8"))
+
+
+class PostWriter:
+    """一批文章的写入器
+
+    用法：
+        writer = PostWriter()
+        path = writer.reserve("2020-01-01-标题.md")
+        writer.write(path, text, source="xxx.md")
+        writer.commit()
+    """
+
+    def __init__(self, posts_dir: str = POSTS_DIR, manifest_file: str = MANIFEST_FILE):
+        self.posts_dir = Path(posts_dir)
+        self.manifest_file = manifest_file
+        self.posts_dir.mkdir(parents=True, exist_ok=True)
+        with os.scandir(self.posts_dir) as it:
+            self.names = {entry.name for entry in it}
+        self.manifest = load_manifest(manifest_file)
+        self.assets = AssetIndex()
+        self.batch = {}
+        self.changed = []
+        self.unchanged = []
+
+    def reserve(self, filename: str, text: str = None) -> Path:
+        """登记一个不冲突的文件名（冲突时追加 -1、-2 ...），返回完整路径
+
+        传入 text 时，已有同名（含序号）文件内容相同就直接返回该文件，
+        重复运行导入不会生成 -1、-2 副本。
+        """
+        digest = content_hash(text.encode("utf-8")) if text is not None else None
+        stem, suffix = os.path.splitext(filename)
+        name = filename
+        counter = 1
+        while name in self.names:
+            if digest and self.is_current(self.posts_dir / name, digest):
+                return self.posts_dir / name
+            name = f"{stem}-{counter}{suffix}"
+            counter += 1
+        self.names.add(name)
+        return self.posts_dir / name
+
+    def is_current(self, path: Path, digest: str) -> bool:
+        """磁盘上的文章是否已是这份内容
+
+        清单里的 sha1 是上次导入写出的内容，之后自动标签、图片尺寸等步骤会再改写文章；
+        只有这些步骤成功完成（磁盘内容等于清单里的 processed）时，与 sha1 相同才算未变化，
+        否则重写文章，让后处理再跑一次。
+        """
+        if path.name not in self.names:
+            return False
+        try:
+            on_disk = content_hash(path.read_bytes())
+        except OSError:
+            return False
+        if on_disk == digest:
+            return True
+        entry = self.manifest["posts"].get(path.name, {})
+        return entry.get("sha1") == digest and entry.get("processed") == on_disk
+
+    def write(self, path: Path, text: str, source: str = None) -> bool:
+        """原子写入一篇文章（path 可以是 reserve 得到的新文件，也可以是已有文章）
+
+        内容未变化时不写文件，返回 False。
+        """
+        path = Path(path)
+        data = text.encode("utf-8")
+        digest = content_hash(data)
+        if self.is_current(path, digest):
+            self.unchanged.append(path)
+            return False
+        atomic_write(path, data)
+        self.assets.update_post(path, text)
+        self.names.add(path.name)
+        self.batch[path.name] = {"sha1": digest, "source": source}
+        self.changed.append(path)
+        return True
+
+    def commit(self):
+        """把本批写入的文章记入清单（整批只写一次清单文件）"""
+        if not self.batch:
+            return
+        self.assets.save()
+        manifest = self.manifest
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for name, entry in self.batch.items():
+            manifest["posts"][name] = {**entry, "written": now}
+        manifest["updated"] = now
+        save_manifest(manifest, self.manifest_file)
+        self.batch = {}
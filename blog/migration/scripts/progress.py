@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+批量抓取/导入的进度输出（供抓取、转换、导入脚本共用）：
+- 终端里只保留一行实时进度：完成数/总数、各状态计数、速度（篇/秒）和预计剩余时间；
+  输出不是终端时（CI 日志、重定向到文件）改为每隔 PLAIN_INTERVAL 秒打印一行
+- 每篇文章的明细按级别过滤：批量模式默认只显示 warn 及以上，--verbose 显示全部
+- --events 把所有事件（含被过滤的明细）按 JSON Lines 写入文件，供程序分析
+- 没有正在运行的进度条时，log() 等同于 print，单篇导入和监听模式的输出不变
+
+用法（脚本内）：
+    add_progress_args(parser)
+    with Progress.from_args(args, total=len(items), label="导入") as progress:
+        for item in items:
+            log("info", f"[OK] {item}")
+            progress.advance("ok", item=item)
+"""
+
+import sys
+import json
+import time
+import shutil
+import unicodedata
+
+
+LEVELS = {"debug": 10, "info": 20, "warn": 30, "error": 40}
+# 批量模式下默认只显示这个级别及以上的明细
+DEFAULT_LEVEL = "warn"
+# 实时进度行的最短刷新间隔（秒）
+REFRESH_INTERVAL = 0.1
+# 输出不是终端时，进度行的打印间隔（秒）
+PLAIN_INTERVAL = 10.0
+
+_active = None
+
+
+def add_progress_args(parser):
+    group = parser.add_argument_group("进度输出")
+    group.add_argument("--log-level", choices=list(LEVELS), default=DEFAULT_LEVEL, help="明细输出级别")
+    group.add_argument("--verbose", "-v", action="store_const", const="debug", dest="log_level",
+                       help="输出每篇文章的明细（等同 --log-level debug）")
+    group.add_argument("--quiet", "-q", action="store_const", const="error", dest="log_level",
+                       help="只输出错误（等同 --log-level error）")
+    group.add_argument("--events", metavar="FILE", help="把事件按 JSON Lines 写入文件")
+    return parser
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+class Progress:
+    """一批任务的进度：实时进度行 + 分级明细 + 可选的 JSON Lines 事件日志"""
+
+    def __init__(self, total: int, label: str = "", level: str = DEFAULT_LEVEL, events_file: str = None,
+                 stream=None):
+        self.total = total
+        self.label = label
+        self.level = LEVELS[level]
+        self.stream = stream or sys.stderr
+        self.live = self.stream.isatty()
+        self.events = open(events_file, "a", encoding="utf-8") if events_file else None
+        self.done = 0
+        self.counts = {}
+        self.started = time.perf_counter()
+        self.last_draw = self.started
+        self.line_width = 0
+
+    @classmethod
+    def from_args(cls, args, total: int, label: str = ""):
+        return cls(total, label, args.log_level, args.events)
+
+    def __enter__(self):
+        global _active
+        _active = self
+        self.emit("start", total=self.total, label=self.label)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def emit(self, event: str, **fields):
+        if self.events:
+            record = {"ts": round(time.time(), 3), "event": event, **fields}
+            self.events.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _clear(self):
+        if self.live and self.line_width:
+            self.stream.write("\r" + " " * self.line_width + "\r")
+            self.line_width = 0
+
+    def status_line(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        parts = [f"{self.label} {self.done}/{self.total}".strip()]
+        parts += [f"{k}={v}" for k, v in self.counts.items()]
+        parts.append(f"{rate:.1f} 篇/s")
+        if rate > 0 and self.total > self.done:
+            parts.append(f"剩余 {format_duration((self.total - self.done) / rate)}")
+        parts.append(f"用时 {format_duration(elapsed)}")
+        return "  ".join(parts)
+
+    def _fit(self, line: str):
+        """按终端宽度截断（中文按双宽度计），返回 (截断后的行, 显示宽度)"""
+        cols = shutil.get_terminal_size().columns - 1
+        out, width = [], 0
+        for ch in line:
+            w = 2 if unicodedata.east_asian_width(ch) in "WF" else 1
+            if width + w > cols:
+                break
+            out.append(ch)
+            width += w
+        return "".join(out), width
+
+    def draw(self, force: bool = False):
+        now = time.perf_counter()
+        interval = REFRESH_INTERVAL if self.live else PLAIN_INTERVAL
+        if not force and now - self.last_draw < interval:
+            return
+        self.last_draw = now
+        line = self.status_line()
+        if self.live:
+            line, width = self._fit(line)
+            self._clear()
+            self.stream.write(line)
+            self.line_width = width
+        else:
+            self.stream.write(f"[PROGRESS] {line}\n")
+        self.stream.flush()
+
+    def log(self, level: str, message: str, **fields):
+        """输出一条明细；级别不够时只写入事件日志"""
+        self.emit("log", level=level, message=message, **fields)
+        if LEVELS[level] < self.level:
+            return
+        self._clear()
+        print(message, flush=True)
+        if self.live:
+            self.draw(force=True)
+
+    def advance(self, status: str = "ok", **fields):
+        """完成一项；status 用于分类计数（ok/skip/fail ...）"""
+        self.done += 1
+        self.counts[status] = self.counts.get(status, 0) + 1
+        self.emit("item", status=status, **fields)
+        self.draw()
+
+    def close(self):
+        global _active
+        if _active is self:
+            _active = None
+        elapsed = time.perf_counter() - self.started
+        self.emit("finish", done=self.done, counts=self.counts, elapsed=round(elapsed, 3))
+        if self.events:
+            self.events.close()
+            self.events = None
+        if self.live:
+            self._clear()
+        if self.total:
+            print(f"[PROGRESS] {self.status_line()}", file=self.stream, flush=True)
+
+
+def log(level: str, message: str, **fields):
+    """有进度条时按级别过滤，否则直接打印"""
+    if _active is not None:
+        _active.log(level, message, **fields)
+    else:
+        print(message)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+找出多篇文章反复出现的推广图片（公众号二维码、"关注公众号"横幅等）并删除：
+- 对每篇文章的图片计算感知哈希（dHash，64 位），图片稍有缩放/压缩差异也能匹配
+- 哈希按 8 段 8 位分桶找候选，与组代表的汉明距离不超过阈值的归入该组（不做两两比较，
+  也不会经由 A~B~C 的传递把不相似的 A、C 并到一起）
+- 出现在至少 MIN_POSTS 篇文章中的图片组判定为推广图片
+- 哈希按图片地址缓存在 data/image_hash_cache.json，每张图片只下载/计算一次；
+  下载或解码失败不缓存，下次运行重试
+- 默认只输出报告（data/promo_images.json），加 --strip 才从文章中删除
+- 导入脚本在导入后调用 strip_files() 处理新文章（未安装 Pillow/requests 时跳过）；
+  已有文章里新变成"反复出现"的图片仍需手动运行 --strip
+
+依赖：pip install Pillow requests
+
+用法：
+    python scripts/promo_images.py                 # 只报告
+    python scripts/promo_images.py --strip         # 删除推广图片
+    python scripts/promo_images.py --min-posts 5 --distance 4
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from post_index import BASE_DIR, BLOG_DIR, POSTS_DIR, load_posts, join_front_matter
+from post_writer import write_post
+
+
+DATA_DIR = os.path.join(BASE_DIR, "data")
+CACHE_FILE = os.path.join(DATA_DIR, "image_hash_cache.json")
+REPORT_FILE = os.path.join(DATA_DIR, "promo_images.json")
+SOURCE_DIR = os.path.join(BLOG_DIR, "source")
+
+# 至少在这么多篇文章中出现才算推广图片
+MIN_POSTS = 3
+# dHash 汉明距离阈值（64 位）
+MAX_DISTANCE = 6
+# 分桶段数：距离不超过 BANDS-1 的两张图至少有一段完全相同
+BANDS = 8
+WORKERS = 8
+TIMEOUT = 15
+
+IMAGE_RE = re.compile(r"!\[[^\]]*\]\(([^)\s]+)[^)]*\)|<img\b[^>]*?\bsrc=[\"']([^\"']+)[\"'][^>]*>", re.IGNORECASE)
+
+
+def image_urls(body: str) -> list:
+    urls = []
+    for m in IMAGE_RE.finditer(body):
+        url = m.group(1) or m.group(2)
+        if url not in urls:
+            urls.append(url)
+    return urls
+
+
+def load_image_bytes(url: str, session=None) -> bytes:
+    """站内图片读 source/ 下的文件，外部图片用 HTTP 下载"""
+    if url.startswith("/"):
+        with open(os.path.join(SOURCE_DIR, url.lstrip("/")), "rb") as f:
+            return f.read()
+    resp = session.get(url, timeout=TIMEOUT)
+    resp.raise_for_status()
+    return resp.content
+
+
+def dhash(data: bytes) -> int:
+    """差值哈希：缩放为 9x8 灰度图，比较相邻像素的明暗"""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as img:
+        # GIF 等多帧图片只取第一帧
+        small = img.convert("L").resize((9, 8), Image.LANCZOS)
+        pixels = small.tobytes()
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def hash_images(urls, cache: dict, workers: int) -> dict:
+    """计算未缓存图片的哈希并写入 cache；失败的图片不写入，下次运行重试"""
+    import requests
+
+    # 旧版本把失败记为 None，这里一并重试
+    missing = [u for u in urls if not cache.get(u)]
+    if not missing:
+        return cache
+    session = requests.Session()
+    session.headers["User-Agent"] = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    )
+
+    def work(url):
+        try:
+            return url, f"{dhash(load_image_bytes(url, session)):016x}"
+        except Exception as e:
+            print(f"[WARN] 无法计算图片哈希: {url}（{type(e).__name__}）")
+            return url, None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for url, value in pool.map(work, missing):
+            if value is None:
+                cache.pop(url, None)
+            else:
+                cache[url] = value
+    return cache
+
+
+def group_similar(hashes: dict, max_distance: int, priority: dict = None) -> list:
+    """按组代表归组，返回 [[url, ...], ...]，每组第一个地址是代表
+
+    图片按 priority（出现文章数）从高到低处理：与某个代表的汉明距离不超过 max_distance
+    时归入最近的那一组，否则自成一组并作为代表。只和代表比较，组内任意成员与代表的
+    距离都不超过阈值。候选代表通过分桶查找。
+    """
+    priority = priority or {}
+    urls = sorted((u for u, h in hashes.items() if h), key=lambda u: (-priority.get(u, 0), u))
+
+    bits = 64 // BANDS
+    mask = (1 << bits) - 1
+    buckets = {}
+    reps = []
+    groups = []
+    for url in urls:
+        value = int(hashes[url], 16)
+        keys = [(band, (value >> (band * bits)) & mask) for band in range(BANDS)]
+        candidates = {g for key in keys for g in buckets.get(key, ())}
+        best, best_distance = None, max_distance + 1
+        for g in sorted(candidates):
+            distance = bin(reps[g] ^ value).count("1")
+            if distance < best_distance:
+                best, best_distance = g, distance
+        if best is None:
+            best = len(reps)
+            reps.append(value)
+            groups.append([])
+            for key in keys:
+                buckets.setdefault(key, []).append(best)
+        groups[best].append(url)
+    return groups
+
+
+def find_promo_images(post_images: dict, hashes: dict, min_posts: int, max_distance: int) -> list:
+    """返回推广图片组 [{"hash", "posts", "urls"}]，按出现文章数降序"""
+    posts_by_url = {}
+    for file, urls in post_images.items():
+        for url in urls:
+            posts_by_url.setdefault(url, set()).add(file)
+
+    priority = {url: len(posts) for url, posts in posts_by_url.items()}
+    promo = []
+    for urls in group_similar(hashes, max_distance, priority):
+        posts = set().union(*(posts_by_url.get(u, set()) for u in urls))
+        if len(posts) >= min_posts:
+            promo.append({"hash": hashes[urls[0]], "posts": sorted(posts), "urls": sorted(urls)})
+    return sorted(promo, key=lambda g: -len(g["posts"]))
+
+
+def strip_images(body: str, urls: set) -> str:
+    """删除指定图片；整行只有这张图片时连同该行一起删除"""
+    def drop(m):
+        return "" if (m.group(1) or m.group(2)) in urls else m.group(0)
+
+    lines = []
+    for line in body.split("\n"):
+        new_line = IMAGE_RE.sub(drop, line)
+        if new_line != line and not new_line.strip():
+            continue
+        lines.append(new_line)
+    return "\n".join(lines)
+
+
+def load_cache() -> dict:
+    if os.path.exists(CACHE_FILE):
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_cache(cache: dict):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with open(CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
+
+
+def strip_files(paths, min_posts: int = MIN_POSTS, max_distance: int = MAX_DISTANCE, workers: int = WORKERS) -> list:
+    """删除指定文章中的推广图片（供导入脚本调用），返回实际改写的文件
+
+    推广图片仍按全部文章判定，但只为指定文章的图片下载/计算哈希，其余图片只用缓存里的
+    哈希（没缓存的不参与判定，完整扫描请运行本脚本）。只改写指定文章，不更新报告。
+    """
+    targets = {os.path.basename(p) for p in paths}
+    posts = load_posts()
+    post_images = {p["file"]: image_urls(p["body"]) for p in posts}
+    new_urls = sorted({u for f in targets for u in post_images.get(f, [])})
+    if not new_urls:
+        return []
+
+    cache = load_cache()
+    hash_images(new_urls, cache, workers)
+    save_cache(cache)
+
+    hashes = {u: cache.get(u) for urls in post_images.values() for u in urls}
+    promo = find_promo_images(post_images, hashes, min_posts, max_distance)
+    promo_urls = {u for g in promo for u in g["urls"]}
+    changed = []
+    for post in posts:
+        if post["file"] not in targets:
+            continue
+        body = strip_images(post["body"], promo_urls)
+        if body != post["body"]:
+            write_post(post["path"], join_front_matter(post["fm"] or "", body))
+            changed.append(post["path"])
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="检测并删除反复出现的推广图片")
+    parser.add_argument("--strip", action="store_true", help="从文章中删除推广图片")
+    parser.add_argument("--min-posts", type=int, default=MIN_POSTS, help="判定为推广图片的最少文章数")
+    parser.add_argument("--distance", type=int, default=MAX_DISTANCE, help="dHash 汉明距离阈值（不超过 BANDS-1 时保证找全）")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="并发下载数")
+    args = parser.parse_args()
+
+    try:
+        import PIL  # noqa: F401
+        import requests  # noqa: F401
+    except ImportError as e:
+        print(f"[ERROR] 缺少依赖（{e.name}）: pip install Pillow requests")
+        return 1
+
+    posts = load_posts()
+    if not posts:
+        print(f"[ERROR] 未找到文章: {POSTS_DIR}")
+        return 1
+
+    post_images = {p["file"]: image_urls(p["body"]) for p in posts}
+    all_urls = sorted({u for urls in post_images.values() for u in urls})
+    cache = load_cache()
+    cached_before = sum(1 for u in all_urls if u in cache)
+    print(f"[INFO] 文章 {len(posts)} 篇，图片 {len(all_urls)} 张，已缓存 {cached_before} 张")
+
+    hash_images(all_urls, cache, args.workers)
+    save_cache(cache)
+
+    hashes = {u: cache.get(u) for u in all_urls}
+    promo = find_promo_images(post_images, hashes, args.min_posts, args.distance)
+    for group in promo:
+        print(f"[PROMO] {group['hash']}: {len(group['posts'])} 篇文章，{len(group['urls'])} 个地址，例如 {group['urls'][0]}")
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with open(REPORT_FILE, "w", encoding="utf-8") as f:
+        json.dump(promo, f, ensure_ascii=False, indent=2)
+
+    changed = 0
+    if args.strip and promo:
+        promo_urls = {u for g in promo for u in g["urls"]}
+        for post in posts:
+            body = strip_images(post["body"], promo_urls)
+            if body != post["body"]:
+                write_post(post["path"], join_front_matter(post["fm"] or "", body))
+                changed += 1
+                print(f"[OK] {post['file']}")
+
+    print(f"\n[SUMMARY] images={len(all_urls)}, hashed={len(all_urls) - cached_before}, "
+          f"promo_groups={len(promo)}, stripped_posts={changed}")
+    print(f"[INFO] 报告已保存: {REPORT_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
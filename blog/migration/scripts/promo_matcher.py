@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+推广文案匹配器：替代逐条 re.search / re.sub 的 PROMO_*_PATTERNS 匹配，保证线性时间
+
+支持的写法是推广规则实际用到的子集：
+- 字面量（含 \\. 这类转义）、字符集 [，,]、分组 (识别|关注)
+- 片段之间用 .* 连接，如 近期.*文章[，,].*猜.*喜欢
+- 片段首尾的单字符重复 X+ / X{n,}（如 —+.*广告.*—+）
+其他正则语法在编译时直接报错，避免悄悄退回到会回溯的 re。
+
+匹配方式：
+1. 所有规则的字面量拼成一个 re 分支做预筛（没有 .*，不会回溯），
+   一个字面量都没出现的行直接跳过——绝大多数正文行到此为止
+2. 命中字面量的短行（不超过 RE_MAX_LINE 字）照常逐条 re.search / re.sub，
+   即使最坏情况回溯也有上限
+3. 长行改用 Aho-Corasick 自动机，每行只扫描一遍，得到所有字面量的出现位置；
+   每条规则按片段顺序贪心取"结束最早"的出现位置，判断能否依次匹配（二分查找）；
+   替换时的匹配范围与 re.sub 一致：起点取最左，终点取贪心 .* 的最右
+
+纯 Python 的自动机在普通正文上比 re 慢数倍，所以只用于 re 可能回溯失控的长行。
+
+大小写：与 re.IGNORECASE 一致，只对 ASCII 字母不区分大小写。
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from itertools import product
+
+
+# 不超过这个长度的行用 re 匹配：最坏情况（如"近期文章，猜"反复出现）约 1ms，
+# 再长回溯就会失控（500 字约 17ms，1000 字约 0.3s）
+RE_MAX_LINE = 200
+
+ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+class AhoCorasick:
+    """多个字面量的 Aho-Corasick 自动机"""
+
+    def __init__(self, words):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for word in words:
+            self._add(word)
+        self._build()
+
+    def _add(self, word: str):
+        state = 0
+        for ch in word:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        if word not in self.out[state]:
+            self.out[state].append(word)
+
+    def _build(self):
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find_all(self, text: str) -> dict:
+        """返回 字面量 -> 出现起点列表（升序）"""
+        found = {}
+        state = 0
+        goto, fail, out = self.goto, self.fail, self.out
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for word in out[state]:
+                found.setdefault(word, []).append(i - len(word) + 1)
+        return found
+
+
+def _parse_atoms(segment: str, pattern: str) -> list:
+    """把一个片段解析为原子列表，每个原子是 (可选字面量列表, 最少重复次数 或 None)"""
+    atoms = []
+    i = 0
+    while i < len(segment):
+        ch = segment[i]
+        if ch == "\\":
+            if i + 1 >= len(segment) or segment[i + 1].isalnum():
+                raise ValueError(f"不支持的转义: {pattern}")
+            alts, i = [segment[i + 1]], i + 2
+        elif ch == "[":
+            end = segment.find("]", i)
+            body = segment[i + 1:end]
+            if end == -1 or not body or "-" in body or "^" in body or "\\" in body:
+                raise ValueError(f"不支持的字符集: {pattern}")
+            alts, i = list(body), end + 1
+        elif ch == "(":
+            end = segment.find(")", i)
+            body = segment[i + 1:end]
+            if end == -1 or not body or any(c in body for c in "()[]\\.*+?{}"):
+                raise ValueError(f"不支持的分组: {pattern}")
+            alts, i = body.split("|"), end + 1
+        elif ch in ".*+?{}|^$)]":
+            raise ValueError(f"不支持的正则语法 {ch!r}: {pattern}")
+        else:
+            alts, i = [ch], i + 1
+
+        repeat = None
+        if i < len(segment) and segment[i] == "+":
+            repeat, i = 1, i + 1
+        elif i < len(segment) and segment[i] == "{":
+            m = re.match(r"\{(\d+),\}", segment[i:])
+            if not m:
+                raise ValueError(f"不支持的重复次数: {pattern}")
+            repeat, i = int(m.group(1)), i + m.end()
+        if repeat is not None and (len(alts) != 1 or len(alts[0]) != 1):
+            raise ValueError(f"只支持单个字符重复: {pattern}")
+        atoms.append((alts, repeat))
+    return atoms
+
+
+def _check_repeats(atoms: list, seg_idx: int, seg_count: int, pattern: str):
+    """X+ / X{n,} 只有紧挨着 .* 时才等价于重复最少次数的字面量
+
+    - 片段只有这一个原子，且规则不止一个片段
+    - 或位于片段开头且前面有 .*，或位于片段末尾且后面有 .*
+    其他位置会影响替换范围（贪心吞掉整段重复），编译时报错。
+    """
+    for idx, (_, repeat) in enumerate(atoms):
+        if repeat is None:
+            continue
+        if len(atoms) == 1:
+            ok = seg_count > 1
+        else:
+            ok = (idx == 0 and seg_idx > 0) or (idx == len(atoms) - 1 and seg_idx < seg_count - 1)
+        if not ok:
+            raise ValueError(f"重复只能紧挨着 .*: {pattern}")
+
+
+def compile_pattern(pattern: str) -> list:
+    """把规则编译为片段列表，每个片段是可选字面量列表（已转为 ASCII 小写，保持书写顺序）"""
+    parts = pattern.split(".*")
+    segments = []
+    for seg_idx, segment in enumerate(parts):
+        if not segment:
+            raise ValueError(f"不支持空片段: {pattern}")
+        atoms = _parse_atoms(segment, pattern)
+        _check_repeats(atoms, seg_idx, len(parts), pattern)
+        choices = [[alt * (repeat or 1) for alt in alts] for alts, repeat in atoms]
+        literals = ("".join(p).translate(ASCII_LOWER) for p in product(*choices))
+        segments.append(list(dict.fromkeys(literals)))
+    return segments
+
+
+class PromoMatcher:
+    """一组推广规则的线性时间匹配器"""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.compiled = [compile_pattern(p) for p in self.patterns]
+        self.regexes = [re.compile(p, re.IGNORECASE) for p in self.patterns]
+        words = sorted({w for segments in self.compiled for literals in segments for w in literals})
+        # 长的字面量在前，re 分支按顺序尝试；只判断有没有，不关心匹配到哪一个
+        self.prefilter = re.compile("|".join(re.escape(w) for w in sorted(words, key=len, reverse=True)),
+                                    re.IGNORECASE)
+        self.words = words
+        self._automaton = None
+
+    @property
+    def automaton(self) -> AhoCorasick:
+        """只有遇到长行时才构建"""
+        if self._automaton is None:
+            self._automaton = AhoCorasick(self.words)
+        return self._automaton
+
+    def _occurrences(self, line: str) -> dict:
+        return self.automaton.find_all(line.translate(ASCII_LOWER))
+
+    @staticmethod
+    def _first_end(found: dict, literals, start: int):
+        """片段在 start 之后最早结束的出现位置，返回 (起点, 终点) 或 None"""
+        best = None
+        for word in literals:
+            starts = found.get(word)
+            if not starts:
+                continue
+            k = bisect_left(starts, start)
+            if k < len(starts):
+                end = starts[k] + len(word)
+                if best is None or end < best[1]:
+                    best = (starts[k], end)
+        return best
+
+    @staticmethod
+    def _last_start(found: dict, literals, end: int):
+        """片段在 end 之前最晚开始的出现位置，返回 (起点, 终点) 或 None"""
+        best = None
+        for word in literals:
+            starts = found.get(word)
+            if not starts:
+                continue
+            k = bisect_right(starts, end - len(word)) - 1
+            if k >= 0 and (best is None or starts[k] > best[0]):
+                best = (starts[k], starts[k] + len(word))
+        return best
+
+    def _span(self, found: dict, segments, pos: int):
+        """规则在 pos 之后的匹配范围（与 re 的最左起点、贪心终点一致），无匹配返回 None"""
+        first = self._first_end(found, segments[0], pos)
+        if first is None:
+            return None
+        # 前向贪心：每个片段都取最早结束的位置，失败说明从任何起点都无法匹配
+        cursor = first[1]
+        for literals in segments[1:]:
+            hit = self._first_end(found, literals, cursor)
+            if hit is None:
+                return None
+            cursor = hit[1]
+        # 起点：能完成匹配的最左起点。first 一定能完成匹配，更靠左的候选只可能是
+        # 起点在它之前、终点在它之后的其他可选字面量，数量不超过字面量长度
+        start, start_word = first[0], None
+        for word in segments[0]:
+            starts = found.get(word, [])
+            for k in range(bisect_left(starts, pos), len(starts)):
+                s = starts[k]
+                if s > start or (s == start and start_word is not None):
+                    break
+                if self._matches_from(found, segments, s, word):
+                    start, start_word = s, word
+                    break
+        if start_word is None:
+            start_word = next(w for w in segments[0] if first[0] in found.get(w, ()) and
+                              first[0] + len(w) == first[1])
+        # 终点：.* 贪心，从右往左每个片段取最晚的出现位置
+        if len(segments) == 1:
+            return start, start + len(start_word)
+        end = None
+        limit = float("inf")
+        for literals in reversed(segments[1:]):
+            hit = self._last_start(found, literals, limit)
+            end = hit[1] if end is None else end
+            limit = hit[0]
+        return start, end
+
+    def _matches_from(self, found: dict, segments, start: int, word: str) -> bool:
+        cursor = start + len(word)
+        for literals in segments[1:]:
+            hit = self._first_end(found, literals, cursor)
+            if hit is None:
+                return False
+            cursor = hit[1]
+        return True
+
+    def search(self, line: str):
+        """返回第一条命中的规则；都不命中返回 None"""
+        if not self.prefilter.search(line):
+            return None
+        if len(line) <= RE_MAX_LINE:
+            return next((p for p, regex in zip(self.patterns, self.regexes) if regex.search(line)), None)
+        found = self._occurrences(line)
+        if not found:
+            return None
+        for pattern, segments in zip(self.patterns, self.compiled):
+            cursor = 0
+            for literals in segments:
+                hit = self._first_end(found, literals, cursor)
+                if hit is None:
+                    break
+                cursor = hit[1]
+            else:
+                return pattern
+        return None
+
+    def sub(self, line: str, repl: str = "") -> str:
+        """按规则顺序依次替换（等价于对每条规则执行 re.sub，repl 按原样插入）"""
+        if not self.prefilter.search(line):
+            return line
+        if len(line) <= RE_MAX_LINE:
+            for regex in self.regexes:
+                line = regex.sub(lambda m: repl, line)
+            return line
+        for segments in self.compiled:
+            found = self._occurrences(line)
+            if not found:
+                return line
+            out = []
+            pos = 0
+            while True:
+                span = self._span(found, segments, pos)
+                if span is None:
+                    break
+                out.append(line[pos:span[0]])
+                out.append(repl)
+                pos = span[1]
+            if out:
+                out.append(line[pos:])
+                line = "".join(out)
+        return line
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+预计算字数和阅读时长并写入 front-matter，站点构建时不必每次重新统计：
+- 字数：中文每个汉字计 1，英文/数字按单词计 1（图片、链接地址、HTML 标签不计）
+- 阅读时长（分钟）：中文 300 字/分钟，英文 160 词/分钟，向上取整，至少 1 分钟
+- 写入字段：wordcount / min2read（与 hexo-wordcount 的 helper 同名，
+  blog/scripts/precomputed-counts.js 优先读取这两个字段）
+- 结果按正文哈希缓存在 data/reading_stats_cache.json
+
+用法：
+    python scripts/reading_stats.py            # 回填 _posts 中所有文章
+    python scripts/reading_stats.py --dry-run
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import hashlib
+import argparse
+
+from post_index import BASE_DIR, POSTS_DIR, load_posts, markdown_to_text, set_field, join_front_matter
+from post_writer import write_post
+
+
+DATA_DIR = os.path.join(BASE_DIR, "data")
+CACHE_FILE = os.path.join(DATA_DIR, "reading_stats_cache.json")
+
+CJK_CHARS_PER_MINUTE = 300
+WORDS_PER_MINUTE = 160
+
+CJK_RE = re.compile(r"[㐀-䶿一-鿿豈-﫿]")
+WORD_RE = re.compile(r"[A-Za-z0-9]+(?:[.'’-][A-Za-z0-9]+)*")
+
+
+def compute_stats(body: str):
+    """返回 (字数, 阅读分钟数)"""
+    text = markdown_to_text(body)
+    cjk = len(CJK_RE.findall(text))
+    words = len(WORD_RE.findall(text))
+    minutes = max(1, math.ceil(cjk / CJK_CHARS_PER_MINUTE + words / WORDS_PER_MINUTE))
+    return cjk + words, minutes
+
+
+def body_hash(body: str) -> str:
+    return hashlib.sha1(body.encode("utf-8")).hexdigest()
+
+
+def load_cache() -> dict:
+    if os.path.exists(CACHE_FILE):
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_cache(cache: dict):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with open(CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
+
+
+def cached_stats(body: str, cache: dict):
+    key = body_hash(body)
+    if key not in cache:
+        cache[key] = list(compute_stats(body))
+    return tuple(cache[key])
+
+
+def apply_stats(fm: str, stats) -> str:
+    wordcount, minutes = stats
+    fm = set_field(fm, "wordcount", wordcount)
+    return set_field(fm, "min2read", minutes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="回填字数和阅读时长")
+    parser.add_argument("--dry-run", action="store_true", help="只打印结果，不写文件")
+    args = parser.parse_args()
+
+    posts = load_posts()
+    if not posts:
+        print(f"[ERROR] 未找到文章: {POSTS_DIR}")
+        return 1
+
+    cache = load_cache()
+    cached_before = len(cache)
+    changed = 0
+    for post in posts:
+        stats = cached_stats(post["body"], cache)
+        fm = apply_stats(post["fm"] or "", stats)
+        if fm == post["fm"]:
+            continue
+        changed += 1
+        print(f"[OK] {post['file']}: {stats[0]} 字 / {stats[1]} 分钟")
+        if not args.dry_run:
+            write_post(post["path"], join_front_matter(fm, post["body"]))
+    save_cache(cache)
+
+    print(f"\n[SUMMARY] posts={len(posts)}, changed={changed}, computed={len(cache) - cached_before}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,12 +11,16 @@ import os
 import json
 import re
 import time
+import argparse
 from pathlib import Path
 from datetime import datetime
 from html2text import HTML2Text
 import requests
 from bs4 import BeautifulSoup
 
+from promo_matcher import PromoMatcher
+from progress import Progress, add_progress_args, log
+
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 ARTICLES_LIST_FILE = os.path.join(DATA_DIR, "articles_list.json")
@@ -36,6 +40,7 @@ PROMO_TAIL_PATTERNS = [
     r"点击上方.*关注",
     r"长按.*二维码",
 ]
+PROMO_TAIL_MATCHER = PromoMatcher(PROMO_TAIL_PATTERNS)
 
 
 def normalize_title(title: str) -> str:
@@ -56,10 +61,8 @@ def clean_promo_tail(md: str) -> str:
         s = lines[idx].strip()
         if not s:
             continue
-        for pat in PROMO_TAIL_PATTERNS:
-            if re.search(pat, s, re.IGNORECASE):
-                cut_idx = idx
-                break
+        if PROMO_TAIL_MATCHER.search(s):
+            cut_idx = idx
         if cut_idx is not None:
             break
     if cut_idx is None:
@@ -100,7 +103,7 @@ def fetch_article_with_retry(url: str, max_retries=3, timeout=60):
     
     for attempt in range(1, max_retries + 1):
         try:
-            print(f"      尝试 {attempt}/{max_retries}...")
+            log("debug", f"      尝试 {attempt}/{max_retries}...")
             response = requests.get(
                 url, 
                 headers=headers, 
@@ -146,7 +149,7 @@ def fetch_article_with_retry(url: str, max_retries=3, timeout=60):
         except requests.exceptions.Timeout:
             if attempt < max_retries:
                 wait_time = attempt * 5
-                print(f"      超时，等待 {wait_time} 秒后重试...")
+                log("warn", f"      超时，等待 {wait_time} 秒后重试...")
                 time.sleep(wait_time)
                 continue
             return {"error": "请求超时"}
@@ -154,7 +157,7 @@ def fetch_article_with_retry(url: str, max_retries=3, timeout=60):
         except requests.exceptions.RequestException as e:
             if attempt < max_retries:
                 wait_time = attempt * 5
-                print(f"      连接错误: {str(e)[:50]}... 等待 {wait_time} 秒后重试...")
+                log("warn", f"      连接错误: {str(e)[:50]}... 等待 {wait_time} 秒后重试...")
                 time.sleep(wait_time)
                 continue
             return {"error": f"连接错误: {str(e)}"}
@@ -162,7 +165,7 @@ def fetch_article_with_retry(url: str, max_retries=3, timeout=60):
         except Exception as e:
             if attempt < max_retries:
                 wait_time = attempt * 5
-                print(f"      错误: {str(e)[:50]}... 等待 {wait_time} 秒后重试...")
+                log("warn", f"      错误: {str(e)[:50]}... 等待 {wait_time} 秒后重试...")
                 time.sleep(wait_time)
                 continue
             return {"error": str(e)}
@@ -209,6 +212,10 @@ def save_markdown(title: str, content: str, date_str: str, output_dir: str):
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="重试抓取失败的微信公众号文章")
+    add_progress_args(parser)
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("微信公众号文章重试抓取工具")
     print("=" * 60)
@@ -242,53 +249,57 @@ def main():
     success_count = 0
     failed_count = 0
     
-    for i, article in enumerate(to_retry, 1):
-        title = article.get("title", f"文章{i}")
-        url = article.get("url", "")
-        timestamp = article.get("timestamp")
-        
-        if not url:
-            print(f"[{i}/{len(to_retry)}] [SKIP] {title} - 无URL")
-            failed_count += 1
-            continue
-        
-        print(f"[{i}/{len(to_retry)}] 重试: {title}")
-        print(f"    URL: {url}")
-        
-        try:
-            # 使用重试机制抓取
-            content_data = fetch_article_with_retry(url, max_retries=3, timeout=60)
-            
-            if "error" in content_data:
-                error_msg = content_data["error"]
-                print(f"    [FAIL] {error_msg}")
-                failed_count += 1
-                # 延迟后继续
-                time.sleep(5)
-                continue
+    with Progress.from_args(args, total=len(to_retry), label="重试") as progress:
+        for i, article in enumerate(to_retry, 1):
+            title = article.get("title", f"文章{i}")
+            url = article.get("url", "")
+            timestamp = article.get("timestamp")
             
-            # 获取标题
-            final_title = content_data.get("title") or title
-            final_title = normalize_title(final_title)
-            
-            if not final_title:
-                print(f"    [FAIL] 无法提取标题")
+            if not url:
+                log("warn", f"[{i}/{len(to_retry)}] [SKIP] {title} - 无URL")
                 failed_count += 1
+                progress.advance("fail", title=title)
                 continue
             
-            # 转换为 Markdown
-            md_content = html_to_markdown(content_data["html"])
-            
-            # 清理引流链接
-            md_content = clean_promo_tail(md_content)
+            log("debug", f"[{i}/{len(to_retry)}] 重试: {title}")
+            log("debug", f"    URL: {url}")
             
-            # 生成 front-matter
-            if timestamp:
-                date_str = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                date_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            front_matter = f"""---
+            try:
+                # 使用重试机制抓取
+                content_data = fetch_article_with_retry(url, max_retries=3, timeout=60)
+                
+                if "error" in content_data:
+                    error_msg = content_data["error"]
+                    log("warn", f"    [FAIL] {title}: {error_msg}")
+                    failed_count += 1
+                    progress.advance("fail", title=title)
+                    # 延迟后继续
+                    time.sleep(5)
+                    continue
+                
+                # 获取标题
+                final_title = content_data.get("title") or title
+                final_title = normalize_title(final_title)
+                
+                if not final_title:
+                    log("warn", f"    [FAIL] {title}: 无法提取标题")
+                    failed_count += 1
+                    progress.advance("fail", title=title)
+                    continue
+                
+                # 转换为 Markdown
+                md_content = html_to_markdown(content_data["html"])
+                
+                # 清理引流链接
+                md_content = clean_promo_tail(md_content)
+                
+                # 生成 front-matter
+                if timestamp:
+                    date_str = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+                else:
+                    date_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                
+                front_matter = f"""---
 title: {final_title}
 date: {date_str}
 tags:
@@ -297,20 +308,22 @@ tags:
 
 {md_content}
 """
-            
-            # 保存文件
-            filepath = save_markdown(final_title, front_matter, date_str, OUTPUT_DIR)
-            print(f"    [OK] 已保存: {os.path.basename(filepath)}")
-            success_count += 1
-            
-            # 延迟，避免请求过快
-            time.sleep(5)
-            
-        except Exception as e:
-            print(f"    [ERROR] 处理失败: {str(e)}")
-            failed_count += 1
-            time.sleep(5)
-            continue
+                
+                # 保存文件
+                filepath = save_markdown(final_title, front_matter, date_str, OUTPUT_DIR)
+                log("info", f"    [OK] 已保存: {os.path.basename(filepath)}")
+                success_count += 1
+                progress.advance("ok", title=title)
+                
+                # 延迟，避免请求过快
+                time.sleep(5)
+                
+            except Exception as e:
+                log("error", f"    [ERROR] {title}: 处理失败: {str(e)}")
+                failed_count += 1
+                progress.advance("fail", title=title)
+                time.sleep(5)
+                continue
     
     print()
     print("=" * 60)
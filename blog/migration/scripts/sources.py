@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+抓取来源配置（migration/sources.json）：
+- 按公众号（__biz）列出要抓取的专辑（album_id），每个专辑是一个来源，名称为 <公众号>/<专辑>
+- 每个来源有自己的数据目录，默认 data/sources/<公众号>/<专辑>/，互不覆盖：
+    articles_list.json   专辑文章列表
+    wechatsync_md/       抓取并转换后的 Markdown（导入的输入）
+    fetched.json         已抓取的文章链接 -> 输出文件名
+- 专辑可以用 data_dir（相对 migration/）指定数据目录，原有的单专辑数据仍在 data/ 下
+- 顶层 concurrency / per_source / delay：全局并发预算、单个来源的并发上限、
+  同一来源两次请求的最小间隔（秒），由 ingest_sources.py 使用
+
+用法：
+    python scripts/sources.py          # 列出配置的来源及数据目录
+"""
+
+import os
+import sys
+import json
+
+from post_index import BASE_DIR
+
+
+SOURCES_FILE = os.path.join(BASE_DIR, "sources.json")
+SOURCES_DATA_DIR = os.path.join(BASE_DIR, "data", "sources")
+ALBUM_URL_TEMPLATE = "https://mp.weixin.qq.com/mp/appmsgalbum?action=getalbum&album_id={album_id}&__biz={biz}#wechat_redirect"
+
+DEFAULT_SETTINGS = {"concurrency": 4, "per_source": 2, "delay": 2.0}
+
+
+def album_url(biz: str, album_id: str) -> str:
+    return ALBUM_URL_TEMPLATE.format(album_id=album_id, biz=biz)
+
+
+class Source:
+    """一个公众号下的一个专辑，以及它的数据目录"""
+
+    def __init__(self, account: str, biz: str, album: str, album_id: str, tag: str = None, data_dir: str = None):
+        self.account = account
+        self.biz = biz
+        self.album = album
+        self.album_id = str(album_id)
+        self.name = f"{account}/{album}"
+        self.tag = tag or album
+        if data_dir:
+            self.data_dir = os.path.normpath(os.path.join(BASE_DIR, data_dir))
+        else:
+            self.data_dir = os.path.join(SOURCES_DATA_DIR, account, album)
+        self.articles_list_file = os.path.join(self.data_dir, "articles_list.json")
+        self.md_dir = os.path.join(self.data_dir, "wechatsync_md")
+        self.fetched_file = os.path.join(self.data_dir, "fetched.json")
+
+    @property
+    def album_url(self) -> str:
+        return album_url(self.biz, self.album_id)
+
+    def load_articles(self) -> list:
+        if not os.path.exists(self.articles_list_file):
+            return []
+        with open(self.articles_list_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_articles(self, articles: list):
+        os.makedirs(self.data_dir, exist_ok=True)
+        with open(self.articles_list_file, "w", encoding="utf-8") as f:
+            json.dump(articles, f, ensure_ascii=False, indent=2)
+
+    def load_fetched(self) -> dict:
+        if not os.path.exists(self.fetched_file):
+            return {}
+        with open(self.fetched_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_fetched(self, fetched: dict):
+        os.makedirs(self.data_dir, exist_ok=True)
+        with open(self.fetched_file, "w", encoding="utf-8") as f:
+            json.dump(fetched, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    def __repr__(self):
+        return f"Source({self.name!r})"
+
+
+def load_config(path: str = SOURCES_FILE) -> dict:
+    """读取配置；返回 {"settings": {...}, "sources": [Source, ...]}，格式错误时抛出 ValueError"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    settings = {key: data.get(key, default) for key, default in DEFAULT_SETTINGS.items()}
+    sources = []
+    seen = set()
+    for account in data.get("accounts", []):
+        if not account.get("name") or not account.get("biz"):
+            raise ValueError(f"公众号配置缺少 name/biz: {account}")
+        for album in account.get("albums", []):
+            if not album.get("album_id"):
+                raise ValueError(f"专辑配置缺少 album_id: {account['name']} {album}")
+            source = Source(account["name"], account["biz"], album.get("name") or str(album["album_id"]),
+                            album["album_id"], album.get("tag"), album.get("data_dir"))
+            if source.name in seen:
+                raise ValueError(f"来源名称重复: {source.name}")
+            seen.add(source.name)
+            sources.append(source)
+    if not sources:
+        raise ValueError(f"没有配置任何专辑: {path}")
+    return {"settings": settings, "sources": sources}
+
+
+def select_sources(sources: list, names=None) -> list:
+    """按名称筛选来源；名称可以是 <公众号>/<专辑> 或公众号名（选中其下全部专辑）"""
+    if not names:
+        return list(sources)
+    selected = []
+    for name in names:
+        matched = [s for s in sources if name in (s.name, s.account)]
+        if not matched:
+            raise ValueError(f"未知来源: {name}（可选: {', '.join(s.name for s in sources)}）")
+        selected += [s for s in matched if s not in selected]
+    return selected
+
+
+def load_source(name: str = None, path: str = SOURCES_FILE) -> Source:
+    """取一个来源；不指定名称时返回配置中的第一个专辑（单专辑脚本的默认来源）"""
+    sources = load_config(path)["sources"]
+    if name is None:
+        return sources[0]
+    matched = select_sources(sources, [name])
+    if len(matched) > 1:
+        raise ValueError(f"{name} 下有多个专辑，请指定 <公众号>/<专辑>: {', '.join(s.name for s in matched)}")
+    return matched[0]
+
+
+def main():
+    try:
+        config = load_config()
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] 读取来源配置失败: {e}")
+        return 1
+    settings = config["settings"]
+    print(f"并发预算 {settings['concurrency']}，单来源上限 {settings['per_source']}，请求间隔 {settings['delay']}s\n")
+    for source in config["sources"]:
+        print(f"{source.name}  [{source.tag}]")
+        print(f"  {source.album_url}")
+        print(f"  {os.path.relpath(source.data_dir, BASE_DIR)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+监听 Wechatsync 导出目录，文章一落地就自动导入 Hexo：
+- 监听目录：migration/data/wechatsync_md/*.md
+- 优先使用 watchdog（Linux 下即 inotify），未安装时退化为轮询
+- 同一文件的连续写入做去抖，只清理/导入新增或变更的文件
+- _posts 标题索引常驻内存，事件之间不再全量扫描
+- articles_list.json 变更时自动重新加载日期映射
+- 文章落地后立即写入 _posts；自动标签、图片尺寸、目录页等导入后处理不在事件路径上，
+  攒到导入静默 --settle 秒后对这段时间写入的文章统一处理一次（退出时也会补做）
+- 自动标签模型（auto_tags.get_model）在进程内复用，每批导入后失效，
+  下次有文章未命中标签缓存时用新语料重新拟合
+
+用法：
+    python scripts/watch_wechatsync_md.py
+    python scripts/watch_wechatsync_md.py --poll          # 强制使用轮询
+    python scripts/watch_wechatsync_md.py --debounce 0.5
+    python scripts/watch_wechatsync_md.py --settle 10     # 导入静默 10 秒后再做导入后处理
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+from pathlib import Path
+
+from import_wechatsync_md import (
+    IN_DIR,
+    POSTS_DIR,
+    ARTICLES_LIST_FILE,
+    load_article_dates,
+    load_link_index,
+    get_existing_titles,
+    import_file,
+    finish_import,
+    invalidate_tag_model,
+)
+from post_writer import PostWriter
+
+
+# 去抖时间：文件最后一次变更后静默这么久才处理（秒）
+DEBOUNCE_SECONDS = 0.3
+# 轮询模式下的扫描间隔（秒）
+POLL_INTERVAL = 0.3
+# 导入后处理的静默时间：最后一次导入后这么久没有新导入，才统一做一次（秒）
+SETTLE_SECONDS = 5.0
+
+
+class PendingFiles:
+    """记录待处理文件及其最后一次变更时间（监听线程与主循环共享）"""
+
+    def __init__(self, debounce: float):
+        self.debounce = debounce
+        self._lock = threading.Lock()
+        self._last_seen = {}
+
+    def touch(self, path):
+        if not str(path).endswith(".md"):
+            return
+        with self._lock:
+            self._last_seen[Path(path)] = time.monotonic()
+
+    def waiting(self) -> bool:
+        with self._lock:
+            return bool(self._last_seen)
+
+    def pop_ready(self):
+        """取出已静默超过去抖时间的文件"""
+        now = time.monotonic()
+        ready = []
+        with self._lock:
+            for path, seen in list(self._last_seen.items()):
+                if now - seen >= self.debounce:
+                    ready.append(path)
+                    del self._last_seen[path]
+        return sorted(ready)
+
+
+def start_native_watcher(pending: PendingFiles):
+    """启动 watchdog 监听；未安装 watchdog 时返回 None"""
+    try:
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+    except ImportError:
+        return None
+
+    class Handler(FileSystemEventHandler):
+        def on_created(self, event):
+            if not event.is_directory:
+                pending.touch(event.src_path)
+
+        def on_modified(self, event):
+            if not event.is_directory:
+                pending.touch(event.src_path)
+
+        def on_moved(self, event):
+            # Wechatsync/浏览器下载通常先写临时文件再改名
+            if not event.is_directory:
+                pending.touch(event.dest_path)
+
+    observer = Observer()
+    observer.schedule(Handler(), IN_DIR, recursive=False)
+    observer.daemon = True
+    observer.start()
+    return observer
+
+
+def snapshot_dir(path: str) -> dict:
+    """目录快照：文件名 -> (mtime_ns, size)，只做一次 scandir"""
+    snap = {}
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.endswith(".md"):
+                st = entry.stat()
+                snap[entry.name] = (st.st_mtime_ns, st.st_size)
+    return snap
+
+
+def poll_changes(pending: PendingFiles, prev: dict) -> dict:
+    """对比前后两次快照，把新增/变更的文件放入待处理队列"""
+    cur = snapshot_dir(IN_DIR)
+    for name, sig in cur.items():
+        if prev.get(name) != sig:
+            pending.touch(os.path.join(IN_DIR, name))
+    return cur
+
+
+class ImportWatcher:
+    """常驻的导入状态：日期映射、站内链接索引、标题索引、本次会话已导入的文件"""
+
+    def __init__(self):
+        self.date_map = None
+        self.link_index = None
+        # 初值不可能是真实的 mtime（文件不存在时为 None），保证第一次 reload_dates() 一定加载
+        self.date_map_mtime = -1
+        self.existing_titles = get_existing_titles()
+        # 源文件 -> 导入后的文章路径；源文件再次修改时原地覆盖
+        self.imported = {}
+        # 已写入 _posts、还没做导入后处理的文章，以及最后一次写入的时间
+        self.unfinished = []
+        self.last_import = 0.0
+        self.reload_dates()
+
+    def reload_dates(self):
+        try:
+            mtime = os.stat(ARTICLES_LIST_FILE).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime != self.date_map_mtime:
+            self.date_map = load_article_dates()
+            self.link_index = load_link_index()
+            self.date_map_mtime = mtime
+
+    def process(self, paths):
+        self.reload_dates()
+        # 每批事件读一次 _posts 目录，整批结束后更新一次清单
+        writer = PostWriter(POSTS_DIR)
+        for fp in paths:
+            if not fp.exists():
+                continue
+            started = time.perf_counter()
+            try:
+                out_path = self.imported.get(fp)
+                if out_path is not None and not out_path.exists():
+                    out_path = None
+                _, out_path = import_file(
+                    fp, self.date_map, self.existing_titles, out_path=out_path, link_index=self.link_index,
+                    writer=writer,
+                )
+            except Exception as e:
+                print(f"[ERROR] {fp.name}: {e}")
+                continue
+            if out_path is not None:
+                self.imported[fp] = out_path
+                print(f"    耗时 {(time.perf_counter() - started) * 1000:.1f} ms")
+        writer.commit()
+        # 内容没变的文章不改写，后续步骤只处理实际改写的文章
+        for path in writer.changed:
+            if path not in self.unfinished:
+                self.unfinished.append(path)
+        if writer.changed:
+            self.last_import = time.monotonic()
+            # 新文章要进入标签模型的语料，下次自动标签时重新拟合
+            invalidate_tag_model()
+
+    def finish_settled(self, settle: float):
+        """最后一次导入后已静默 settle 秒时，对积攒的文章统一做导入后处理"""
+        if not self.unfinished or time.monotonic() - self.last_import < settle:
+            return
+        paths, self.unfinished = self.unfinished, []
+        started = time.perf_counter()
+        try:
+            finish_import(paths)
+        except Exception as e:
+            # 清单里没有记录处理结果，这些文章下次导入时会重新处理
+            print(f"[ERROR] 导入后处理失败: {e}")
+            return
+        print(f"[INFO] 导入后处理 {len(paths)} 篇，耗时 {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="监听 Wechatsync 导出目录并自动导入")
+    parser.add_argument("--poll", action="store_true", help="强制使用轮询模式")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS, help="去抖时间（秒）")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="轮询间隔（秒）")
+    parser.add_argument("--settle", type=float, default=SETTLE_SECONDS,
+                        help="导入静默多久后做导入后处理（秒）")
+    args = parser.parse_args()
+
+    os.makedirs(IN_DIR, exist_ok=True)
+    os.makedirs(POSTS_DIR, exist_ok=True)
+
+    watcher = ImportWatcher()
+    pending = PendingFiles(args.debounce)
+
+    observer = None if args.poll else start_native_watcher(pending)
+    snapshot = snapshot_dir(IN_DIR)
+    if observer is None:
+        mode = "轮询"
+        if not args.poll:
+            print("[INFO] 未安装 watchdog，使用轮询模式（pip install watchdog 可启用原生监听）")
+    else:
+        mode = "watchdog"
+
+    print(f"[INFO] 监听目录: {IN_DIR}（{mode}模式，已有标题 {len(watcher.existing_titles)} 个）")
+    print("[INFO] 按 Ctrl+C 退出")
+
+    try:
+        while True:
+            if observer is None:
+                snapshot = poll_changes(pending, snapshot)
+            ready = pending.pop_ready()
+            if ready:
+                watcher.process(ready)
+            elif not pending.waiting():
+                watcher.finish_settled(args.settle)
+            time.sleep(args.interval if observer is None else 0.05)
+    except KeyboardInterrupt:
+        print("\n[INFO] 已停止监听")
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+        watcher.finish_settled(0)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""asset_index：各种写法的站内图片引用都要识别，--delete 不能删掉仍被引用的图片"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from asset_index import AssetIndex, asset_pattern, unreferenced_assets  # noqa: E402
+
+SITE_RE = asset_pattern("dadongshangu.github.io")
+
+
+def refs(text):
+    return SITE_RE.findall(text)
+
+
+class AssetRefsTest(unittest.TestCase):
+    def test_root_relative(self):
+        self.assertEqual(refs("![a](/images/a.png)"), ["a.png"])
+
+    def test_site_absolute(self):
+        self.assertEqual(refs("![a](https://dadongshangu.github.io/images/a.png)"), ["a.png"])
+        self.assertEqual(refs("![a](http://dadongshangu.github.io/images/a.png)"), ["a.png"])
+
+    def test_protocol_relative(self):
+        self.assertEqual(refs('<img src="//dadongshangu.github.io/images/a.png">'), ["a.png"])
+
+    def test_relative(self):
+        self.assertEqual(refs("![a](images/a.png)"), ["a.png"])
+        self.assertEqual(refs("![a](./images/a.png)"), ["a.png"])
+
+    def test_parent_relative(self):
+        self.assertEqual(refs("![a](../images/a.png)"), ["a.png"])
+        self.assertEqual(refs("![a](../../images/a.png)"), ["a.png"])
+
+    def test_query_and_fragment_are_dropped(self):
+        self.assertEqual(refs("![a](/images/a.png?v=2) ![b](/images/b.png#top)"), ["a.png", "b.png"])
+
+    def test_other_hosts_and_nested_paths_are_ignored(self):
+        text = "![a](https://mmbiz.qpic.cn/images/a.png) ![b](https://example.com/images/b.png) foo/images/c.png"
+        self.assertEqual(refs(text), [])
+
+
+class UnreferencedAssetsTest(unittest.TestCase):
+    def test_delete_keeps_images_referenced_in_any_form(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            posts_dir, images_dir = Path(tmp, "_posts"), Path(tmp, "images")
+            posts_dir.mkdir()
+            images_dir.mkdir()
+            forms = {
+                "root.png": "/images/root.png",
+                "site.png": "https://dadongshangu.github.io/images/site.png",
+                "rel.png": "images/rel.png",
+                "parent.png": "../images/parent.png",
+            }
+            for name in list(forms) + ["orphan.png"]:
+                (images_dir / name).write_bytes(b"")
+            body = "\n".join(f"![{name}]({url})" for name, url in forms.items())
+            (posts_dir / "post.md").write_text(f"---\ntitle: t\n---\n\n{body}\n", encoding="utf-8")
+
+            import asset_index
+            original = asset_index.ASSET_RE
+            asset_index.ASSET_RE = SITE_RE
+            try:
+                index = AssetIndex(os.path.join(tmp, "asset_index.json"))
+                index.sync(str(posts_dir))
+                self.assertEqual(unreferenced_assets(index, str(images_dir)), ["orphan.png"])
+            finally:
+                asset_index.ASSET_RE = original
+
+
+if __name__ == "__main__":
+    unittest.main()
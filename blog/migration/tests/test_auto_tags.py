@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""auto_tags：缓存命中时不拟合模型，导入新文章后模型失效"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+try:
+    import auto_tags
+except ImportError:  # numpy/scipy 为可选依赖
+    auto_tags = None
+
+
+def post(title, body):
+    return {"title": title, "body": body}
+
+
+CORPUS = [
+    post("孩子上幼儿园", "孩子第一天去幼儿园，家长比孩子还紧张。"),
+    post("老家的童年", "小时候在老家村子里的童年，故乡的河。"),
+    post("FPGA 时序", "verilog 里 valid ready 握手和打拍，时序收敛。"),
+]
+
+
+@unittest.skipIf(auto_tags is None, "需要 numpy/scipy")
+class ClassifyPostsTest(unittest.TestCase):
+    def fit(self):
+        self.fits += 1
+        return auto_tags.TagModel(CORPUS)
+
+    def setUp(self):
+        self.fits = 0
+
+    def test_cache_hits_skip_fitting(self):
+        cache = {"signature": auto_tags.model_signature(), "entries": {}}
+        first = auto_tags.classify_posts(CORPUS, cache, fit=self.fit)
+        self.assertEqual(self.fits, 1)
+        self.assertEqual(first[0]["tags"][0], "育儿")
+
+        again = auto_tags.classify_posts(CORPUS, cache, fit=self.fit)
+        self.assertEqual(self.fits, 1)
+        self.assertEqual(again, first)
+
+    def test_new_post_does_not_invalidate_cached_entries(self):
+        cache = {"signature": auto_tags.model_signature(), "entries": {}}
+        auto_tags.classify_posts(CORPUS, cache, fit=self.fit)
+        cached = dict(cache["entries"])
+        auto_tags.classify_posts(CORPUS + [post("新文章", "公司加班，同事和老板。")], cache, fit=self.fit)
+        self.assertEqual(self.fits, 2)
+        for key, entry in cached.items():
+            self.assertEqual(cache["entries"][key], entry)
+
+    def test_invalidate_model_refits(self):
+        original = auto_tags.load_posts
+        auto_tags.load_posts = lambda: list(CORPUS)
+        try:
+            auto_tags.invalidate_model()
+            model = auto_tags.get_model()
+            self.assertIs(auto_tags.get_model(), model)
+            auto_tags.invalidate_model()
+            self.assertIsNot(auto_tags.get_model(), model)
+        finally:
+            auto_tags.load_posts = original
+            auto_tags.invalidate_model()
+
+
+if __name__ == "__main__":
+    unittest.main()
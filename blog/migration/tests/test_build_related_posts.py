@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""build_related_posts：未安装 numpy/scipy 时跳过相关文章，不让站点生成失败"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+
+# 在子进程里让 scipy 无法导入，再运行脚本的 main()
+RUN_WITHOUT_SCIPY = """
+import sys
+sys.modules["scipy"] = None
+import build_related_posts
+build_related_posts.OUTPUT_FILE = None  # 如果试图写文件会直接报错
+sys.argv = ["build_related_posts.py"]
+sys.exit(build_related_posts.main())
+"""
+
+
+class MissingDependencyTest(unittest.TestCase):
+    def test_skips_with_warning_when_scipy_is_missing(self):
+        result = subprocess.run([sys.executable, "-c", RUN_WITHOUT_SCIPY], cwd=SCRIPTS_DIR,
+                                capture_output=True, text=True, encoding="utf-8")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("[WARN] 未安装 scipy", result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
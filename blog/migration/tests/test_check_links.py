@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""check_links.LinkChecker 的限流顺序：单个繁忙域名不能占满全局并发"""
+
+import os
+import sys
+import asyncio
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from check_links import LinkChecker  # noqa: E402
+
+
+class FakeChecker(LinkChecker):
+    """不发网络请求：每个请求耗时固定，按完成顺序记录 URL"""
+
+    def __init__(self, concurrency, per_host, delay=0.01):
+        super().__init__(None, concurrency, per_host)
+        self.delay = delay
+        self.finished = []
+
+    async def request(self, method, url):
+        await asyncio.sleep(self.delay)
+        self.finished.append(url)
+        return 200, url, ""
+
+
+class HostFairnessTest(unittest.TestCase):
+    def test_busy_host_does_not_starve_other_hosts(self):
+        # 排序后同一域名的链接连在一起，繁忙域名排在前面
+        busy = [f"https://mmbiz.qpic.cn/img/{i:02d}.jpg" for i in range(20)]
+        others = [f"https://host{i}.example.com/page" for i in range(3)]
+        urls = sorted(busy + others, key=lambda u: "0" if "qpic" in u else u)
+
+        async def run():
+            checker = FakeChecker(concurrency=4, per_host=1)
+            entries = await asyncio.gather(*(checker.check(u) for u in urls))
+            return checker, entries
+
+        checker, entries = asyncio.run(run())
+        self.assertTrue(all(e["ok"] for e in entries))
+        # 其他域名应该和繁忙域名的第一个请求同时进行，而不是等它的 20 个请求排完
+        positions = [checker.finished.index(u) for u in others]
+        self.assertLess(max(positions), len(others) + 2, checker.finished)
+
+    def test_global_limit_still_applies(self):
+        urls = [f"https://host{i}.example.com/" for i in range(10)]
+        running = 0
+        peak = 0
+
+        class CountingChecker(FakeChecker):
+            async def request(self, method, url):
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(self.delay)
+                running -= 1
+                return 200, url, ""
+
+        async def run():
+            checker = CountingChecker(concurrency=3, per_host=2)
+            await asyncio.gather(*(checker.check(u) for u in urls))
+
+        asyncio.run(run())
+        self.assertEqual(peak, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""extract_links.incremental_sync：接口返回顺序不是从新到旧时不能提前停止"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+import extract_links  # noqa: E402
+
+
+def item(msgid, ts):
+    return {
+        "msgid": str(msgid),
+        "itemidx": "1",
+        "create_time": str(ts),
+        "title": f"文章{msgid}",
+        "url": f"http://mp.weixin.qq.com/s?__biz=X&mid={msgid}&idx=1#rd",
+    }
+
+
+def known(msgid, ts):
+    return {"title": f"文章{msgid}", "url": f"https://mp.weixin.qq.com/s?__biz=X&mid={msgid}&idx=1", "timestamp": ts}
+
+
+class FakeAlbum:
+    """按 begin_msgid 分页返回固定的文章顺序，记录请求次数"""
+
+    def __init__(self, items, page_size=3):
+        self.items = items
+        self.page_size = page_size
+        self.calls = 0
+
+    def __call__(self, session, biz, album_id, begin_msgid=None, begin_itemidx=None):
+        self.calls += 1
+        start = 0
+        if begin_msgid:
+            start = next(i for i, it in enumerate(self.items) if it["msgid"] == str(begin_msgid)) + 1
+        page = self.items[start:start + self.page_size]
+        return page, start + self.page_size < len(self.items)
+
+
+class IncrementalSyncTest(unittest.TestCase):
+    ARTICLES = [known(i, 1000 + i) for i in range(1, 8)]
+
+    def run_sync(self, album):
+        original = extract_links.fetch_album_json
+        extract_links.fetch_album_json = album
+        try:
+            return extract_links.incremental_sync(self.ARTICLES, "X", "1")
+        finally:
+            extract_links.fetch_album_json = original
+
+    def test_newest_first_stops_at_first_known_article(self):
+        album = FakeAlbum([item(i, 1000 + i) for i in range(9, 0, -1)])
+        new, requests_made = self.run_sync(album)
+        self.assertEqual([a["msgid"] for a in new], ["9", "8"])
+        self.assertEqual(requests_made, 1)
+
+    def test_oldest_first_pages_through_and_finds_new_articles(self):
+        album = FakeAlbum([item(i, 1000 + i) for i in range(1, 10)])
+        new, requests_made = self.run_sync(album)
+        self.assertEqual(sorted(a["msgid"] for a in new), ["8", "9"])
+        self.assertEqual(requests_made, 3)
+
+    def test_request_asks_for_newest_first(self):
+        captured = {}
+
+        class Response:
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return {"getalbum_resp": {"article_list": [], "continue_flag": "0"}}
+
+        class Session:
+            def get(self, url, params, timeout):
+                captured.update(params)
+                return Response()
+
+        extract_links.fetch_album_json(Session(), "X", "1")
+        self.assertEqual(captured["is_reverse"], extract_links.ALBUM_ORDER_NEWEST_FIRST)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""fetch_queue.JobQueue 的租约：过期租约重新领取时同样受 MAX_ATTEMPTS 限制；
+主进程按队列结果汇报进度"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from fetch_queue import JobQueue, ResultReporter, MAX_ATTEMPTS  # noqa: E402
+from progress import Progress  # noqa: E402
+
+
+class LeaseExpiryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.queue = JobQueue(os.path.join(self.tmp.name, "queue.sqlite3"))
+        self.queue.enqueue([{"url": "https://mp.weixin.qq.com/s/a", "title": "a", "timestamp": 1}])
+
+    def tearDown(self):
+        self.queue.close()
+        self.tmp.cleanup()
+
+    def lease_and_crash(self):
+        """领取后不 complete/fail，模拟 worker 崩溃；租约立即过期"""
+        return self.queue.lease("crashed-worker", lease_seconds=-1)
+
+    def test_expired_lease_is_retried_until_max_attempts(self):
+        attempts = []
+        while True:
+            job = self.lease_and_crash()
+            if job is None:
+                break
+            attempts.append(job["attempts"])
+        self.assertEqual(attempts, list(range(1, MAX_ATTEMPTS + 1)))
+
+        row = self.queue.conn.execute("SELECT status, error_class FROM jobs").fetchone()
+        self.assertEqual((row["status"], row["error_class"]), ("failed", "lease"))
+        self.assertFalse(self.queue.has_work())
+
+    def test_retry_resets_lease_failures(self):
+        while self.lease_and_crash() is not None:
+            pass
+        self.assertEqual(self.queue.retry_failed(), 1)
+        self.assertEqual(self.lease_and_crash()["attempts"], 1)
+
+
+class ResultReporterTest(unittest.TestCase):
+    def test_each_result_is_reported_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            queue = JobQueue(os.path.join(tmp, "queue.sqlite3"))
+            queue.enqueue([{"url": f"https://mp.weixin.qq.com/s/{c}", "title": c, "timestamp": 1} for c in "abc"])
+            with Progress(3, stream=io.StringIO()) as progress:
+                reporter = ResultReporter(queue, progress)
+                a, b, c = (queue.lease("w") for _ in range(3))
+                queue.complete(a["url"], "w", "/tmp/a.md")
+                queue.fail(b["url"], "w", b["attempts"], "未找到文章内容")
+                queue.fail(c["url"], "w", c["attempts"], "timeout")
+                reporter.poll()
+                reporter.poll()
+                self.assertEqual(progress.counts, {"ok": 1, "fail": 1})
+
+                # 超时的任务重试成功后再计入
+                queue.conn.execute("UPDATE jobs SET next_eligible = 0")
+                c = queue.lease("w")
+                queue.complete(c["url"], "w", "/tmp/c.md")
+                reporter.poll()
+                self.assertEqual(progress.counts, {"ok": 2, "fail": 1})
+            queue.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
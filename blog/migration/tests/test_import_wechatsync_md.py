@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""import_wechatsync_md 正文清理：站内互链改写后只去掉对应不上的微信链接，
+末尾推广的判断不会从互链处截断正文；标题模糊匹配不会把短标题当成前缀命中"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from import_wechatsync_md import TitleDateIndex, clean_body, clean_wechat_links  # noqa: E402
+
+
+class FakeLinkIndex:
+    """只认识 /s/known 这一篇"""
+
+    def resolve(self, url, text=None):
+        return "/2020/01/01/known/" if url.endswith("/s/known") else None
+
+
+class CleanWechatLinksTest(unittest.TestCase):
+    def test_mixed_line_keeps_resolved_link(self):
+        text = ("推荐：[已迁移](https://mp.weixin.qq.com/s/known) 和 "
+                "[未迁移](https://mp.weixin.qq.com/s/other)，另见 https://mp.weixin.qq.com/s/bare")
+        cleaned = clean_wechat_links(text, FakeLinkIndex())
+        self.assertIn("[已迁移](/2020/01/01/known/)", cleaned)
+        self.assertIn("未迁移", cleaned)
+        self.assertNotIn("mp.weixin.qq.com", cleaned)
+
+    def test_line_with_only_unresolved_links_is_dropped(self):
+        text = "正文\n往期：[未迁移](https://mp.weixin.qq.com/s/other)\n结尾"
+        self.assertEqual(clean_wechat_links(text, FakeLinkIndex()), "正文\n结尾")
+
+    def test_without_index_wechat_lines_are_dropped(self):
+        text = "正文\n[已迁移](https://mp.weixin.qq.com/s/known)\n结尾"
+        self.assertEqual(clean_wechat_links(text), "正文\n结尾")
+
+
+class CleanBodyTest(unittest.TestCase):
+    BODY = "\n\n".join([
+        "第一段。",
+        "之前写过[已迁移](https://mp.weixin.qq.com/s/known)，这里接着说。",
+        "第二段。",
+        "第三段。",
+        "* * *",
+        "感谢关注公众号，近期原创文章推荐：",
+        "[未迁移](https://mp.weixin.qq.com/s/other)",
+    ])
+
+    def test_cross_post_link_does_not_truncate_body(self):
+        cleaned = clean_body(self.BODY, FakeLinkIndex())
+        self.assertIn("[已迁移](/2020/01/01/known/)", cleaned)
+        self.assertTrue(cleaned.endswith("第三段。"), cleaned)
+
+    def test_unresolved_links_are_still_removed(self):
+        cleaned = clean_body(self.BODY)
+        self.assertNotIn("mp.weixin.qq.com", cleaned)
+        self.assertTrue(cleaned.endswith("第三段。"), cleaned)
+
+
+class TitleDateIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = TitleDateIndex()
+        self.index.add("念四哥", 1000)
+        self.index.add("那些年我们一起读过的武侠小说", 2000)
+
+    def test_short_title_is_not_a_prefix_match(self):
+        self.assertIsNone(self.index.lookup("念四哥（转载）"))
+
+    def test_title_with_short_suffix_matches(self):
+        hit = self.index.lookup("那些年我们一起读过的武侠小说（转载）")
+        self.assertIsNotNone(hit)
+        self.assertEqual(hit[0], 2000)
+
+
+if __name__ == "__main__":
+    unittest.main()
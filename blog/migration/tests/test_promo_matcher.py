@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""PromoMatcher 的短行（re）和长行（自动机）两条路径都与逐条 re.search / re.sub 一致"""
+
+import os
+import re
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from promo_matcher import RE_MAX_LINE, PromoMatcher  # noqa: E402
+
+PATTERNS = [r"近期.*文章[，,].*猜.*喜欢", r"感谢.*(关注|转发)", r"—+.*广告.*—+", r"扫码\.二维码"]
+
+
+def regex_search(line):
+    return next((p for p in PATTERNS if re.search(p, line, re.IGNORECASE)), None)
+
+
+def regex_sub(line):
+    for p in PATTERNS:
+        line = re.sub(p, "", line, flags=re.IGNORECASE)
+    return line
+
+
+class PromoMatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.matcher = PromoMatcher(PATTERNS)
+        self.alphabet = list("的了，,—.ab ") + ["近期", "文章", "猜", "喜欢", "感谢", "关注", "转发", "广告", "扫码", "二维码"]
+
+    def random_line(self, rng, min_len):
+        parts = []
+        while sum(map(len, parts)) < min_len:
+            parts.append(rng.choice(self.alphabet))
+        return "".join(parts)
+
+    def check(self, min_len):
+        rng = random.Random(min_len)
+        for _ in range(300):
+            line = self.random_line(rng, rng.randint(min_len, min_len + 40))
+            self.assertEqual(self.matcher.search(line), regex_search(line), line)
+            self.assertEqual(self.matcher.sub(line), regex_sub(line), line)
+
+    def test_short_lines_match_re(self):
+        self.check(1)
+
+    def test_long_lines_match_re(self):
+        self.check(RE_MAX_LINE + 1)
+
+    def test_line_without_literals_is_unchanged(self):
+        line = "今天天气很好，我们去爬山。" * 100
+        self.assertIsNone(self.matcher.search(line))
+        self.assertEqual(self.matcher.sub(line), line)
+
+
+if __name__ == "__main__":
+    unittest.main()
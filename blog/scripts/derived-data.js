@@ -0,0 +1,55 @@
+/* global hexo */
+'use strict';
+
+/**
+ * 生成站点前先运行迁移脚本，生成不入库的派生数据
+ *
+ * - source/search-index/          分片搜索索引（build_search_index.py，/search/ 页面使用）
+ * - source/_data/related_posts.json 相关文章（build_related_posts.py，scripts/related-posts.js 使用）
+ *
+ * 在 after_init 阶段（读取 source 之前）同步执行，所以 hexo g / hexo s / hexo d -g
+ * 都会带上最新的数据，不依赖 npm run build。找不到 Python 或脚本失败时只给出警告，
+ * 站点照常生成（搜索页会提示索引缺失）。可用环境变量 PYTHON 指定解释器。
+ */
+
+var path = require('path');
+var spawnSync = require('child_process').spawnSync;
+
+var SCRIPTS = [
+  'migration/scripts/build_search_index.py',
+  'migration/scripts/build_related_posts.py'
+];
+var COMMANDS = ['g', 'generate', 's', 'server', 'd', 'deploy'];
+// Windows 上未安装 Python 时，python/python3 是应用商店的占位程序，退出码为 9009
+var NOT_FOUND_STATUS = 9009;
+
+function pythonCandidates() {
+  if (process.env.PYTHON) return [process.env.PYTHON];
+  return process.platform === 'win32' ? ['py', 'python', 'python3'] : ['python3', 'python'];
+}
+
+function runScript(script) {
+  var candidates = pythonCandidates();
+  for (var i = 0; i < candidates.length; i++) {
+    var result = spawnSync(candidates[i], [path.join(hexo.base_dir, script)], {
+      cwd: hexo.base_dir,
+      encoding: 'utf8'
+    });
+    if ((result.error && result.error.code === 'ENOENT') || result.status === NOT_FOUND_STATUS) continue;
+    if (result.error || result.status !== 0) {
+      hexo.log.warn('%s 运行失败，跳过：\n%s', script, (result.stdout || '') + (result.stderr || result.error || ''));
+    } else {
+      hexo.log.info('已生成 %s 的数据', path.basename(script));
+    }
+    return;
+  }
+  hexo.log.warn('未找到 Python，跳过 %s（可用环境变量 PYTHON 指定解释器）', script);
+}
+
+hexo.extend.filter.register('after_init', function() {
+  var cmd = hexo.env.cmd;
+  if (COMMANDS.indexOf(cmd) === -1) return;
+  // hexo deploy 只有带 -g 时才会重新生成
+  if ((cmd === 'd' || cmd === 'deploy') && !(hexo.env.args.g || hexo.env.args.generate)) return;
+  SCRIPTS.forEach(runScript);
+});
@@ -0,0 +1,50 @@
+/* global hexo */
+'use strict';
+
+/**
+ * 字数/阅读时长 helper 优先使用 front-matter 中的预计算结果
+ *
+ * 导入流程（migration/scripts/reading_stats.py）已经把 wordcount / min2read
+ * 写进 front-matter，这里包装 hexo-symbols-count-time 与 hexo-wordcount 的
+ * helper：命中预计算结果的文章直接返回，其余文章仍然走插件原来的统计逻辑。
+ */
+
+var precomputed = new Map();
+var wrapped = false;
+
+function formatCount(count) {
+  return count < 1000 ? count : Math.round(count / 100) / 10 + 'k';
+}
+
+function formatTime(minutes, suffix) {
+  var hours = Math.floor(minutes / 60);
+  var mins = Math.max(1, Math.floor(minutes - hours * 60));
+  return hours < 1 ? mins + ' ' + (suffix || 'mins.') : hours + ':' + ('00' + mins).slice(-2);
+}
+
+function wrap(name, fromPost) {
+  var original = hexo.extend.helper.get(name);
+  if (!original) return;
+  hexo.extend.helper.register(name, function(content) {
+    var post = precomputed.get(content);
+    if (post) return fromPost(post, arguments);
+    return original.apply(this, arguments);
+  });
+}
+
+// 插件与站点脚本的加载顺序不固定，等全部加载完、生成开始前再包装
+hexo.extend.filter.register('before_generate', function() {
+  precomputed.clear();
+  hexo.locals.get('posts').forEach(function(post) {
+    if (post.wordcount != null && post.min2read != null) {
+      precomputed.set(post.content, post);
+    }
+  });
+
+  if (wrapped) return;
+  wrapped = true;
+  wrap('symbolsCount', function(post) { return formatCount(post.wordcount); });
+  wrap('symbolsTime', function(post, args) { return formatTime(post.min2read, args[3]); });
+  wrap('wordcount', function(post) { return formatCount(post.wordcount); });
+  wrap('min2read', function(post) { return post.min2read; });
+});
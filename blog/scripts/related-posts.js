@@ -0,0 +1,47 @@
+/* global hexo */
+'use strict';
+
+/**
+ * 在文章末尾渲染"相关文章"
+ *
+ * 相关文章由 migration/scripts/build_related_posts.py 预计算到
+ * source/_data/related_posts.json（生成站点时由 derived-data.js 生成，不入库），
+ * 以文章链接为键。这里在文章渲染前把列表追加到正文末尾，不依赖主题模板；
+ * 数据文件不存在或没有这篇文章时不做任何改动。
+ */
+
+function escapeHTML(str) {
+  return String(str)
+    .replace(/&/g, '&amp;')
+    .replace(/</g, '&lt;')
+    .replace(/>/g, '&gt;')
+    .replace(/"/g, '&quot;');
+}
+
+function lookup(related, path) {
+  var key = '/' + path;
+  if (related[key]) return related[key];
+  try {
+    return related[decodeURI(key)];
+  } catch (e) {
+    return undefined;
+  }
+}
+
+// 文章在 before_generate 阶段渲染，此时 data.site.data 为 source/_data 下的数据
+hexo.extend.filter.register('before_post_render', function(data) {
+  if (data.layout !== 'post' || !data.site || !data.site.data) return data;
+  var related = data.site.data.related_posts;
+  if (!related) return data;
+
+  var items = lookup(related, data.path);
+  if (!items || !items.length) return data;
+
+  var root = hexo.config.root || '/';
+  var list = items.map(function(item) {
+    var url = root + item.url.replace(/^\//, '');
+    return '<li><a href="' + escapeHTML(encodeURI(url)) + '">' + escapeHTML(item.title) + '</a></li>';
+  }).join('');
+  data.content += '\n\n<div class="related-posts"><h2>相关文章</h2><ul>' + list + '</ul></div>\n';
+  return data;
+});
@@ -0,0 +1,203 @@
+/**
+ * 分片搜索索引的前端查询（索引由 migration/scripts/build_search_index.py 生成）
+ *
+ *   ShardSearch.search("臭毛病").then(function (results) { ... });
+ *
+ * 页面上有 #shard-search-form（含 input）和 #shard-search-results 时自动绑定，
+ * 见 source/search/index.md
+ *
+ * 分词与分片规则必须与 build_search_index.py 保持一致：
+ * - 中文相邻两字为一个 token，英文/数字按单词
+ * - 纯字母查询同时按拼音首字母 bigram 查标题
+ * - token 所在分片 = FNV-1a(token) % shard_count
+ */
+(function (window) {
+  'use strict';
+
+  var ROOT = '/search-index/';
+  var TOKEN_RE = /[㐀-䶿一-鿿豈-﫿]+|[a-z0-9]+/g;
+  var CJK_RE = /^[㐀-䶿一-鿿豈-﫿]/;
+
+  var metaPromise = null;
+  var shardCache = {};
+  var docCache = {};
+
+  function fetchJSON(path) {
+    return fetch(ROOT + path).then(function (res) {
+      if (res.status === 404 && path === 'meta.json') {
+        throw new Error('站点部署时没有生成搜索索引（生成站点需要 Python，见 migration/README.md）');
+      }
+      if (!res.ok) throw new Error('search index: ' + path + ' ' + res.status);
+      return res.json();
+    });
+  }
+
+  function loadMeta() {
+    if (!metaPromise) metaPromise = fetchJSON('meta.json');
+    return metaPromise;
+  }
+
+  // 32 位 FNV-1a，token 只含 BMP 字符，与 Python 端逐字符计算一致
+  function tokenHash(token) {
+    var h = 0x811c9dc5;
+    for (var i = 0; i < token.length; i++) {
+      h = Math.imul(h ^ token.charCodeAt(i), 0x01000193) >>> 0;
+    }
+    return h;
+  }
+
+  function loadShard(meta, token) {
+    var id = tokenHash(token) % meta.shard_count;
+    var name = (id < 10 ? '0' : '') + id;
+    if (!shardCache[name]) shardCache[name] = fetchJSON('shards/' + name + '.json');
+    return shardCache[name];
+  }
+
+  function loadDoc(id) {
+    if (!docCache[id]) docCache[id] = fetchJSON('docs/' + id + '.json');
+    return docCache[id];
+  }
+
+  function tokenize(text) {
+    var tokens = [];
+    var runs = text.toLowerCase().match(TOKEN_RE) || [];
+    runs.forEach(function (run) {
+      if (CJK_RE.test(run)) {
+        if (run.length === 1) tokens.push(run);
+        for (var i = 0; i < run.length - 1; i++) tokens.push(run.substr(i, 2));
+      } else if (run.length > 1) {
+        tokens.push(run);
+      }
+    });
+    return tokens;
+  }
+
+  function pinyinTokens(meta, query) {
+    var q = query.toLowerCase().replace(/\s+/g, '');
+    if (!/^[a-z]{2,}$/.test(q)) return [];
+    var tokens = [];
+    for (var i = 0; i < q.length - 1; i++) tokens.push(meta.pinyin_prefix + q.substr(i, 2));
+    return tokens;
+  }
+
+  // 所有 token 都命中的文章（AND），返回 {docId: {score, offset}}
+  function intersect(meta, tokens) {
+    if (!tokens.length) return Promise.resolve({});
+    return Promise.all(tokens.map(function (t) { return loadShard(meta, t); })).then(function (shards) {
+      var hits = null;
+      tokens.forEach(function (token, i) {
+        var next = {};
+        (shards[i][token] || []).forEach(function (posting) {
+          var docId = posting[0];
+          if (hits && !hits[docId]) return;
+          var prev = hits ? hits[docId] : { score: 0, offset: posting[2][0] };
+          next[docId] = { score: prev.score + posting[1], offset: prev.offset };
+        });
+        hits = next;
+      });
+      return hits || {};
+    });
+  }
+
+  function snippet(text, offset, length) {
+    var start = Math.max(0, offset - 20);
+    var end = Math.min(text.length, start + length);
+    return (start > 0 ? '…' : '') + text.slice(start, end) + (end < text.length ? '…' : '');
+  }
+
+  function search(query, limit) {
+    limit = limit || 10;
+    return loadMeta().then(function (meta) {
+      return Promise.all([
+        intersect(meta, tokenize(query)),
+        intersect(meta, pinyinTokens(meta, query))
+      ]).then(function (parts) {
+        var merged = parts[0];
+        Object.keys(parts[1]).forEach(function (id) {
+          if (!merged[id]) merged[id] = parts[1][id];
+        });
+        var ranked = Object.keys(merged).map(function (id) {
+          return { id: +id, score: merged[id].score, offset: merged[id].offset };
+        }).sort(function (a, b) { return b.score - a.score || a.id - b.id; }).slice(0, limit);
+
+        return Promise.all(ranked.map(function (hit) {
+          return loadDoc(hit.id).then(function (doc) {
+            var info = meta.docs[hit.id];
+            return {
+              title: info.title,
+              url: info.url,
+              date: info.date,
+              snippet: snippet(doc.text, hit.offset, 80)
+            };
+          });
+        }));
+      });
+    });
+  }
+
+  function render(list, results) {
+    list.textContent = '';
+    if (!results.length) {
+      var empty = document.createElement('li');
+      empty.textContent = '没有找到相关文章';
+      list.appendChild(empty);
+      return;
+    }
+    results.forEach(function (r) {
+      var item = document.createElement('li');
+      var link = document.createElement('a');
+      link.href = r.url;
+      link.textContent = r.title;
+      var date = document.createElement('span');
+      date.className = 'shard-search-date';
+      date.textContent = ' ' + r.date;
+      var text = document.createElement('p');
+      text.textContent = r.snippet;
+      item.appendChild(link);
+      item.appendChild(date);
+      item.appendChild(text);
+      list.appendChild(item);
+    });
+  }
+
+  function bind() {
+    var form = document.getElementById('shard-search-form');
+    var list = document.getElementById('shard-search-results');
+    if (!form || !list) return;
+    var input = form.querySelector('input');
+    var seq = 0;
+
+    function run() {
+      var query = input.value.trim();
+      var current = ++seq;
+      if (!query) {
+        list.textContent = '';
+        return;
+      }
+      search(query, 20).then(function (results) {
+        if (current === seq) render(list, results);
+      }).catch(function (err) {
+        if (current === seq) list.textContent = '搜索索引加载失败：' + err.message;
+      });
+    }
+
+    form.addEventListener('submit', function (e) {
+      e.preventDefault();
+      run();
+    });
+    input.addEventListener('input', run);
+    var initial = new URLSearchParams(window.location.search).get('q');
+    if (initial) {
+      input.value = initial;
+      run();
+    }
+  }
+
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', bind);
+  } else {
+    bind();
+  }
+
+  window.ShardSearch = { search: search, tokenize: tokenize, tokenHash: tokenHash };
+})(window);